@@ -1,49 +1,57 @@
 import os
 import json
+from functools import lru_cache
 from dotenv import load_dotenv
 from rich.console import Console
-import boto3
-from botocore.config import Config
 
 # Load environment variables
 load_dotenv()
 
 # Configure AWS
 aws_region = os.getenv('AWS_REGION', 'us-west-2')
-aws_access_key = os.getenv('AWS_ACCESS_KEY_ID')
-aws_secret_key = os.getenv('AWS_SECRET_ACCESS_KEY')
 
-if not all([aws_region, aws_access_key, aws_secret_key]):
-    raise ValueError("AWS credentials not found. Please check your .env file.")
+def _require_credentials():
+    aws_access_key = os.getenv('AWS_ACCESS_KEY_ID')
+    aws_secret_key = os.getenv('AWS_SECRET_ACCESS_KEY')
+    if not all([aws_region, aws_access_key, aws_secret_key]):
+        raise ValueError("AWS credentials not found. Please check your .env file.")
 
-config = Config(
-    region_name=aws_region,
-    retries=dict(
-        max_attempts=3
+def _create_client(service_name):
+    # boto3 is imported lazily so importing this module is fast and needs no credentials
+    import boto3
+    from botocore.config import Config
+
+    _require_credentials()
+    config = Config(
+        region_name=aws_region,
+        retries=dict(
+            max_attempts=3
+        )
+    )
+    return boto3.client(
+        service_name=service_name,
+        config=config,
+        region_name=aws_region
     )
-)
 
-# Initialize Bedrock and Bedrock Runtime clients
-bedrock_runtime = boto3.client(
-    service_name='bedrock-runtime',
-    config=config,
-    region_name=aws_region
-)
+# Bedrock and Bedrock Runtime clients are created on first use
+@lru_cache(maxsize=None)
+def get_bedrock_runtime():
+    return _create_client('bedrock-runtime')
 
-bedrock = boto3.client(
-    service_name='bedrock',
-    config=config,
-    region_name=aws_region
-)
+@lru_cache(maxsize=None)
+def get_bedrock():
+    return _create_client('bedrock')
 
-# Test connection by listing available models
-try:
-    available_models = bedrock.list_foundation_models()
-    print("\nAvailable Bedrock Models:")
-    for model in available_models['modelSummaries']:
-        print(f"- {model['modelId']}")
-except Exception as e:
-    print(f"Error listing models: {str(e)}")
+def list_available_models():
+    """Test the connection by listing available Bedrock models."""
+    try:
+        available_models = get_bedrock().list_foundation_models()
+        print("\nAvailable Bedrock Models:")
+        for model in available_models['modelSummaries']:
+            print(f"- {model['modelId']}")
+    except Exception as e:
+        print(f"Error listing models: {str(e)}")
 
 console = Console()
 
@@ -74,7 +82,7 @@ def generate_post(prompt, platform):
             "anthropic_version": "bedrock-2023-05-31"
         })
 
-        response = bedrock_runtime.invoke_model(
+        response = get_bedrock_runtime().invoke_model(
             modelId="anthropic.claude-v2",
             body=body,
             contentType="application/json",
@@ -94,6 +102,8 @@ def generate_post(prompt, platform):
         return f"Error generating content: {str(e)}"
 
 if __name__ == "__main__":
+    _require_credentials()
+    list_available_models()
     topic = input("Enter your campaign idea: ")
     console.rule(f"[bold blue]Generating posts for: {topic}")
 
@@ -1,20 +1,61 @@
 import asyncio
 import json
-from typing import Dict
-import boto3
-from botocore.config import Config
+from functools import lru_cache
+from typing import AsyncIterator, Dict, List, Optional, Tuple
 import os
 from dotenv import load_dotenv
+from config.settings import (
+    AWS_CONCURRENCY_CONFIG,
+    AWS_ENDPOINT_URLS,
+    GENERATION_CACHE_CONFIG,
+    TRANSLATION_CONCURRENCY,
+    TRANSLATION_MEMORY_CONFIG
+)
+from services.concurrency import AdaptiveConcurrencyLimiter, ServiceExecutor
+from services.instrumentation import current_platform, instrumentation
+from services.response_cache import ResponseCache
+from services.translation_memory import TranslationMemory
 
 # Load environment variables
 load_dotenv()
 
 # Configure AWS
 aws_region = os.getenv('AWS_REGION', 'us-west-2')
-config = Config(
-    region_name=aws_region,
-    retries=dict(max_attempts=3)
-)
+
+def _create_client(service_name: str, executor: ServiceExecutor):
+    # boto3 is imported here so importing this module stays fast and works without credentials
+    import boto3
+    from botocore.config import Config
+
+    config = Config(
+        region_name=aws_region,
+        retries=dict(max_attempts=3),
+        max_pool_connections=executor.max_workers
+    )
+    client = boto3.client(
+        service_name=service_name,
+        config=config,
+        region_name=aws_region,
+        endpoint_url=AWS_ENDPOINT_URLS.get(service_name)
+    )
+    # Let the adaptive limiter see throttles that botocore retries on its own
+    executor.observe_client(client)
+    return client
+
+def _service_executor(service: str) -> ServiceExecutor:
+    settings = AWS_CONCURRENCY_CONFIG[service]
+    limiter = AdaptiveConcurrencyLimiter(
+        service,
+        max_limit=settings['max_concurrency'],
+        initial_limit=settings['initial_concurrency']
+    )
+    return ServiceExecutor(service, settings['max_concurrency'], limiter)
+
+# Dedicated, bounded worker pools for blocking boto3 calls
+executors = {
+    'bedrock': _service_executor('bedrock'),
+    'translate': _service_executor('translate')
+}
 
 # Language codes mapping
 LANGUAGES = {
@@ -33,39 +74,150 @@ LANGUAGES = {
     "Arabic": "ar"
 }
 
-# Initialize AWS clients
-bedrock_runtime = boto3.client(
-    service_name='bedrock-runtime',
-    config=config,
-    region_name=aws_region
-)
+# AWS clients are created on first use
+@lru_cache(maxsize=None)
+def get_bedrock_runtime():
+    """Return the shared bedrock-runtime client, creating it on first call."""
+    return _create_client('bedrock-runtime', executors['bedrock'])
 
-translate = boto3.client(
-    service_name='translate',
-    config=config,
-    region_name=aws_region
-)
+@lru_cache(maxsize=None)
+def get_translate_client():
+    """Return the shared Translate client, creating it on first call."""
+    return _create_client('translate', executors['translate'])
 
-async def translate_text(text: str, target_language: str) -> str:
-    """Translate text to target language using AWS Translate."""
-    try:
-        if target_language == "en" or not target_language:
-            return text
-            
-        loop = asyncio.get_event_loop()
-        response = await loop.run_in_executor(
-            None,
-            lambda: translate.translate_text(
+# AWS Translate accepts at most 10,000 bytes of text per request
+TRANSLATE_MAX_BYTES = 9000
+
+translation_memory = TranslationMemory(ResponseCache(
+    max_entries=TRANSLATION_MEMORY_CONFIG['max_entries'],
+    ttl_seconds=TRANSLATION_MEMORY_CONFIG['ttl_seconds'],
+    db_path=TRANSLATION_MEMORY_CONFIG['db_path']
+))
+
+async def _translate_raw(text: str, target_language: str, source_language: str = 'en') -> str:
+    """Send a single AWS Translate request."""
+    with instrumentation.track('translate', 'translate_text',
+                               language=target_language, characters=len(text)) as record:
+        response = await executors['translate'].run(
+            lambda: get_translate_client().translate_text(
                 Text=text,
-                SourceLanguageCode='en',
+                SourceLanguageCode=source_language,
                 TargetLanguageCode=target_language
             )
         )
-        return response.get('TranslatedText', text)
+        record.set_response_metadata(response)
+    return response.get('TranslatedText', text)
+
+async def _translate_segments(segments: List[str], target_language: str, source_language: str = 'en') -> List[str]:
+    """
+    Translate a list of single-line segments with as few requests as possible.
+
+    Segments are packed one per line into requests below TRANSLATE_MAX_BYTES.
+    If a response does not come back with one line per segment, that batch is
+    translated segment by segment instead.
+    """
+    batches, current, size = [], [], 0
+    for segment in segments:
+        segment_size = len(segment.encode('utf-8')) + 1
+        if current and size + segment_size > TRANSLATE_MAX_BYTES:
+            batches.append(current)
+            current, size = [], 0
+        current.append(segment)
+        size += segment_size
+    if current:
+        batches.append(current)
+
+    async def translate_batch(batch: List[str]) -> List[str]:
+        lines = (await _translate_raw("\n".join(batch), target_language, source_language)).split("\n")
+        if len(lines) == len(batch):
+            return [line.strip() for line in lines]
+        return list(await asyncio.gather(
+            *(_translate_raw(segment, target_language, source_language) for segment in batch)
+        ))
+
+    results = await asyncio.gather(*(translate_batch(batch) for batch in batches))
+    return [line for batch in results for line in batch]
+
+async def translate_text(text: str, target_language: str, raise_errors: bool = False) -> str:
+    """Translate text to target language using AWS Translate.
+
+    Sentences already present in the translation memory are reused; only
+    unseen sentences are sent to AWS Translate. On failure the original text
+    is returned unless raise_errors is set.
+    """
+    try:
+        if target_language == "en" or not target_language:
+            return text
+
+        if not TRANSLATION_MEMORY_CONFIG['enabled']:
+            return await _translate_raw(text, target_language)
+
+        return await translation_memory.translate(
+            text,
+            'en',
+            target_language,
+            lambda segments: _translate_segments(segments, target_language)
+        )
     except Exception as e:
+        if raise_errors:
+            raise
         print(f"Translation error: {str(e)}")
         return text
 
+def get_concurrency_stats() -> Dict[str, Dict]:
+    """Return throttle, call and limit counters for each AWS service executor."""
+    return {service: executor.limiter.stats() for service, executor in executors.items()}
+
+async def translate_many(texts: Dict[str, str],
+                         target_languages: List[str],
+                         max_concurrency: Optional[int] = None,
+                         raise_errors: bool = False) -> Dict[str, Dict[str, str]]:
+    """
+    Translate every text into every target language concurrently.
+
+    Returns a nested dict {language_code: {text_key: translated_text}}. At most
+    max_concurrency translations (default TRANSLATION_CONCURRENCY) run at once.
+    """
+    semaphore = asyncio.Semaphore(max_concurrency or TRANSLATION_CONCURRENCY)
+
+    async def translate_one(text: str, language: str) -> str:
+        async with semaphore:
+            return await translate_text(text, language, raise_errors=raise_errors)
+
+    async def translate_labeled(key: str, language: str) -> str:
+        # Runs in its own task, so the label only applies to this translation
+        current_platform.set(key)
+        return await translate_one(texts[key], language)
+
+    pairs = [(language, key) for language in target_languages for key in texts]
+    results = await asyncio.gather(
+        *(translate_labeled(key, language) for language, key in pairs)
+    )
+
+    translated = {language: {} for language in target_languages}
+    for (language, key), result in zip(pairs, results):
+        translated[language][key] = result
+    return translated
+
+# Bedrock model and sampling parameters used for generation
+MODEL_ID = "anthropic.claude-v2"
+GENERATION_PARAMS = {
+    "max_tokens_to_sample": 2000,
+    "temperature": 0.7,
+    "top_k": 250,
+    "anthropic_version": "bedrock-2023-05-31"
+}
+
+# Combined mode asks for every platform in one completion, so it needs more room
+COMBINED_MAX_TOKENS = 4000
+
+# Cache of generated completions, keyed on everything that shapes the model output
+generation_cache = ResponseCache(
+    max_entries=GENERATION_CACHE_CONFIG['max_entries'],
+    ttl_seconds=GENERATION_CACHE_CONFIG['ttl_seconds'],
+    db_path=GENERATION_CACHE_CONFIG['db_path']
+)
+
 # Platform-specific style instructions
 platform_styles = {
     "linkedin": "Professional tone, structured in 2-3 paragraphs, with a clear call-to-action for business professionals.",
@@ -75,49 +227,283 @@ platform_styles = {
     "youtube": "Engaging intro, story-driven, ending with a call to subscribe."
 }
 
-async def generate_single_post(prompt: str, platform: str, target_language: str = None) -> str:
-    """Generate content for a single platform asynchronously and translate if needed."""
-    try:
-        style_instruction = platform_styles.get(platform.lower(), "Neutral style.")
-        
-        body = json.dumps({
-            "prompt": f"\n\nHuman: Write only the content for a {platform} post about: {prompt}. {style_instruction} Do not include any introductory text or explanations.\n\nAssistant:",
-            "max_tokens_to_sample": 2000,
-            "temperature": 0.7,
-            "top_k": 250,
-            "anthropic_version": "bedrock-2023-05-31"
-        })
-
-        # Create event loop to run async operations
-        loop = asyncio.get_event_loop()
-        response = await loop.run_in_executor(
-            None,
-            lambda: bedrock_runtime.invoke_model(
-                modelId="anthropic.claude-v2",
+def _generation_cache_key(prompt: str, platform: str, style_instruction: str) -> str:
+    return ResponseCache.make_key(
+        prompt=prompt,
+        platform=platform,
+        style=style_instruction,
+        model_id=MODEL_ID,
+        params=GENERATION_PARAMS
+    )
+
+def _build_request_body(prompt: str, platform: str, style_instruction: str) -> str:
+    return json.dumps({
+        "prompt": f"\n\nHuman: Write only the content for a {platform} post about: {prompt}. {style_instruction} Do not include any introductory text or explanations.\n\nAssistant:",
+        **GENERATION_PARAMS
+    })
+
+async def _invoke_model(body: str, platform: Optional[str] = None) -> str:
+    """Send one invoke_model request and return the cleaned completion text."""
+    with instrumentation.track('bedrock', 'invoke_model', platform=platform, model_id=MODEL_ID) as record:
+        response = await executors['bedrock'].run(
+            lambda: get_bedrock_runtime().invoke_model(
+                modelId=MODEL_ID,
                 body=body,
                 contentType="application/json",
                 accept="application/json"
             )
         )
-        
-        response_body = json.loads(response.get('body').read())
-        completion = response_body.get('completion', '').replace("Assistant:", "").strip()
+        record.set_response_metadata(response)
+    response_body = json.loads(response.get('body').read())
+    return response_body.get('completion', '').replace("Assistant:", "").strip()
+
+async def generate_single_post(prompt: str, platform: str, target_language: str = None,
+                               use_cache: bool = True, raise_errors: bool = False) -> str:
+    """Generate content for a single platform asynchronously and translate if needed.
+
+    Completions are served from the generation cache when available; pass
+    use_cache=False to force a fresh model call. Errors are returned as an
+    error message unless raise_errors is set.
+    """
+    platform_token = current_platform.set(platform)
+    try:
+        style_instruction = platform_styles.get(platform.lower(), "Neutral style.")
+        use_cache = use_cache and GENERATION_CACHE_CONFIG['enabled']
+        cache_key = _generation_cache_key(prompt, platform, style_instruction)
+        completion = generation_cache.get(cache_key) if use_cache else None
+
+        if completion is None:
+            body = _build_request_body(prompt, platform, style_instruction)
+
+            completion = await _invoke_model(body)
+            if completion and GENERATION_CACHE_CONFIG['enabled']:
+                generation_cache.set(cache_key, completion)
         
         # Translate the content if target language is specified
         if target_language and target_language != "en":
-            completion = await translate_text(completion, target_language)
+            completion = await translate_text(completion, target_language, raise_errors=raise_errors)
             
         return completion
     
     except Exception as e:
+        if raise_errors:
+            raise
         return f"Error generating {platform} content: {str(e)}"
+    finally:
+        current_platform.reset(platform_token)
+
+def _build_combined_request_body(prompt: str, platforms: List[str]) -> str:
+    styles = "\n".join(f'- "{platform}": {platform_styles[platform]}' for platform in platforms)
+    return json.dumps({
+        "prompt": (
+            f"\n\nHuman: Write social media content about: {prompt}.\n"
+            f"Return only a JSON object with exactly these keys, each mapped to the finished post "
+            f"for that platform as a string, written in the style described:\n{styles}\n"
+            f"Do not include any text outside the JSON object.\n\nAssistant: {{"
+        ),
+        **{**GENERATION_PARAMS, "max_tokens_to_sample": COMBINED_MAX_TOKENS}
+    })
+
+def parse_combined_completion(completion: str, platforms: List[str]) -> Dict[str, str]:
+    """
+    Extract the per-platform posts from a combined-mode completion.
+
+    Returns only the platforms whose section is present and a non-empty string;
+    anything missing or malformed is left out so it can be regenerated.
+    """
+    start = completion.find('{')
+    if start == -1:
+        return {}
+    try:
+        # Decode just the first object; the model may add text or braces after it
+        sections, _ = json.JSONDecoder().raw_decode(completion, start)
+    except ValueError:
+        return {}
+    if not isinstance(sections, dict):
+        return {}
+
+    posts = {}
+    for platform in platforms:
+        text = sections.get(platform)
+        if isinstance(text, str) and text.strip():
+            posts[platform] = text.strip()
+    return posts
+
+async def generate_all_posts_combined(prompt: str, target_language: str = None, use_cache: bool = True,
+                                      raise_errors: bool = False) -> Dict[str, str]:
+    """
+    Generate content for all platforms with a single Bedrock request.
+
+    The model is asked for a JSON object with one post per platform. Platforms
+    whose section is missing or malformed are regenerated individually.
+    """
+    platforms = list(platform_styles.keys())
+    use_cache = use_cache and GENERATION_CACHE_CONFIG['enabled']
+    cache_key = ResponseCache.make_key(
+        prompt=prompt,
+        mode="combined",
+        styles=platform_styles,
+        model_id=MODEL_ID,
+        params=GENERATION_PARAMS,
+        max_tokens=COMBINED_MAX_TOKENS
+    )
+    posts = generation_cache.get(cache_key) if use_cache else None
+
+    if posts is None:
+        try:
+            # The prompt pre-fills the opening brace of the JSON object
+            completion = "{" + await _invoke_model(_build_combined_request_body(prompt, platforms), platform="all")
+            posts = parse_combined_completion(completion, platforms)
+        except Exception as e:
+            print(f"Combined generation error: {str(e)}")
+            posts = {}
+        if posts and GENERATION_CACHE_CONFIG['enabled']:
+            generation_cache.set(cache_key, posts)
+
+    missing = [platform for platform in platforms if platform not in posts]
+    if missing:
+        regenerated = await asyncio.gather(
+            *(generate_single_post(prompt, platform, use_cache=use_cache, raise_errors=raise_errors)
+              for platform in missing)
+        )
+        posts = {**posts, **dict(zip(missing, regenerated))}
+
+    if target_language and target_language != "en":
+        posts = (await translate_many(posts, [target_language], raise_errors=raise_errors))[target_language]
+
+    return {platform: posts[platform] for platform in platforms}
+
+async def generate_all_posts(prompt: str, target_language: str = None, use_cache: bool = True,
+                             combined: bool = False, raise_errors: bool = False) -> Dict[str, str]:
+    """Generate content for all platforms concurrently with translation support.
+
+    With combined=True a single request produces every platform's post; see
+    generate_all_posts_combined. With raise_errors=True the first failure is
+    raised instead of being returned as a platform's content.
+    """
+    if combined:
+        return await generate_all_posts_combined(
+            prompt, target_language, use_cache=use_cache, raise_errors=raise_errors
+        )
 
-async def generate_all_posts(prompt: str, target_language: str = None) -> Dict[str, str]:
-    """Generate content for all platforms concurrently with translation support."""
     tasks = []
     for platform in platform_styles.keys():
-        task = generate_single_post(prompt, platform, target_language)
+        task = generate_single_post(
+            prompt, platform, target_language, use_cache=use_cache, raise_errors=raise_errors
+        )
         tasks.append(task)
     
     results = await asyncio.gather(*tasks)
     return dict(zip(platform_styles.keys(), results))
+
+# Sentinel marking the end of a response stream
+_STREAM_END = object()
+
+async def stream_single_post(prompt: str, platform: str, use_cache: bool = True) -> AsyncIterator[str]:
+    """
+    Stream the content for a single platform as text chunks.
+
+    The Bedrock response stream is consumed on a worker thread and handed to
+    the event loop chunk by chunk. A cached completion is yielded as a single
+    chunk. Errors are raised to the caller.
+    """
+    style_instruction = platform_styles.get(platform.lower(), "Neutral style.")
+    use_cache = use_cache and GENERATION_CACHE_CONFIG['enabled']
+    cache_key = _generation_cache_key(prompt, platform, style_instruction)
+    cached = generation_cache.get(cache_key) if use_cache else None
+    if cached is not None:
+        yield cached
+        return
+
+    body = _build_request_body(prompt, platform, style_instruction)
+    loop = asyncio.get_event_loop()
+    queue: asyncio.Queue = asyncio.Queue()
+
+    def put(item) -> None:
+        try:
+            loop.call_soon_threadsafe(queue.put_nowait, item)
+        except RuntimeError:
+            # The event loop is gone; the consumer stopped listening
+            pass
+
+    def pump() -> None:
+        try:
+            with instrumentation.track('bedrock', 'invoke_model_with_response_stream',
+                                       platform=platform, model_id=MODEL_ID) as record:
+                response = get_bedrock_runtime().invoke_model_with_response_stream(
+                    modelId=MODEL_ID,
+                    body=body,
+                    contentType="application/json",
+                    accept="application/json"
+                )
+                record.set_response_metadata(response)
+                for event in response.get('body'):
+                    chunk = event.get('chunk')
+                    if chunk:
+                        data = json.loads(chunk['bytes'])
+                        # The final chunk carries the token counts for the whole stream
+                        metrics = data.get('amazon-bedrock-invocationMetrics', {})
+                        record.input_tokens = metrics.get('inputTokenCount', record.input_tokens)
+                        record.output_tokens = metrics.get('outputTokenCount', record.output_tokens)
+                        text = data.get('completion', '')
+                        if text:
+                            put(text)
+        except Exception as e:
+            put(e)
+            raise
+        finally:
+            put(_STREAM_END)
+
+    # The stream holds a Bedrock slot until it has been fully read
+    reader = asyncio.ensure_future(executors['bedrock'].run(pump))
+    parts = []
+    while True:
+        item = await queue.get()
+        if item is _STREAM_END:
+            break
+        if isinstance(item, Exception):
+            await asyncio.gather(reader, return_exceptions=True)
+            raise item
+        if not parts:
+            # Drop the leading whitespace the model emits after "Assistant:"
+            item = item.lstrip()
+            if not item:
+                continue
+        parts.append(item)
+        yield item
+    await reader
+
+    completion = ''.join(parts).replace("Assistant:", "").strip()
+    if completion and GENERATION_CACHE_CONFIG['enabled']:
+        generation_cache.set(cache_key, completion)
+
+async def generate_all_posts_stream(prompt: str, use_cache: bool = True) -> AsyncIterator[Tuple[str, str]]:
+    """
+    Stream content for all platforms concurrently.
+
+    Yields (platform, chunk) tuples in arrival order across platforms. If a
+    platform fails, its error message is yielded as a final chunk.
+    """
+    queue: asyncio.Queue = asyncio.Queue()
+
+    async def pump(platform: str) -> None:
+        try:
+            async for chunk in stream_single_post(prompt, platform, use_cache=use_cache):
+                await queue.put((platform, chunk))
+        except Exception as e:
+            await queue.put((platform, f"Error generating {platform} content: {str(e)}"))
+        finally:
+            await queue.put((platform, _STREAM_END))
+
+    tasks = [asyncio.ensure_future(pump(platform)) for platform in platform_styles.keys()]
+    remaining = len(tasks)
+    try:
+        while remaining:
+            platform, chunk = await queue.get()
+            if chunk is _STREAM_END:
+                remaining -= 1
+                continue
+            yield platform, chunk
+    finally:
+        for task in tasks:
+            task.cancel()
@@ -0,0 +1,182 @@
+"""
+Bulk campaign generation.
+
+Reads campaigns from a JSONL or CSV file and writes one JSONL record per
+finished campaign. Finished campaign IDs are appended to a checkpoint file,
+so an interrupted run picks up where it stopped when started again.
+
+Input records need a "topic" and may have an "id" and "languages"
+(a list in JSONL; separated by ";" or "|" in CSV). Languages can be given
+as names ("Hindi") or codes ("hi").
+
+    python batch_generate.py campaigns.jsonl drafts.jsonl --concurrency 4
+"""
+import argparse
+import asyncio
+import csv
+import hashlib
+import json
+import os
+import sys
+from datetime import datetime
+from typing import Dict, Iterator, List, Set
+from rich.console import Console
+from async_generator import LANGUAGES, generate_all_posts, translate_many
+
+console = Console(stderr=True)
+
+def _parse_languages(value) -> List[str]:
+    if not value:
+        return []
+    if isinstance(value, str):
+        value = [part for part in value.replace('|', ';').split(';')]
+    codes = []
+    for language in value:
+        language = language.strip()
+        if not language:
+            continue
+        code = LANGUAGES.get(language, language)
+        if code != 'en' and code not in codes:
+            codes.append(code)
+    return codes
+
+def _campaign_id(record: Dict) -> str:
+    if record.get('id'):
+        return str(record['id'])
+    # Same topic in other languages is a different campaign; without languages
+    # the ID stays the topic hash, so older checkpoints still match
+    key = record['topic']
+    if record.get('languages'):
+        key += '\n' + ','.join(sorted(record['languages']))
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()[:12]
+
+def read_campaigns(path: str) -> Iterator[Dict]:
+    """Yield normalized campaign dicts with id, topic and languages."""
+    with open(path, newline='', encoding='utf-8') as f:
+        if path.lower().endswith('.csv'):
+            rows = csv.DictReader(f)
+        else:
+            rows = (json.loads(line) for line in f if line.strip())
+        for row in rows:
+            topic = (row.get('topic') or '').strip()
+            if not topic:
+                continue
+            languages = _parse_languages(row.get('languages'))
+            yield {
+                'id': _campaign_id({**row, 'topic': topic, 'languages': languages}),
+                'topic': topic,
+                'languages': languages
+            }
+
+def load_checkpoint(path: str) -> Set[str]:
+    if not os.path.exists(path):
+        return set()
+    with open(path, encoding='utf-8') as f:
+        return {line.strip() for line in f if line.strip()}
+
+async def generate_campaign(campaign: Dict, use_cache: bool, combined: bool) -> Dict:
+    """Generate English posts for a campaign plus every requested translation."""
+    english = await generate_all_posts(
+        campaign['topic'], 'en', use_cache=use_cache, combined=combined, raise_errors=True
+    )
+    posts = {'en': english}
+    if campaign['languages']:
+        posts.update(await translate_many(english, campaign['languages'], raise_errors=True))
+    return {
+        'id': campaign['id'],
+        'topic': campaign['topic'],
+        'posts': posts,
+        'generated_at': datetime.now().isoformat()
+    }
+
+async def run_batch(input_path: str,
+                    output_path: str,
+                    checkpoint_path: str,
+                    concurrency: int = 4,
+                    max_consecutive_failures: int = 20,
+                    use_cache: bool = True,
+                    combined: bool = False) -> bool:
+    """
+    Generate every campaign not already in the checkpoint.
+
+    Returns False if the run was aborted after max_consecutive_failures
+    campaigns failed in a row (typically sustained throttling).
+    """
+    done = load_checkpoint(checkpoint_path)
+    pending, duplicates = {}, 0
+    for campaign in read_campaigns(input_path):
+        if campaign['id'] in pending:
+            duplicates += 1
+        elif campaign['id'] not in done:
+            pending[campaign['id']] = campaign
+    pending = list(pending.values())
+    if duplicates:
+        console.print(f"[yellow]Skipping {duplicates} duplicate campaigns")
+    console.print(f"[bold blue]{len(done)} campaigns already done, {len(pending)} to generate")
+
+    semaphore = asyncio.Semaphore(concurrency)
+    abort = asyncio.Event()
+    stats = {'finished': 0, 'failed': 0, 'consecutive_failures': 0}
+
+    with open(output_path, 'a', encoding='utf-8') as output, \
+            open(checkpoint_path, 'a', encoding='utf-8') as checkpoint:
+
+        async def process(campaign: Dict) -> None:
+            async with semaphore:
+                if abort.is_set():
+                    return
+                try:
+                    record = await generate_campaign(campaign, use_cache, combined)
+                except Exception as e:
+                    stats['failed'] += 1
+                    stats['consecutive_failures'] += 1
+                    console.print(f"[red]Campaign {campaign['id']} failed: {str(e)}")
+                    if stats['consecutive_failures'] >= max_consecutive_failures:
+                        abort.set()
+                    return
+
+                # Write the result before checkpointing so a crash never loses a campaign
+                output.write(json.dumps(record, ensure_ascii=False) + '\n')
+                output.flush()
+                os.fsync(output.fileno())
+                checkpoint.write(campaign['id'] + '\n')
+                checkpoint.flush()
+                stats['finished'] += 1
+                stats['consecutive_failures'] = 0
+                console.print(f"[green]Finished {campaign['id']} ({stats['finished']}/{len(pending)})")
+
+        await asyncio.gather(*(process(campaign) for campaign in pending))
+
+    if abort.is_set():
+        console.print(
+            f"[bold red]Aborted after {max_consecutive_failures} consecutive failures. "
+            f"Re-run the same command to resume."
+        )
+    console.print(f"[bold blue]Done: {stats['finished']} finished, {stats['failed']} failed")
+    return not abort.is_set()
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Generate posts for many campaigns from a JSONL or CSV file.")
+    parser.add_argument('input', help="Campaigns file (.jsonl or .csv)")
+    parser.add_argument('output', help="Output JSONL file; results are appended")
+    parser.add_argument('--checkpoint', help="Checkpoint file (default: <output>.checkpoint)")
+    parser.add_argument('--concurrency', type=int, default=4, help="Campaigns generated at once")
+    parser.add_argument('--max-consecutive-failures', type=int, default=20,
+                        help="Abort after this many campaigns fail in a row")
+    parser.add_argument('--bypass-cache', action='store_true', help="Always request fresh content")
+    parser.add_argument('--combined', action='store_true', help="Use one model request per campaign")
+    args = parser.parse_args(argv)
+
+    completed = asyncio.run(run_batch(
+        args.input,
+        args.output,
+        args.checkpoint or f"{args.output}.checkpoint",
+        concurrency=args.concurrency,
+        max_consecutive_failures=args.max_consecutive_failures,
+        use_cache=not args.bypass_cache,
+        combined=args.combined
+    ))
+    return 0 if completed else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
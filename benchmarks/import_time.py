@@ -0,0 +1,73 @@
+"""
+Import-time benchmark.
+
+Imports each module in a fresh interpreter with AWS credentials removed from
+the environment and reports the cumulative import time from `python -X
+importtime`. Exits with status 1 if any import fails or exceeds its budget,
+so it can guard against slow or credential-dependent imports creeping back.
+
+    python benchmarks/import_time.py
+    python benchmarks/import_time.py --budget-ms 300 async_generator
+"""
+import argparse
+import os
+import subprocess
+import sys
+from typing import Dict, List, Optional
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules a Streamlit worker or the CLI imports on cold start
+DEFAULT_MODULES = ['async_generator', 'app', 'youtube_influencers', 'batch_generate']
+DEFAULT_BUDGET_MS = 500
+
+def measure_import(module: str, runs: int = 3) -> Optional[float]:
+    """Return the best cumulative import time of module in milliseconds, or None if it fails."""
+    env = {k: v for k, v in os.environ.items() if not k.startswith('AWS_')}
+    env['PYTHONDONTWRITEBYTECODE'] = '1'
+    best = None
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+            cwd=ROOT,
+            env=env,
+            capture_output=True,
+            text=True
+        )
+        if result.returncode != 0:
+            print(result.stderr.strip().splitlines()[-1] if result.stderr.strip() else 'import failed')
+            return None
+        for line in result.stderr.splitlines():
+            # Format: "import time: self [us] | cumulative | imported package"
+            parts = [part.strip() for part in line.split('|')]
+            if len(parts) == 3 and parts[2] == module:
+                cumulative_ms = int(parts[1]) / 1000
+                best = cumulative_ms if best is None else min(best, cumulative_ms)
+    return best
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Measure cold import time of project modules.")
+    parser.add_argument('modules', nargs='*', default=DEFAULT_MODULES)
+    parser.add_argument('--budget-ms', type=float, default=DEFAULT_BUDGET_MS)
+    parser.add_argument('--runs', type=int, default=3)
+    args = parser.parse_args(argv)
+
+    results: Dict[str, Optional[float]] = {}
+    for module in args.modules:
+        results[module] = measure_import(module, args.runs)
+
+    failed = False
+    print(f"{'module':<24}{'import ms':>12}  status")
+    for module, elapsed in results.items():
+        if elapsed is None:
+            status, shown = 'FAILED', '-'
+        elif elapsed > args.budget_ms:
+            status, shown = f'OVER BUDGET ({args.budget_ms:.0f} ms)', f'{elapsed:.1f}'
+        else:
+            status, shown = 'ok', f'{elapsed:.1f}'
+        failed = failed or status != 'ok'
+        print(f"{module:<24}{shown:>12}  {status}")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,207 @@
+"""
+Throughput and latency benchmarks for the generation pipeline.
+
+Runs async_generator against the local stand-in server (benchmarks/stub_server.py)
+and reports throughput, p50/p95/p99 latency, peak thread count and memory for:
+
+- generate_all_posts      one campaign, all platforms, non-streaming
+- generate_all_posts_stream  same, streaming (latency = time to first chunk / to last chunk)
+- translate_text          one post into one language
+- streamlit_flow          what a "Generate Content" click plus one language switch does
+
+Caches are disabled unless --with-cache is given, so every iteration hits the server.
+
+    python benchmarks/run_benchmarks.py --iterations 20 --concurrency 4
+    python benchmarks/run_benchmarks.py --server-url http://127.0.0.1:8099 --json results.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import resource
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from typing import Awaitable, Callable, Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from stub_server import StubConfig, start_stub_server
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * (len(ordered) - 1)))))
+    return ordered[index]
+
+class ThreadSampler:
+    """Record the peak number of live threads while a benchmark runs."""
+
+    def __init__(self, interval: float = 0.01):
+        self.interval = interval
+        self.peak = threading.active_count()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self.peak = max(self.peak, threading.active_count())
+            time.sleep(self.interval)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+async def run_scenario(name: str,
+                       operation: Callable[[int], Awaitable[Dict[str, float]]],
+                       iterations: int,
+                       concurrency: int) -> Dict:
+    """Run operation `iterations` times, at most `concurrency` at once, and summarise timings."""
+    semaphore = asyncio.Semaphore(concurrency)
+    timings: Dict[str, List[float]] = {}
+
+    async def one(index: int) -> None:
+        async with semaphore:
+            for metric, value in (await operation(index)).items():
+                timings.setdefault(metric, []).append(value)
+
+    tracemalloc.start()
+    started = time.perf_counter()
+    with ThreadSampler() as sampler:
+        await asyncio.gather(*(one(i) for i in range(iterations)))
+    elapsed = time.perf_counter() - started
+    _, peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    result = {
+        'scenario': name,
+        'iterations': iterations,
+        'concurrency': concurrency,
+        'elapsed_s': round(elapsed, 3),
+        'throughput_per_s': round(iterations / elapsed, 2) if elapsed else 0.0,
+        'peak_threads': sampler.peak,
+        'peak_traced_memory_kb': round(peak_memory / 1024, 1),
+        'max_rss_mb': round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+    }
+    for metric, values in timings.items():
+        for pct in (50, 95, 99):
+            result[f'{metric}_p{pct}_ms'] = round(percentile(values, pct) * 1000, 1)
+    return result
+
+def build_scenarios(ag) -> Dict[str, Callable[[int], Awaitable[Dict[str, float]]]]:
+    sample_post = (
+        "Launch week is here. Discover the new collection today! "
+        "Limited stock, so order early.\n#NewLaunch #ShopNow"
+    )
+
+    async def generate(index: int) -> Dict[str, float]:
+        started = time.perf_counter()
+        await ag.generate_all_posts(f"Benchmark campaign {index}", 'en')
+        return {'latency': time.perf_counter() - started}
+
+    async def generate_stream(index: int) -> Dict[str, float]:
+        started = time.perf_counter()
+        first_chunk = None
+        async for _platform, _chunk in ag.generate_all_posts_stream(f"Benchmark stream {index}"):
+            if first_chunk is None:
+                first_chunk = time.perf_counter() - started
+        return {'first_chunk': first_chunk or 0.0, 'latency': time.perf_counter() - started}
+
+    async def translate(index: int) -> Dict[str, float]:
+        started = time.perf_counter()
+        await ag.translate_text(f"{sample_post} Variant {index}.", 'hi')
+        return {'latency': time.perf_counter() - started}
+
+    async def streamlit_flow(index: int) -> Dict[str, float]:
+        started = time.perf_counter()
+        contents = {}
+        async for platform, chunk in ag.generate_all_posts_stream(f"Benchmark flow {index}"):
+            contents[platform] = contents.get(platform, '') + chunk
+        generated = time.perf_counter()
+        await ag.translate_many(contents, ['hi'])
+        return {
+            'generate': generated - started,
+            'translate': time.perf_counter() - generated,
+            'latency': time.perf_counter() - started
+        }
+
+    return {
+        'generate_all_posts': generate,
+        'generate_all_posts_stream': generate_stream,
+        'translate_text': translate,
+        'streamlit_flow': streamlit_flow
+    }
+
+def print_results(results: List[Dict]) -> None:
+    for result in results:
+        print(f"\n== {result['scenario']} ==")
+        for key, value in result.items():
+            if key != 'scenario':
+                print(f"  {key:<28}{value}")
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark async_generator against the local stand-in server.")
+    parser.add_argument('--iterations', type=int, default=20)
+    parser.add_argument('--concurrency', type=int, default=4)
+    parser.add_argument('--scenarios', nargs='*', help="Subset of scenarios to run")
+    parser.add_argument('--server-url', help="Use an already running stub server instead of starting one")
+    parser.add_argument('--latency-ms', type=float, default=StubConfig.latency_ms)
+    parser.add_argument('--first-token-ms', type=float, default=StubConfig.first_token_ms)
+    parser.add_argument('--translate-latency-ms', type=float, default=StubConfig.translate_latency_ms)
+    parser.add_argument('--throttle-rate', type=float, default=StubConfig.throttle_rate)
+    parser.add_argument('--completion-words', type=int, default=StubConfig.completion_words)
+    parser.add_argument('--with-cache', action='store_true', help="Keep generation cache and translation memory on")
+    parser.add_argument('--json', help="Write results to this file")
+    args = parser.parse_args(argv)
+
+    url = args.server_url
+    if not url:
+        _, url = start_stub_server(StubConfig(
+            latency_ms=args.latency_ms,
+            first_token_ms=args.first_token_ms,
+            translate_latency_ms=args.translate_latency_ms,
+            throttle_rate=args.throttle_rate,
+            completion_words=args.completion_words,
+            seed=42
+        ))
+
+    # Settings are read at import time, so configure the environment first
+    os.environ.update({
+        'BEDROCK_ENDPOINT_URL': url,
+        'TRANSLATE_ENDPOINT_URL': url,
+        'AWS_ACCESS_KEY_ID': os.environ.get('AWS_ACCESS_KEY_ID', 'benchmark'),
+        'AWS_SECRET_ACCESS_KEY': os.environ.get('AWS_SECRET_ACCESS_KEY', 'benchmark'),
+        'YUKTI_CACHE_DIR': tempfile.mkdtemp(prefix='yukti-bench-')
+    })
+    if not args.with_cache:
+        os.environ['GENERATION_CACHE_ENABLED'] = 'false'
+        os.environ['TRANSLATION_MEMORY_ENABLED'] = 'false'
+    import async_generator as ag
+
+    scenarios = build_scenarios(ag)
+    selected = args.scenarios or list(scenarios)
+    results = []
+    for name in selected:
+        results.append(asyncio.run(run_scenario(name, scenarios[name], args.iterations, args.concurrency)))
+    results.append({'scenario': 'aws_executor_counters', **{
+        f'{service}_{key}': value
+        for service, stats in ag.get_concurrency_stats().items()
+        for key, value in stats.items()
+    }})
+
+    print_results(results)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,203 @@
+"""
+Local stand-in for the Bedrock runtime and AWS Translate APIs.
+
+Serves invoke_model, invoke_model_with_response_stream and translate_text
+with configurable latency, throttling and payload size, so the generation
+pipeline can be measured without paying for live calls. Point the app at it
+with BEDROCK_ENDPOINT_URL / TRANSLATE_ENDPOINT_URL (any dummy AWS
+credentials will do):
+
+    python benchmarks/stub_server.py --port 8099 --latency-ms 800 --throttle-rate 0.05
+    BEDROCK_ENDPOINT_URL=http://127.0.0.1:8099 TRANSLATE_ENDPOINT_URL=http://127.0.0.1:8099 \\
+        streamlit run streamlit_app.py
+"""
+import argparse
+import base64
+import json
+import random
+import re
+import struct
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Tuple
+
+@dataclass
+class StubConfig:
+    """Behaviour of the stand-in server. Latencies are log-normal around the median."""
+    latency_ms: float = 800.0
+    latency_sigma: float = 0.4
+    first_token_ms: float = 300.0
+    chunk_interval_ms: float = 40.0
+    completion_words: int = 150
+    words_per_chunk: int = 8
+    translate_latency_ms: float = 150.0
+    throttle_rate: float = 0.0
+    seed: int = None
+
+_WORDS = (
+    "launch your brand with bold ideas that connect real people to products they love "
+    "every campaign tells a story share it with confidence and watch engagement grow"
+).split()
+
+_MODEL_PATH = re.compile(r'^/model/(?P<model>[^/]+)/(?P<action>invoke|invoke-with-response-stream)$')
+
+def encode_event(payload: bytes, event_type: str = 'chunk') -> bytes:
+    """Encode one message in the AWS event stream binary format."""
+    headers = b''
+    for name, value in ((':event-type', event_type),
+                        (':content-type', 'application/json'),
+                        (':message-type', 'event')):
+        name_bytes, value_bytes = name.encode(), value.encode()
+        headers += struct.pack('!B', len(name_bytes)) + name_bytes
+        headers += b'\x07' + struct.pack('!H', len(value_bytes)) + value_bytes
+    prelude = struct.pack('!II', 12 + len(headers) + len(payload) + 4, len(headers))
+    message = prelude + struct.pack('!I', zlib.crc32(prelude)) + headers + payload
+    return message + struct.pack('!I', zlib.crc32(message))
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    config = StubConfig()
+    rng = random.Random()
+    rng_lock = threading.Lock()
+
+    def log_message(self, format, *args):
+        pass
+
+    def _sample_ms(self, median_ms: float) -> float:
+        with self.rng_lock:
+            return median_ms * self.rng.lognormvariate(0, self.config.latency_sigma)
+
+    def _should_throttle(self) -> bool:
+        with self.rng_lock:
+            return self.rng.random() < self.config.throttle_rate
+
+    def _completion(self) -> str:
+        with self.rng_lock:
+            return ' ' + ' '.join(self.rng.choice(_WORDS) for _ in range(self.config.completion_words))
+
+    def _send_json(self, status: int, body: dict, headers: Tuple[Tuple[str, str], ...] = ()) -> None:
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        for name, value in headers:
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _send_chunk(self, data: bytes) -> None:
+        self.wfile.write(f'{len(data):X}\r\n'.encode() + data + b'\r\n')
+        self.wfile.flush()
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        target = self.headers.get('X-Amz-Target', '')
+        if target.endswith('.TranslateText'):
+            return self._translate(json.loads(body or b'{}'))
+        match = _MODEL_PATH.match(self.path.split('?')[0])
+        if match:
+            if match.group('action') == 'invoke':
+                return self._invoke(json.loads(body or b'{}'))
+            return self._invoke_stream(json.loads(body or b'{}'))
+        self._send_json(404, {'message': f'Unknown route {self.path}'})
+
+    def _throttle_bedrock(self) -> None:
+        self._send_json(
+            429,
+            {'message': 'Too many requests, please wait before trying again.'},
+            (('x-amzn-ErrorType', 'ThrottlingException:http://internal.amazon.com/coral/com.amazon.bedrock/'),)
+        )
+
+    def _token_headers(self, request: dict, completion: str) -> Tuple[Tuple[str, str], ...]:
+        return (
+            ('x-amzn-bedrock-input-token-count', str(len(request.get('prompt', '').split()))),
+            ('x-amzn-bedrock-output-token-count', str(len(completion.split())))
+        )
+
+    def _invoke(self, request: dict) -> None:
+        time.sleep(self._sample_ms(self.config.latency_ms) / 1000)
+        if self._should_throttle():
+            return self._throttle_bedrock()
+        completion = self._completion()
+        self._send_json(
+            200,
+            {'completion': completion, 'stop_reason': 'stop_sequence'},
+            self._token_headers(request, completion)
+        )
+
+    def _invoke_stream(self, request: dict) -> None:
+        time.sleep(self._sample_ms(self.config.first_token_ms) / 1000)
+        if self._should_throttle():
+            return self._throttle_bedrock()
+        completion = self._completion()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/vnd.amazon.eventstream')
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.send_header('x-amzn-bedrock-content-type', 'application/json')
+        self.end_headers()
+
+        words = completion.split(' ')
+        step = max(1, self.config.words_per_chunk)
+        for start in range(0, len(words), step):
+            text = ' '.join(words[start:start + step])
+            text = text if start == 0 else ' ' + text
+            data = {'completion': text, 'stop_reason': None}
+            if start + step >= len(words):
+                data['stop_reason'] = 'stop_sequence'
+                data['amazon-bedrock-invocationMetrics'] = {
+                    'inputTokenCount': len(request.get('prompt', '').split()),
+                    'outputTokenCount': len(completion.split())
+                }
+            part = json.dumps(data).encode()
+            self._send_chunk(encode_event(json.dumps({'bytes': base64.b64encode(part).decode()}).encode()))
+            time.sleep(self._sample_ms(self.config.chunk_interval_ms) / 1000)
+        self._send_chunk(b'')
+
+    def _translate(self, request: dict) -> None:
+        time.sleep(self._sample_ms(self.config.translate_latency_ms) / 1000)
+        if self._should_throttle():
+            return self._send_json(400, {
+                '__type': 'TooManyRequestsException',
+                'message': 'Rate exceeded'
+            })
+        target = request.get('TargetLanguageCode', 'xx')
+        translated = '\n'.join(f'[{target}] {line}' if line else line
+                               for line in request.get('Text', '').split('\n'))
+        self._send_json(200, {
+            'TranslatedText': translated,
+            'SourceLanguageCode': request.get('SourceLanguageCode', 'en'),
+            'TargetLanguageCode': target
+        })
+
+def start_stub_server(config: StubConfig = None, host: str = '127.0.0.1', port: int = 0) -> Tuple[ThreadingHTTPServer, str]:
+    """Start the stand-in server on a daemon thread and return (server, base_url)."""
+    handler = type('ConfiguredStubHandler', (StubHandler,), {
+        'config': config or StubConfig(),
+        'rng': random.Random((config or StubConfig()).seed)
+    })
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f'http://{host}:{server.server_address[1]}'
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Local Bedrock runtime / Translate stand-in.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8099)
+    defaults = StubConfig()
+    for field, value in vars(defaults).items():
+        parser.add_argument(f"--{field.replace('_', '-')}", type=type(value) if value is not None else int, default=value)
+    args = parser.parse_args()
+    config = StubConfig(**{field: getattr(args, field) for field in vars(defaults)})
+    server, url = start_stub_server(config, args.host, args.port)
+    print(f"Stub Bedrock/Translate server listening on {url}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+if __name__ == "__main__":
+    main()
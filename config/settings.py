@@ -1,3 +1,5 @@
+import os
+
 # Social Media Configuration
 SOCIAL_MEDIA_CONFIG = {
     'linkedin': {
@@ -34,3 +36,156 @@ API_ENDPOINTS = {
     'instagram': 'https://graph.instagram.com/me/media',
     'youtube': 'https://www.googleapis.com/youtube/v3/videos'
 }
+
+# Local cache directory for persistent caches
+CACHE_DIR = os.getenv('YUKTI_CACHE_DIR', '.cache')
+
+# Generation response cache (in-memory LRU + optional SQLite tier)
+GENERATION_CACHE_CONFIG = {
+    'enabled': os.getenv('GENERATION_CACHE_ENABLED', 'true').lower() == 'true',
+    'max_entries': int(os.getenv('GENERATION_CACHE_MAX_ENTRIES', '512')),
+    'ttl_seconds': int(os.getenv('GENERATION_CACHE_TTL_SECONDS', str(24 * 60 * 60))),
+    # Set GENERATION_CACHE_DB to an empty string to keep the cache in memory only
+    'db_path': os.getenv('GENERATION_CACHE_DB', os.path.join(CACHE_DIR, 'generations.sqlite3'))
+}
+
+# Sentence-level translation memory shared across sessions and campaigns
+TRANSLATION_MEMORY_CONFIG = {
+    'enabled': os.getenv('TRANSLATION_MEMORY_ENABLED', 'true').lower() == 'true',
+    'max_entries': int(os.getenv('TRANSLATION_MEMORY_MAX_ENTRIES', '4096')),
+    'ttl_seconds': int(os.getenv('TRANSLATION_MEMORY_TTL_SECONDS', str(30 * 24 * 60 * 60))),
+    'db_path': os.getenv('TRANSLATION_MEMORY_DB', os.path.join(CACHE_DIR, 'translation_memory.sqlite3'))
+}
+
+# Maximum number of concurrent AWS Translate requests for batch translation
+TRANSLATION_CONCURRENCY = int(os.getenv('TRANSLATION_CONCURRENCY', '8'))
+
+# Per-service worker pools for blocking AWS calls. Each pool is sized to match
+# its botocore connection pool; the adaptive limiter starts at
+# initial_concurrency and moves between 1 and max_concurrency.
+AWS_CONCURRENCY_CONFIG = {
+    'bedrock': {
+        'max_concurrency': int(os.getenv('BEDROCK_MAX_CONCURRENCY', '10')),
+        'initial_concurrency': int(os.getenv('BEDROCK_INITIAL_CONCURRENCY', '5'))
+    },
+    'translate': {
+        'max_concurrency': int(os.getenv('TRANSLATE_MAX_CONCURRENCY', '10')),
+        'initial_concurrency': int(os.getenv('TRANSLATE_INITIAL_CONCURRENCY', '10'))
+    }
+}
+
+# Optional endpoint overrides, e.g. to point at the local stand-in server in benchmarks/
+AWS_ENDPOINT_URLS = {
+    'bedrock-runtime': os.getenv('BEDROCK_ENDPOINT_URL') or None,
+    'translate': os.getenv('TRANSLATE_ENDPOINT_URL') or None
+}
+
+# Port for the Prometheus-style /metrics endpoint; 0 disables it
+METRICS_PORT = int(os.getenv('METRICS_PORT', '0'))
+
+# Influencer search: parallel keyword searches and an overall deadline. Each
+# lookup plans its searches to fit query_quota_units. Set max_pages above 1 to
+# follow nextPageToken until target_channels distinct channels are found per
+# query, spending at most page_quota_units per lookup on the extra pages.
+YOUTUBE_SEARCH_CONFIG = {
+    'max_concurrency': int(os.getenv('YOUTUBE_SEARCH_CONCURRENCY', '8')),
+    'deadline_seconds': float(os.getenv('YOUTUBE_SEARCH_DEADLINE_SECONDS', '20')),
+    'query_quota_units': int(os.getenv('YOUTUBE_SEARCH_QUOTA_UNITS', '500')),
+    'max_pages': int(os.getenv('YOUTUBE_SEARCH_MAX_PAGES', '1')),
+    'target_channels': int(os.getenv('YOUTUBE_SEARCH_TARGET_CHANNELS', '0')),
+    'page_quota_units': int(os.getenv('YOUTUBE_SEARCH_PAGE_QUOTA_UNITS', '500'))
+}
+
+# YouTube Data API quota. Searches are refused (and served from cache only)
+# once daily_budget units have been spent in the current quota day.
+YOUTUBE_QUOTA_CONFIG = {
+    'daily_budget': int(os.getenv('YOUTUBE_DAILY_QUOTA_BUDGET', '10000')),
+    'db_path': os.getenv('YOUTUBE_QUOTA_DB', os.path.join(CACHE_DIR, 'youtube_quota.sqlite3'))
+}
+
+# Cache of YouTube search results. Entries older than ttl_seconds are refetched
+# when quota allows and kept for stale_ttl_seconds more as a cache-only fallback.
+YOUTUBE_SEARCH_CACHE_CONFIG = {
+    'ttl_seconds': int(os.getenv('YOUTUBE_SEARCH_CACHE_TTL_SECONDS', str(3 * 24 * 60 * 60))),
+    'stale_ttl_seconds': int(os.getenv('YOUTUBE_SEARCH_CACHE_STALE_SECONDS', str(27 * 24 * 60 * 60))),
+    'max_entries': int(os.getenv('YOUTUBE_SEARCH_CACHE_MAX_ENTRIES', '1024')),
+    'max_disk_entries': int(os.getenv('YOUTUBE_SEARCH_CACHE_MAX_DISK_ENTRIES', '20000')),
+    'db_path': os.getenv('YOUTUBE_SEARCH_CACHE_DB', os.path.join(CACHE_DIR, 'youtube_search.sqlite3'))
+}
+
+# Cached channel lookups. Titles rarely change, so they are refetched far less
+# often than statistics; only the stale parts of a channel are requested.
+YOUTUBE_CHANNEL_CACHE_CONFIG = {
+    'title_ttl_seconds': int(os.getenv('YOUTUBE_CHANNEL_TITLE_TTL_SECONDS', str(30 * 24 * 60 * 60))),
+    'statistics_ttl_seconds': int(os.getenv('YOUTUBE_CHANNEL_STATS_TTL_SECONDS', str(24 * 60 * 60))),
+    'max_concurrency': int(os.getenv('YOUTUBE_CHANNEL_CONCURRENCY', '4')),
+    'db_path': os.getenv('YOUTUBE_CHANNEL_CACHE_DB', os.path.join(CACHE_DIR, 'youtube_channels.sqlite3'))
+}
+
+# Keyword extraction for influencer search. Fewer, better keywords mean fewer
+# 100-unit YouTube searches per lookup.
+KEYWORD_EXTRACTION_CONFIG = {
+    'model': os.getenv('SPACY_MODEL', 'en_core_web_sm'),
+    'max_keywords': int(os.getenv('INFLUENCER_MAX_KEYWORDS', '8')),
+    'cache_entries': int(os.getenv('KEYWORD_CACHE_MAX_ENTRIES', '512')),
+    'batch_size': int(os.getenv('KEYWORD_BATCH_SIZE', '32')),
+    # Prefix of the IDF table used when spaCy is unavailable (see services/tfidf_keywords.py)
+    'idf_table': os.getenv('KEYWORD_IDF_TABLE', os.path.join('data', 'keyword_idf'))
+}
+
+# Local index of channels seen in past searches. Keywords searched within
+# keyword_ttl_seconds are answered from the index without calling the API.
+CHANNEL_INDEX_CONFIG = {
+    'enabled': os.getenv('CHANNEL_INDEX_ENABLED', 'true').lower() == 'true',
+    'keyword_ttl_seconds': int(os.getenv('CHANNEL_INDEX_KEYWORD_TTL_SECONDS', str(3 * 24 * 60 * 60))),
+    'db_path': os.getenv('CHANNEL_INDEX_DB', os.path.join(CACHE_DIR, 'channel_index.sqlite3'))
+}
+
+# Influencer ranking: stats are fetched (one quota unit per 50 channels) and
+# scored for up to candidate_pool of the most mentioned channels per lookup
+INFLUENCER_SCORING_CONFIG = {
+    'candidate_pool': int(os.getenv('INFLUENCER_CANDIDATE_POOL', '200'))
+}
+
+# Shared aiohttp session used by the publishers (see services/http_session.py)
+HTTP_CLIENT_CONFIG = {
+    'total_timeout': float(os.getenv('HTTP_TOTAL_TIMEOUT_SECONDS', '60')),
+    'connect_timeout': float(os.getenv('HTTP_CONNECT_TIMEOUT_SECONDS', '10')),
+    'limit': int(os.getenv('HTTP_MAX_CONNECTIONS', '100')),
+    'limit_per_host': int(os.getenv('HTTP_MAX_CONNECTIONS_PER_HOST', '20')),
+    'keepalive_timeout': float(os.getenv('HTTP_KEEPALIVE_SECONDS', '30'))
+}
+
+# Instagram Graph API publishing, per-request timeouts in seconds. Media
+# containers are polled from status_initial_delay up to status_max_delay
+# apart (with jitter) until they finish or status_timeout passes
+INSTAGRAM_PUBLISH_CONFIG = {
+    'upload_timeout': float(os.getenv('INSTAGRAM_UPLOAD_TIMEOUT_SECONDS', '120')),
+    'request_timeout': float(os.getenv('INSTAGRAM_REQUEST_TIMEOUT_SECONDS', '30')),
+    'status_initial_delay': float(os.getenv('INSTAGRAM_STATUS_INITIAL_DELAY_SECONDS', '1')),
+    'status_max_delay': float(os.getenv('INSTAGRAM_STATUS_MAX_DELAY_SECONDS', '10')),
+    'status_timeout': float(os.getenv('INSTAGRAM_STATUS_TIMEOUT_SECONDS', '300'))
+}
+
+# Per-platform deadline, in seconds, for "Post to All Platforms"; platforms are
+# published concurrently and a slow one is reported as timed out
+PUBLISH_TIMEOUT_CONFIG = {
+    'linkedin': float(os.getenv('LINKEDIN_PUBLISH_TIMEOUT_SECONDS', '30')),
+    'twitter': float(os.getenv('TWITTER_PUBLISH_TIMEOUT_SECONDS', '30')),
+    # Covers the upload and waiting for Instagram to process the media
+    'instagram': float(os.getenv('INSTAGRAM_PUBLISH_TIMEOUT_SECONDS', '420')),
+    'youtube': float(os.getenv('YOUTUBE_PUBLISH_TIMEOUT_SECONDS', '600'))
+}
+
+# Cached token validity (see services/auth_sessions.py): valid tokens are
+# re-checked every recheck_seconds or refresh_margin_seconds before they
+# expire, failed checks are retried after invalid_retry_seconds. Tokens unused
+# for idle_seconds stop being refreshed
+AUTH_SESSION_CONFIG = {
+    'recheck_seconds': float(os.getenv('AUTH_RECHECK_SECONDS', '3600')),
+    'refresh_margin_seconds': float(os.getenv('AUTH_REFRESH_MARGIN_SECONDS', '300')),
+    'invalid_retry_seconds': float(os.getenv('AUTH_INVALID_RETRY_SECONDS', '60')),
+    'refresh_interval_seconds': float(os.getenv('AUTH_REFRESH_INTERVAL_SECONDS', '60')),
+    'check_timeout_seconds': float(os.getenv('AUTH_CHECK_TIMEOUT_SECONDS', '30')),
+    'idle_seconds': float(os.getenv('AUTH_IDLE_SECONDS', '86400'))
+}
@@ -1,6 +1,7 @@
 # (File intentionally left blank. All Instagram info/publishing code removed.)
 import os
 from dotenv import load_dotenv
+from services.graph_batch import GraphBatchClient, GraphRequest
 
 def get_account_info():
     """
@@ -13,17 +14,23 @@ def get_account_info():
         print("ERROR: Access token not found in .env file")
         return
     
-    # 1. First verify the access token
-    verify_url = f"https://graph.facebook.com/debug_token"
-    params = {
-        'input_token': access_token,
-        'access_token': access_token
-    }
-    
+    # Token check, account lookup and account details go out as one Graph API
+    # batch; the details request reads the account ID from the lookup's result
+    graph = GraphBatchClient(access_token)
+    batch = [
+        # 1. Verify the access token
+        GraphRequest('GET', 'debug_token', params={'input_token': access_token}),
+        # 2. Get Instagram Business Account ID
+        GraphRequest('GET', graph.relative('me'), params={'fields': 'instagram_business_account'}, name='me'),
+        # 3. Get account details
+        GraphRequest('GET', graph.relative('{result=me:$.instagram_business_account.id}'),
+                     params={'fields': 'username,name,profile_picture_url'})
+    ]
+
     try:
-        print("\nVerifying access token...")
-        response = requests.get(verify_url, params=params)
-        token_info = response.json()
+        print("\nVerifying access token and fetching Instagram Business Account info...")
+        token_response, account_response, details_response = graph.execute_sync(batch)
+        token_info = token_response.json() if token_response else {}
         
         print("\nToken Information:")
         print("-" * 50)
@@ -36,16 +43,7 @@ def get_account_info():
             print("Error getting token info:", token_info.get('error', {}).get('message'))
             return
         
-        # 2. Get Instagram Business Account ID
-        print("\nFetching Instagram Business Account info...")
-        me_url = "https://graph.facebook.com/v18.0/me"
-        params = {
-            'access_token': access_token,
-            'fields': 'instagram_business_account'
-        }
-        
-        response = requests.get(me_url, params=params)
-        account_info = response.json()
+        account_info = account_response.json() if account_response else {}
         
         print("\nAccount Information:")
         print("-" * 50)
@@ -53,15 +51,7 @@ def get_account_info():
             ig_account_id = account_info['instagram_business_account']['id']
             print(f"Instagram Business Account ID: {ig_account_id}")
             
-            # 3. Get account details
-            account_url = f"https://graph.facebook.com/v18.0/{ig_account_id}"
-            params = {
-                'access_token': access_token,
-                'fields': 'username,name,profile_picture_url'
-            }
-            
-            response = requests.get(account_url, params=params)
-            details = response.json()
+            details = details_response.json() if details_response else {}
             
             print(f"Username: {details.get('username')}")
             print(f"Name: {details.get('name')}")
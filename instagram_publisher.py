@@ -1,7 +1,10 @@
 # (File intentionally left blank. All Instagram publishing code removed.)
-import requests
-from typing import Dict, Any, Optional
+import os
+from typing import Dict, Any
 from dotenv import load_dotenv
+from config.settings import INSTAGRAM_PUBLISH_CONFIG
+from services.http_session import get_http_session
+from services.media_status import get_status_poller
 
 class InstagramPublisher:
     def __init__(self):
@@ -10,6 +13,10 @@ class InstagramPublisher:
         self.account_id = os.getenv('INSTAGRAM_BUSINESS_ACCOUNT_ID')
         self.api_version = 'v18.0'  # Meta API version
         self.base_url = f'https://graph.facebook.com/{self.api_version}'
+        # Shared keep-alive session, so concurrent posts don't block each other or reconnect
+        self.http = get_http_session()
+        # Shared by every publisher with this token, so one scheduler polls all pending containers
+        self.status_poller = get_status_poller(self.access_token, self.api_version)
 
     async def publish_post(self, caption: str, media_path: str) -> Dict[str, Any]:
         """
@@ -41,7 +48,7 @@ class InstagramPublisher:
 
             print(f"Attempting to create media container... Account ID: {self.account_id}")
             # 1. Create container for the media
-            container_response = self._create_media_container(media_path, caption)
+            container_response = await self._create_media_container(media_path, caption)
             
             # Log the container response for debugging
             print(f"Container Response: {container_response}")
@@ -65,18 +72,21 @@ class InstagramPublisher:
 
             creation_id = container_response['id']
             
-            # Check media status before publishing
-            status = self._check_media_status(creation_id)
+            # Wait for Instagram to finish processing the media before publishing
+            status = await self.status_poller.wait(creation_id)
             if status.get('status_code') != 'FINISHED':
+                details = f'Status: {status.get("status_code", "Unknown")}'
+                if status.get('timed_out'):
+                    details += f' (still processing after {INSTAGRAM_PUBLISH_CONFIG["status_timeout"]:.0f}s)'
                 return {
                     'success': False,
                     'error': 'Media processing failed',
-                    'details': f'Status: {status.get("status_code", "Unknown")}',
+                    'details': details,
                     'api_response': status
                 }
 
             # 2. Publish the container
-            publish_response = self._publish_container(creation_id)
+            publish_response = await self._publish_container(creation_id)
             print(f"Publish Response: {publish_response}")
 
             if 'error' in publish_response:
@@ -109,7 +119,7 @@ class InstagramPublisher:
                 'error': str(e)
             }
 
-    def _create_media_container(self, media_path: str, caption: str) -> Dict[str, Any]:
+    async def _create_media_container(self, media_path: str, caption: str) -> Dict[str, Any]:
         """Create a media container for the image."""
         url = f"{self.base_url}/{self.account_id}/media"
         
@@ -133,14 +143,15 @@ class InstagramPublisher:
                 'image_url': 'https://graph.facebook.com',  # This is a placeholder
             }
             
-            # First, create the container
-            with open(media_path, 'rb') as image_file:
-                files = {
-                    'image': image_file
-                }
-                response = requests.post(url, data=params, files=files)
-                
-            print(f"API Response for media container creation: {response.text}")
+            # First, create the container; the image is streamed rather than read into memory
+            response = await self.http.request(
+                'POST', url,
+                data=params,
+                files={'image': media_path},
+                timeout=INSTAGRAM_PUBLISH_CONFIG['upload_timeout']
+            )
+
+            print(f"API Response for media container creation: {response.body}")
             return response.json()
             
         except Exception as e:
@@ -152,7 +163,7 @@ class InstagramPublisher:
                 }
             }
 
-    def _publish_container(self, creation_id: str) -> Dict[str, Any]:
+    async def _publish_container(self, creation_id: str) -> Dict[str, Any]:
         """Publish the media container."""
         url = f"{self.base_url}/{self.account_id}/media_publish"
         
@@ -161,17 +172,7 @@ class InstagramPublisher:
             'creation_id': creation_id
         }
         
-        response = requests.post(url, params=params)
-        return response.json()
-
-    def _check_media_status(self, creation_id: str) -> Dict[str, Any]:
-        """Check the status of a media container."""
-        url = f"{self.base_url}/{creation_id}"
-        
-        params = {
-            'access_token': self.access_token,
-            'fields': 'status_code,status'
-        }
-        
-        response = requests.get(url, params=params)
+        response = await self.http.request(
+            'POST', url, params=params, timeout=INSTAGRAM_PUBLISH_CONFIG['request_timeout']
+        )
         return response.json()
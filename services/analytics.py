@@ -1,6 +1,9 @@
+import threading
 from typing import Dict, List, Any
 from abc import ABC, abstractmethod
+from collections import deque
 from services.interfaces import Analytics
+from services.instrumentation import CallObserver, CallRecord
 from datetime import datetime
 
 class AnalyticsObserver(ABC):
@@ -25,12 +28,20 @@ class DatabaseObserver(AnalyticsObserver):
         # Implementation for database storage
         pass
 
-class AnalyticsManager(Analytics):
-    """Analytics manager implementing the Observer pattern"""
+class AnalyticsManager(Analytics, CallObserver):
+    """Analytics manager implementing the Observer pattern
     
-    def __init__(self):
+    Also consumes AI service call records when registered with
+    services.instrumentation.instrumentation.add_observer().
+    """
+    
+    def __init__(self, max_call_records: int = 1000):
         self.observers: List[AnalyticsObserver] = []
         self.metrics_cache: Dict[str, Dict[str, Any]] = {}
+        self.call_records = deque(maxlen=max_call_records)
+        self.usage: Dict[str, Dict[str, Any]] = {}
+        # on_call runs on worker threads (executor pools, the streaming pump)
+        self._usage_lock = threading.Lock()
         
     def add_observer(self, observer: AnalyticsObserver) -> None:
         """Add an observer"""
@@ -62,3 +73,39 @@ class AnalyticsManager(Analytics):
             'post_id': post_id,
             'metrics': {}  # Platform-specific metrics would go here
         }
+
+    def on_call(self, record: CallRecord) -> None:
+        """Aggregate usage per platform/language from an instrumented call"""
+        label = record.platform or record.language or record.service
+        with self._usage_lock:
+            self.call_records.append(record)
+            usage = self.usage.setdefault(label, {
+                'calls': 0,
+                'errors': 0,
+                'total_duration_s': 0.0,
+                'input_tokens': 0,
+                'output_tokens': 0,
+                'characters': 0,
+                'retries': 0,
+                'estimated_cost_usd': 0.0
+            })
+            usage['calls'] += 1
+            usage['errors'] += 0 if record.success else 1
+            usage['total_duration_s'] += record.duration_s
+            usage['input_tokens'] += record.input_tokens
+            usage['output_tokens'] += record.output_tokens
+            usage['characters'] += record.characters
+            usage['retries'] += record.retries
+            usage['estimated_cost_usd'] += record.cost_usd
+
+    def get_usage_summary(self) -> Dict[str, Dict[str, Any]]:
+        """Get aggregated AI service usage, most expensive label first"""
+        with self._usage_lock:
+            snapshot = {label: dict(usage) for label, usage in self.usage.items()}
+        summary = {}
+        for label, usage in sorted(snapshot.items(), key=lambda x: x[1]['estimated_cost_usd'], reverse=True):
+            summary[label] = {
+                **usage,
+                'avg_duration_s': usage['total_duration_s'] / usage['calls'] if usage['calls'] else 0.0
+            }
+        return summary
@@ -0,0 +1,169 @@
+import asyncio
+import threading
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, Hashable, Optional, Union
+from config.settings import AUTH_SESSION_CONFIG, INSTAGRAM_PUBLISH_CONFIG
+from services.http_session import get_http_session
+
+@dataclass
+class TokenStatus:
+    """Result of a token check. expires_at is epoch seconds, None when unknown or never."""
+    valid: bool
+    expires_at: Optional[float] = None
+
+TokenCheck = Callable[[], Awaitable[Union[TokenStatus, bool]]]
+
+@dataclass
+class _Entry:
+    check: TokenCheck
+    status: TokenStatus
+    checked_at: float
+    requested_at: float
+
+async def graph_token_status(access_token: str, api_version: str = 'v18.0') -> TokenStatus:
+    """
+    Validity and expiry of a Meta access token via the Graph API debug_token
+    endpoint. Tokens that may not debug themselves fall back to GET /me,
+    which gives validity without an expiry.
+    """
+    http = get_http_session()
+    base_url = f'https://graph.facebook.com/{api_version}'
+    timeout = INSTAGRAM_PUBLISH_CONFIG['request_timeout']
+    response = await http.request(
+        'GET', f'{base_url}/debug_token',
+        params={'input_token': access_token, 'access_token': access_token}, timeout=timeout
+    )
+    data = response.json().get('data')
+    if data:
+        # expires_at is 0 for tokens that never expire
+        return TokenStatus(valid=bool(data.get('is_valid')), expires_at=data.get('expires_at') or None)
+    response = await http.request('GET', f'{base_url}/me', params={'access_token': access_token}, timeout=timeout)
+    return TokenStatus(valid=response.ok and 'id' in response.json())
+
+class AuthSessionManager:
+    """
+    Caches whether each platform token is valid, so publishers don't re-check
+    it before every post.
+
+    Tokens are keyed by the caller, e.g. ('instagram', token). A valid token
+    is trusted until refresh_margin_seconds before it expires, and at most
+    recheck_seconds in any case, since tokens can be revoked. Failed checks
+    are cached for invalid_retry_seconds; checks that raise or take longer
+    than check_timeout_seconds count as invalid but are not cached.
+    Concurrent checks of one key share a request; if it is cancelled, the
+    other callers get invalid. While any token is
+    cached, a background task on the shared HTTP session loop re-checks
+    tokens before they go stale, so callers rarely wait on a check. Tokens
+    not asked about for idle_seconds are dropped instead of refreshed.
+    """
+
+    def __init__(self,
+                 recheck_seconds: float = 3600,
+                 refresh_margin_seconds: float = 300,
+                 invalid_retry_seconds: float = 60,
+                 refresh_interval_seconds: float = 60,
+                 check_timeout_seconds: float = 30,
+                 idle_seconds: float = 86400):
+        self.recheck_seconds = recheck_seconds
+        self.refresh_margin_seconds = refresh_margin_seconds
+        self.invalid_retry_seconds = invalid_retry_seconds
+        self.refresh_interval_seconds = refresh_interval_seconds
+        self.check_timeout_seconds = check_timeout_seconds
+        self.idle_seconds = idle_seconds
+        self._entries: Dict[Hashable, _Entry] = {}
+        self._pending: Dict[Hashable, asyncio.Future] = {}
+        self._refresher: Optional[asyncio.Task] = None
+
+    def _stale_at(self, entry: _Entry) -> float:
+        """When a cached result must be checked again."""
+        if not entry.status.valid:
+            return entry.checked_at + self.invalid_retry_seconds
+        stale_at = entry.checked_at + self.recheck_seconds
+        if entry.status.expires_at:
+            stale_at = min(stale_at, entry.status.expires_at - self.refresh_margin_seconds)
+        return stale_at
+
+    async def _check(self, key: Hashable, check: TokenCheck) -> TokenStatus:
+        # Runs on the session loop; callers of the same key share one check
+        if key in self._pending:
+            return await asyncio.shield(self._pending[key])
+        future = asyncio.get_running_loop().create_future()
+        self._pending[key] = future
+        try:
+            try:
+                status = await asyncio.wait_for(check(), self.check_timeout_seconds)
+                if not isinstance(status, TokenStatus):
+                    status = TokenStatus(valid=bool(status))
+                previous = self._entries.get(key)
+                now = time.time()
+                self._entries[key] = _Entry(check=check, status=status, checked_at=now,
+                                            requested_at=previous.requested_at if previous else now)
+            except Exception as e:
+                # Leave the cache alone so the next caller retries
+                print(f"Authentication check failed for {key[0] if isinstance(key, tuple) else key}: "
+                      f"{str(e) or type(e).__name__}")
+                status = TokenStatus(valid=False)
+            future.set_result(status)
+            return status
+        finally:
+            del self._pending[key]
+            if not future.done():
+                # This check was cancelled; don't leave the callers sharing it waiting
+                future.set_result(TokenStatus(valid=False))
+
+    async def _status(self, key: Hashable, check: TokenCheck, force: bool) -> TokenStatus:
+        entry = self._entries.get(key)
+        if entry is not None and not force and time.time() < self._stale_at(entry):
+            status = entry.status
+        else:
+            status = await self._check(key, check)
+            entry = self._entries.get(key)
+        if entry is not None:
+            entry.requested_at = time.time()
+            # Started once something is cached; the loop ends when the cache empties
+            if self._refresher is None or self._refresher.done():
+                self._refresher = asyncio.get_running_loop().create_task(self._refresh_loop())
+        return status
+
+    async def _refresh_loop(self) -> None:
+        while self._entries:
+            await asyncio.sleep(self.refresh_interval_seconds)
+            now = time.time()
+            for key in [key for key, entry in self._entries.items()
+                        if now - entry.requested_at > self.idle_seconds]:
+                del self._entries[key]
+            # Re-check valid tokens that will go stale before the next pass
+            horizon = now + self.refresh_interval_seconds
+            due = [(key, entry.check) for key, entry in list(self._entries.items())
+                   if entry.status.valid and self._stale_at(entry) <= horizon]
+            if due:
+                await asyncio.gather(*(self._check(key, check) for key, check in due))
+
+    async def is_valid(self, key: Hashable, check: TokenCheck, force: bool = False) -> bool:
+        """
+        Whether the token for key is valid, calling check() only when the cached
+        result is missing or stale (or force is set). check returns a
+        TokenStatus, or a bool when the platform reports no expiry.
+        """
+        status = await get_http_session().run(self._status(key, check, force))
+        return status.valid
+
+    def is_valid_sync(self, key: Hashable, check: TokenCheck, force: bool = False) -> bool:
+        """Blocking is_valid() for synchronous callers."""
+        return get_http_session().run_sync(self._status(key, check, force)).valid
+
+    def invalidate(self, key: Hashable) -> None:
+        """Forget a cached result, e.g. after the platform rejected the token."""
+        self._entries.pop(key, None)
+
+_auth_sessions: Optional[AuthSessionManager] = None
+_auth_sessions_lock = threading.Lock()
+
+def get_auth_sessions() -> AuthSessionManager:
+    """Return the process-wide AuthSessionManager, configured from AUTH_SESSION_CONFIG."""
+    global _auth_sessions
+    with _auth_sessions_lock:
+        if _auth_sessions is None:
+            _auth_sessions = AuthSessionManager(**AUTH_SESSION_CONFIG)
+        return _auth_sessions
@@ -0,0 +1,180 @@
+import sqlite3
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from services.response_cache import open_sqlite
+
+class ChannelIndex:
+    """
+    Persistent index of YouTube channels seen across influencer searches.
+
+    Stores which channels each keyword search surfaced (keyword -> channel
+    edges with mention counts), when each keyword was last searched, and a
+    daily history of subscriber/view/video counts per channel. Keywords
+    searched within keyword_ttl_seconds can be answered from the index alone;
+    re-searching a keyword replaces its edges, so refreshes are incremental.
+    Without a db_path the index lives in memory.
+    """
+
+    def __init__(self, keyword_ttl_seconds: int, db_path: Optional[str] = None):
+        self.keyword_ttl_seconds = keyword_ttl_seconds
+        self.db_path = db_path or None
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+
+    def _connection(self) -> sqlite3.Connection:
+        """Open the index on first use. Must be called with the lock held."""
+        if self._db is None:
+            db = open_sqlite(self.db_path or ":memory:")
+            db.executescript("""
+                CREATE TABLE IF NOT EXISTS channels (
+                    channel_id TEXT PRIMARY KEY,
+                    title TEXT,
+                    first_seen REAL NOT NULL,
+                    last_seen REAL NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS keyword_searches (
+                    keyword TEXT PRIMARY KEY,
+                    searched_at REAL NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS keyword_channels (
+                    keyword TEXT NOT NULL,
+                    channel_id TEXT NOT NULL,
+                    mentions INTEGER NOT NULL,
+                    last_seen REAL NOT NULL,
+                    latest_video_at REAL NOT NULL DEFAULT 0,
+                    PRIMARY KEY (keyword, channel_id)
+                );
+                CREATE INDEX IF NOT EXISTS idx_keyword_channels_channel ON keyword_channels(channel_id);
+                CREATE INDEX IF NOT EXISTS idx_keyword_searches_searched_at ON keyword_searches(searched_at);
+                CREATE TABLE IF NOT EXISTS subscriber_history (
+                    channel_id TEXT NOT NULL,
+                    day TEXT NOT NULL,
+                    observed_at REAL NOT NULL,
+                    subs INTEGER,
+                    views INTEGER,
+                    videos INTEGER,
+                    PRIMARY KEY (channel_id, day)
+                );
+            """)
+            columns = {row[1] for row in db.execute("PRAGMA table_info(keyword_channels)")}
+            if 'latest_video_at' not in columns:
+                db.execute("ALTER TABLE keyword_channels ADD COLUMN latest_video_at REAL NOT NULL DEFAULT 0")
+            db.commit()
+            self._db = db
+        return self._db
+
+    def fresh_keywords(self, keywords: Iterable[str], max_age_seconds: Optional[int] = None) -> Set[str]:
+        """Return the keywords searched within max_age_seconds (default keyword_ttl_seconds)."""
+        keywords = list(dict.fromkeys(keywords))
+        if not keywords:
+            return set()
+        max_age = self.keyword_ttl_seconds if max_age_seconds is None else max_age_seconds
+        placeholders = ",".join("?" * len(keywords))
+        with self._lock:
+            rows = self._connection().execute(
+                f"SELECT keyword FROM keyword_searches WHERE keyword IN ({placeholders}) AND searched_at >= ?",
+                (*keywords, time.time() - max_age)
+            ).fetchall()
+        return {row[0] for row in rows}
+
+    def record_search(self, keyword: str, channel_counts: Dict[str, int],
+                      titles: Optional[Dict[str, str]] = None,
+                      latest_video_at: Optional[Dict[str, float]] = None) -> None:
+        """
+        Replace the edges of keyword with the channels a fresh search returned.
+        latest_video_at maps channel ids to the publish time of their newest matching video.
+        """
+        now = time.time()
+        titles = titles or {}
+        latest_video_at = latest_video_at or {}
+        with self._lock:
+            db = self._connection()
+            db.execute("DELETE FROM keyword_channels WHERE keyword = ?", (keyword,))
+            db.executemany(
+                "INSERT INTO keyword_channels (keyword, channel_id, mentions, last_seen, latest_video_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                [(keyword, channel_id, mentions, now, latest_video_at.get(channel_id, 0.0))
+                 for channel_id, mentions in channel_counts.items()]
+            )
+            db.executemany(
+                "INSERT INTO channels (channel_id, title, first_seen, last_seen) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(channel_id) DO UPDATE SET last_seen = excluded.last_seen, "
+                "title = COALESCE(excluded.title, channels.title)",
+                [(channel_id, titles.get(channel_id), now, now) for channel_id in channel_counts]
+            )
+            db.execute(
+                "INSERT OR REPLACE INTO keyword_searches (keyword, searched_at) VALUES (?, ?)",
+                (keyword, now)
+            )
+            db.commit()
+
+    def channel_counts(self, keywords: Iterable[str]) -> Counter:
+        """Total mentions per channel across the given keywords."""
+        keywords = list(dict.fromkeys(keywords))
+        if not keywords:
+            return Counter()
+        placeholders = ",".join("?" * len(keywords))
+        with self._lock:
+            rows = self._connection().execute(
+                f"SELECT channel_id, SUM(mentions) FROM keyword_channels "
+                f"WHERE keyword IN ({placeholders}) GROUP BY channel_id",
+                keywords
+            ).fetchall()
+        return Counter({channel_id: mentions for channel_id, mentions in rows})
+
+    def keyword_edges(self, keywords: Iterable[str]) -> List[Tuple[str, str, int, float]]:
+        """(keyword, channel_id, mentions, latest_video_at) for every edge of the given keywords."""
+        keywords = list(dict.fromkeys(keywords))
+        if not keywords:
+            return []
+        placeholders = ",".join("?" * len(keywords))
+        with self._lock:
+            return self._connection().execute(
+                f"SELECT keyword, channel_id, mentions, latest_video_at FROM keyword_channels "
+                f"WHERE keyword IN ({placeholders})",
+                keywords
+            ).fetchall()
+
+    def record_stats(self, stats: Dict[str, Dict]) -> None:
+        """Store one subscriber/view/video observation per channel per UTC day."""
+        if not stats:
+            return
+        now = time.time()
+        day = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+        with self._lock:
+            db = self._connection()
+            db.executemany(
+                "INSERT OR REPLACE INTO subscriber_history (channel_id, day, observed_at, subs, views, videos) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [(channel_id, day, now, data.get("subs"), data.get("views"), data.get("videos"))
+                 for channel_id, data in stats.items()]
+            )
+            db.executemany(
+                "UPDATE channels SET title = ? WHERE channel_id = ?",
+                [(data.get("title"), channel_id) for channel_id, data in stats.items() if data.get("title")]
+            )
+            db.commit()
+
+    def subscriber_history(self, channel_id: str) -> List[Dict]:
+        """Daily observations for a channel, oldest first."""
+        with self._lock:
+            rows = self._connection().execute(
+                "SELECT day, subs, views, videos FROM subscriber_history "
+                "WHERE channel_id = ? ORDER BY day",
+                (channel_id,)
+            ).fetchall()
+        return [{"day": day, "subs": subs, "views": views, "videos": videos}
+                for day, subs, views, videos in rows]
+
+    def prune(self, older_than_seconds: int) -> int:
+        """Drop keyword edges and searches not refreshed within older_than_seconds; return edges removed."""
+        cutoff = time.time() - older_than_seconds
+        with self._lock:
+            db = self._connection()
+            cursor = db.execute("DELETE FROM keyword_channels WHERE last_seen < ?", (cutoff,))
+            db.execute("DELETE FROM keyword_searches WHERE searched_at < ?", (cutoff,))
+            db.commit()
+            return cursor.rowcount
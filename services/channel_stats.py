@@ -0,0 +1,156 @@
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, ContextManager, Dict, List, Optional
+from services.response_cache import open_sqlite
+from services.youtube_quota import CHANNELS_LIST_COST, QuotaLedger
+
+# channels().list accepts at most 50 ids per request
+CHANNELS_PER_REQUEST = 50
+
+class ChannelStatsService:
+    """
+    Batched, cached lookup of YouTube channel titles and statistics.
+
+    Titles (snippet) and statistics are cached with separate freshness
+    windows, since titles rarely change while subscriber counts drift. Only
+    the parts that are stale or missing are requested, in batches of 50 ids,
+    with the batches fetched concurrently.
+    """
+
+    def __init__(self,
+                 title_ttl_seconds: int,
+                 statistics_ttl_seconds: int,
+                 max_concurrency: int = 4,
+                 db_path: Optional[str] = None,
+                 quota_ledger: Optional[QuotaLedger] = None):
+        self.title_ttl_seconds = title_ttl_seconds
+        self.statistics_ttl_seconds = statistics_ttl_seconds
+        self.max_concurrency = max_concurrency
+        self.db_path = db_path or None
+        self.quota_ledger = quota_ledger
+        self._lock = threading.Lock()
+        self._channels: Dict[str, Dict] = {}
+        self._db: Optional[sqlite3.Connection] = None
+        self._loaded = False
+
+    def _connection(self) -> Optional[sqlite3.Connection]:
+        """Open the store and load it into memory on first use. Call with the lock held."""
+        if not self._loaded:
+            self._loaded = True
+            if self.db_path:
+                self._db = open_sqlite(self.db_path)
+                self._db.execute(
+                    "CREATE TABLE IF NOT EXISTS channel_stats ("
+                    "channel_id TEXT PRIMARY KEY, title TEXT, title_fetched_at REAL, "
+                    "subs INTEGER, views INTEGER, videos INTEGER, statistics_fetched_at REAL)"
+                )
+                self._db.commit()
+                for row in self._db.execute("SELECT * FROM channel_stats"):
+                    self._channels[row[0]] = {
+                        'title': row[1], 'title_fetched_at': row[2] or 0.0,
+                        'subs': row[3], 'views': row[4], 'videos': row[5],
+                        'statistics_fetched_at': row[6] or 0.0
+                    }
+        return self._db
+
+    def _stale_parts(self, channel_id: str, now: float) -> List[str]:
+        entry = self._channels.get(channel_id, {})
+        parts = []
+        if now - entry.get('title_fetched_at', 0.0) > self.title_ttl_seconds:
+            parts.append('snippet')
+        if now - entry.get('statistics_fetched_at', 0.0) > self.statistics_ttl_seconds:
+            parts.append('statistics')
+        return parts
+
+    def _fetch_batch(self, acquire_client: Callable[[], ContextManager],
+                     parts: List[str], channel_ids: List[str]) -> List[Dict]:
+        if self.quota_ledger and not self.quota_ledger.try_spend(CHANNELS_LIST_COST):
+            print("YouTube quota budget reached; using cached channel stats")
+            return []
+        try:
+            with acquire_client() as youtube:
+                resp = youtube.channels().list(
+                    part=",".join(parts),
+                    id=",".join(channel_ids),
+                    maxResults=CHANNELS_PER_REQUEST
+                ).execute()
+        except Exception as e:
+            print(f"Error fetching channel stats: {str(e)}")
+            return []
+        return resp.get("items", [])
+
+    def _store(self, items: List[Dict], now: float) -> None:
+        with self._lock:
+            db = self._connection()
+            for item in items:
+                entry = self._channels.setdefault(item["id"], {})
+                if "snippet" in item:
+                    entry['title'] = item["snippet"].get("title")
+                    entry['title_fetched_at'] = now
+                if "statistics" in item:
+                    statistics = item["statistics"]
+                    entry['subs'] = int(statistics.get("subscriberCount", 0))
+                    entry['views'] = int(statistics.get("viewCount", 0))
+                    entry['videos'] = int(statistics.get("videoCount", 0))
+                    entry['statistics_fetched_at'] = now
+                if db is not None:
+                    db.execute(
+                        "INSERT OR REPLACE INTO channel_stats VALUES (?, ?, ?, ?, ?, ?, ?)",
+                        (item["id"], entry.get('title'), entry.get('title_fetched_at'),
+                         entry.get('subs'), entry.get('views'), entry.get('videos'),
+                         entry.get('statistics_fetched_at'))
+                    )
+            if db is not None:
+                db.commit()
+
+    def get_stats(self, channel_ids: List[str],
+                  acquire_client: Callable[[], ContextManager]) -> Dict[str, Dict]:
+        """
+        Return {channel_id: {title, subs, views, videos, link}} for the given ids.
+
+        - acquire_client: returns a context manager that checks out a youtube
+          client for the calling thread, e.g. YouTubeClientPool.client; batches
+          are fetched from several threads at once.
+        Channels the API does not return (and that were never cached) are omitted.
+        """
+        now = time.time()
+        unique_ids = list(dict.fromkeys(channel_ids))
+        with self._lock:
+            self._connection()
+            requests = {}
+            for channel_id in unique_ids:
+                parts = self._stale_parts(channel_id, now)
+                if parts:
+                    requests.setdefault(tuple(parts), []).append(channel_id)
+
+        batches = [
+            (list(parts), ids[start:start + CHANNELS_PER_REQUEST])
+            for parts, ids in requests.items()
+            for start in range(0, len(ids), CHANNELS_PER_REQUEST)
+        ]
+        if batches:
+            with ThreadPoolExecutor(max_workers=max(1, min(self.max_concurrency, len(batches))),
+                                    thread_name_prefix="youtube-channels") as executor:
+                results = executor.map(
+                    lambda batch: self._fetch_batch(acquire_client, batch[0], batch[1]),
+                    batches
+                )
+                for items in results:
+                    self._store(items, now)
+
+        stats = {}
+        with self._lock:
+            for channel_id in unique_ids:
+                entry = self._channels.get(channel_id)
+                if not entry or entry.get('title') is None:
+                    continue
+                stats[channel_id] = {
+                    "title": entry['title'],
+                    "subs": entry.get('subs') or 0,
+                    "views": entry.get('views') or 0,
+                    "videos": entry.get('videos') or 0,
+                    "link": f"https://www.youtube.com/channel/{channel_id}"
+                }
+        return stats
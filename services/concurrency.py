@@ -0,0 +1,167 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Optional
+
+# AWS error codes that signal the caller is sending too fast
+THROTTLING_ERROR_CODES = {
+    'ThrottlingException',
+    'TooManyRequestsException',
+    'Throttling',
+    'RequestLimitExceeded'
+}
+
+def is_throttling_error(error: Exception) -> bool:
+    """Return True if error is a botocore ClientError caused by throttling."""
+    response = getattr(error, 'response', None)
+    if not isinstance(response, dict):
+        return False
+    return response.get('Error', {}).get('Code') in THROTTLING_ERROR_CODES
+
+class AdaptiveConcurrencyLimiter:
+    """
+    AIMD (additive increase, multiplicative decrease) concurrency limiter.
+
+    Blocking callers take a slot with slot(). Every successful call grows the
+    limit by increase_step / limit (roughly +increase_step per full window of
+    calls); a throttled call multiplies it by decrease_factor. Decreases are
+    applied at most once per decrease_cooldown seconds so one burst of
+    throttles counts as a single congestion signal.
+    """
+
+    def __init__(self,
+                 name: str,
+                 max_limit: int,
+                 initial_limit: Optional[int] = None,
+                 min_limit: int = 1,
+                 increase_step: float = 1.0,
+                 decrease_factor: float = 0.5,
+                 decrease_cooldown: float = 1.0):
+        self.name = name
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.increase_step = increase_step
+        self.decrease_factor = decrease_factor
+        self.decrease_cooldown = decrease_cooldown
+        self._limit = float(initial_limit or max_limit)
+        self._in_flight = 0
+        self._last_decrease = 0.0
+        self._condition = threading.Condition()
+        self.counters: Dict[str, int] = {
+            'calls': 0,
+            'successes': 0,
+            'errors': 0,
+            'throttles': 0,
+            'limit_increases': 0,
+            'limit_decreases': 0
+        }
+
+    @property
+    def limit(self) -> int:
+        return max(self.min_limit, int(self._limit))
+
+    @contextmanager
+    def slot(self):
+        """Block until a slot is free, then hold it for the duration of the block."""
+        with self._condition:
+            while self._in_flight >= self.limit:
+                self._condition.wait()
+            self._in_flight += 1
+            self.counters['calls'] += 1
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._in_flight -= 1
+                self._condition.notify_all()
+
+    def on_success(self) -> None:
+        with self._condition:
+            self.counters['successes'] += 1
+            previous = self.limit
+            self._limit = min(float(self.max_limit), self._limit + self.increase_step / max(self._limit, 1.0))
+            if self.limit > previous:
+                self.counters['limit_increases'] += 1
+                self._condition.notify_all()
+
+    def on_throttle(self) -> None:
+        with self._condition:
+            self.counters['throttles'] += 1
+            now = time.monotonic()
+            if now - self._last_decrease < self.decrease_cooldown:
+                return
+            self._last_decrease = now
+            previous = self.limit
+            self._limit = max(float(self.min_limit), self._limit * self.decrease_factor)
+            if self.limit < previous:
+                self.counters['limit_decreases'] += 1
+
+    def on_error(self) -> None:
+        with self._condition:
+            self.counters['errors'] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot of the counters plus the current limit and in-flight calls."""
+        with self._condition:
+            return {
+                **self.counters,
+                'limit': self.limit,
+                'in_flight': self._in_flight
+            }
+
+class ServiceExecutor:
+    """
+    Dedicated thread pool for one backend service, gated by an adaptive limiter.
+
+    max_workers should match the max_pool_connections of the botocore client
+    used inside the submitted calls so threads never wait on the HTTP pool.
+    Attach that client with observe_client() so throttles botocore retries
+    internally also reach the limiter.
+    """
+
+    def __init__(self, name: str, max_workers: int, limiter: Optional[AdaptiveConcurrencyLimiter] = None):
+        self.name = name
+        self.max_workers = max_workers
+        self.limiter = limiter or AdaptiveConcurrencyLimiter(name, max_limit=max_workers)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+        self._observes_attempts = False
+
+    def observe_client(self, client) -> None:
+        """
+        Report every throttled attempt of client's calls to the limiter,
+        including the ones botocore retries before a call returns or raises.
+        """
+        client.meta.events.register('needs-retry', self._on_attempt)
+        self._observes_attempts = True
+
+    def _on_attempt(self, response=None, **kwargs) -> None:
+        # botocore emits needs-retry after every attempt; response is (http, parsed)
+        if response is not None and response[1].get('Error', {}).get('Code') in THROTTLING_ERROR_CODES:
+            self.limiter.on_throttle()
+        # Returning None leaves the retry decision to botocore
+
+    def call(self, fn: Callable[[], Any]) -> Any:
+        """Run fn on the calling thread while holding a limiter slot."""
+        with self.limiter.slot():
+            try:
+                result = fn()
+            except Exception as e:
+                if is_throttling_error(e):
+                    # Already counted per attempt when the client is observed
+                    if not self._observes_attempts:
+                        self.limiter.on_throttle()
+                else:
+                    self.limiter.on_error()
+                raise
+            self.limiter.on_success()
+            return result
+
+    async def run(self, fn: Callable[[], Any]) -> Any:
+        """Run fn on this service's thread pool."""
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(self._executor, self.call, fn)
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._executor.shutdown(wait=wait)
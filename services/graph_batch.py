@@ -0,0 +1,186 @@
+import asyncio
+import json
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional
+from urllib.parse import urlencode
+from services.http_session import HttpResponse, get_http_session
+
+# Most operations the Graph API accepts in one batch request
+GRAPH_BATCH_LIMIT = 50
+
+# JSONPath references to earlier results, e.g. {result=me:$.instagram_business_account.id}
+_RESULT_REFERENCE = re.compile(r"\{result=([^:}]+):")
+
+# Graph API error codes worth retrying: unknown/temporary errors and rate limits
+TRANSIENT_ERROR_CODES = {1, 2, 4, 17, 32, 341, 613}
+
+def is_transient_error(body: Dict[str, Any]) -> bool:
+    """Whether a response body is a Graph API error that may clear up on retry."""
+    error = body.get('error')
+    if not isinstance(error, dict):
+        return True
+    return bool(error.get('is_transient')) or error.get('code') in TRANSIENT_ERROR_CODES
+
+@dataclass
+class GraphRequest:
+    """
+    One operation in a Graph API batch.
+
+    params are sent as the query string for GET/DELETE and as the form body
+    otherwise. A named request's result can be used by later requests in the
+    same batch through "{result=<name>:<JSONPath>}" in their URL or params.
+    """
+    method: str
+    relative_url: str
+    params: Optional[Dict[str, Any]] = None
+    name: Optional[str] = None
+    omit_response_on_success: bool = False
+
+    def to_operation(self) -> Dict[str, Any]:
+        operation: Dict[str, Any] = {'method': self.method.upper(), 'relative_url': self.relative_url}
+        if self.params:
+            # Keep JSONPath braces readable; the Graph API resolves them before decoding
+            encoded = urlencode(self.params, safe='{}=:$.,')
+            if operation['method'] in ('GET', 'DELETE'):
+                separator = '&' if '?' in self.relative_url else '?'
+                operation['relative_url'] = f"{self.relative_url}{separator}{encoded}"
+            else:
+                operation['body'] = encoded
+        if self.name:
+            operation['name'] = self.name
+            operation['omit_response_on_success'] = self.omit_response_on_success
+        return operation
+
+    def references(self) -> List[str]:
+        text = self.relative_url + json.dumps(self.params or {})
+        return _RESULT_REFERENCE.findall(text)
+
+def chunk_requests(requests: List[GraphRequest], limit: int = GRAPH_BATCH_LIMIT) -> List[List[int]]:
+    """
+    Split requests into batches of at most limit, as lists of indexes.
+    A request that references another's result stays in its batch, since
+    references only resolve within one batch.
+    """
+    names = {request.name: i for i, request in enumerate(requests) if request.name}
+    # Each request belongs to the span from the earliest request it depends on
+    span_start = list(range(len(requests)))
+    for i, request in enumerate(requests):
+        for name in request.references():
+            if name in names and names[name] < i:
+                span_start[i] = min(span_start[i], span_start[names[name]])
+    # Merge overlapping spans into groups that must share a batch
+    groups: List[List[int]] = []
+    for i in range(len(requests)):
+        if groups and span_start[i] <= groups[-1][-1]:
+            start = span_start[i]
+            while len(groups) > 1 and start <= groups[-2][-1]:
+                groups[-2].extend(groups.pop())
+            groups[-1].append(i)
+        else:
+            groups.append([i])
+
+    batches: List[List[int]] = []
+    for group in groups:
+        if len(group) > limit:
+            raise ValueError(f"{len(group)} dependent Graph API requests do not fit in one batch of {limit}")
+        if not batches or len(batches[-1]) + len(group) > limit:
+            batches.append([])
+        batches[-1].extend(group)
+    return batches
+
+class GraphBatchClient:
+    """
+    Sends Graph API operations through the batch endpoint over the shared
+    HTTP session, up to GRAPH_BATCH_LIMIT per round trip. Larger lists are
+    split into several batches sent concurrently. Responses come back in
+    request order; an entry is None when its response was omitted, a
+    request it depended on failed, or its whole batch failed in a way worth
+    retrying. A batch rejected outright (e.g. a bad token) gives every entry
+    the batch's error response, so callers fail fast.
+    """
+
+    def __init__(self, access_token: str, api_version: str = 'v18.0',
+                 base_url: str = 'https://graph.facebook.com',
+                 timeout: Optional[float] = None):
+        self.access_token = access_token
+        self.api_version = api_version
+        self.base_url = base_url
+        self.timeout = timeout
+        self.http = get_http_session()
+
+    def relative(self, path: str) -> str:
+        """Versioned relative URL for path, e.g. "v18.0/me"."""
+        return f"{self.api_version}/{path.lstrip('/')}"
+
+    async def _send(self, requests: List[GraphRequest]) -> List[Optional[HttpResponse]]:
+        response = await self.http.request(
+            'POST', self.base_url,
+            data={
+                'access_token': self.access_token,
+                'batch': json.dumps([request.to_operation() for request in requests]),
+                'include_headers': 'false'
+            },
+            timeout=self.timeout
+        )
+        if not isinstance(response.body, list):
+            # The whole batch failed and no operation ran
+            print(f"Graph API batch failed with status {response.status}: {response.body}")
+            if response.status >= 500 or response.status == 429 or is_transient_error(response.json()):
+                # Throttling or a server error; leave the responses empty for callers to retry
+                return [None] * len(requests)
+            return [response] * len(requests)
+        results: List[Optional[HttpResponse]] = []
+        for item in response.body:
+            if item is None:
+                results.append(None)
+                continue
+            body = item.get('body')
+            try:
+                body = json.loads(body) if body else None
+            except ValueError:
+                pass
+            headers = {header['name']: header['value'] for header in item.get('headers') or []}
+            results.append(HttpResponse(status=item.get('code', 0), headers=headers, body=body))
+        return results + [None] * (len(requests) - len(results))
+
+    async def execute(self, requests: Iterable[GraphRequest]) -> List[Optional[HttpResponse]]:
+        """Run requests in as few batches as possible and return their responses in order."""
+        requests = list(requests)
+        if not requests:
+            return []
+        batches = chunk_requests(requests)
+        batch_results = await asyncio.gather(*(self._send([requests[i] for i in batch]) for batch in batches))
+        results: List[Optional[HttpResponse]] = [None] * len(requests)
+        for batch, responses in zip(batches, batch_results):
+            for i, response in zip(batch, responses):
+                results[i] = response
+        return results
+
+    def execute_sync(self, requests: Iterable[GraphRequest]) -> List[Optional[HttpResponse]]:
+        """Blocking execute() for synchronous callers."""
+        return self.http.run_sync(self.execute(requests))
+
+    async def get_objects(self, object_ids: List[str], fields: str) -> Dict[str, Dict[str, Any]]:
+        """
+        Read fields of many objects (e.g. container statuses or post insights)
+        and return {id: JSON body}. Error bodies are included; IDs whose
+        response is missing are left out.
+        """
+        if len(object_ids) == 1:
+            # A single read is cheaper as a plain GET
+            response = await self.http.request(
+                'GET', f"{self.base_url}/{self.relative(object_ids[0])}",
+                params={'access_token': self.access_token, 'fields': fields},
+                timeout=self.timeout
+            )
+            return {object_ids[0]: response.json()}
+        responses = await self.execute(
+            GraphRequest('GET', self.relative(object_id), params={'fields': fields})
+            for object_id in object_ids
+        )
+        return {
+            object_id: response.json()
+            for object_id, response in zip(object_ids, responses)
+            if response is not None
+        }
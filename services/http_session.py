@@ -0,0 +1,153 @@
+import asyncio
+import json
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Dict, Optional
+from config.settings import HTTP_CLIENT_CONFIG
+
+@dataclass
+class HttpResponse:
+    """Status, headers and body of a finished request. body is parsed JSON when possible, else text."""
+    status: int
+    headers: Dict[str, str] = field(default_factory=dict)
+    body: Any = None
+
+    @property
+    def ok(self) -> bool:
+        return 200 <= self.status < 300
+
+    def json(self) -> Dict[str, Any]:
+        return self.body if isinstance(self.body, dict) else {}
+
+class SharedHttpSession:
+    """
+    Process-wide pooled aiohttp session.
+
+    aiohttp sessions are bound to the event loop that created them, while
+    Streamlit runs each action in a fresh asyncio.run() loop. The session
+    therefore lives on a dedicated daemon event-loop thread, and requests
+    from any loop or thread are handed to it, so keep-alive connections and
+    DNS lookups are reused across calls. Awaiting request() does not block
+    the caller's loop.
+    """
+
+    def __init__(self,
+                 total_timeout: float = 60,
+                 connect_timeout: float = 10,
+                 limit: int = 100,
+                 limit_per_host: int = 20,
+                 keepalive_timeout: float = 30):
+        self.total_timeout = total_timeout
+        self.connect_timeout = connect_timeout
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._session = None
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """The session's event loop, started on first use."""
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                threading.Thread(target=self._loop.run_forever, name="http-session", daemon=True).start()
+            return self._loop
+
+    def _get_session(self):
+        """Create the aiohttp session on first use. Runs on the session loop."""
+        if self._session is None or self._session.closed:
+            import aiohttp
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=self.limit,
+                    limit_per_host=self.limit_per_host,
+                    keepalive_timeout=self.keepalive_timeout,
+                    ttl_dns_cache=300
+                ),
+                timeout=aiohttp.ClientTimeout(total=self.total_timeout, sock_connect=self.connect_timeout)
+            )
+        return self._session
+
+    async def _request(self, method: str, url: str, params: Optional[Dict] = None,
+                       data: Optional[Dict] = None, json_body: Any = None,
+                       headers: Optional[Dict[str, str]] = None,
+                       files: Optional[Dict[str, str]] = None,
+                       timeout: Optional[float] = None) -> HttpResponse:
+        import aiohttp
+
+        session = self._get_session()
+        handles = []
+        try:
+            if files:
+                # Multipart body; aiohttp streams file objects in chunks instead of reading them whole
+                form = aiohttp.FormData()
+                for name, value in (data or {}).items():
+                    form.add_field(name, str(value))
+                for name, path in files.items():
+                    handle = open(path, "rb")
+                    handles.append(handle)
+                    form.add_field(name, handle)
+                data = form
+            options = {}
+            if timeout:
+                # Override only the total; None here would switch off the session's timeouts
+                options['timeout'] = aiohttp.ClientTimeout(total=timeout, sock_connect=self.connect_timeout)
+            async with session.request(method, url, params=params, data=data, json=json_body,
+                                       headers=headers, **options) as response:
+                text = await response.text()
+                try:
+                    body = json.loads(text) if text else None
+                except ValueError:
+                    body = text
+                return HttpResponse(status=response.status, headers=dict(response.headers), body=body)
+        finally:
+            for handle in handles:
+                handle.close()
+
+    async def run(self, coro: Awaitable) -> Any:
+        """Run a coroutine on the session loop and await its result from the calling loop."""
+        return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, self.loop))
+
+    def run_sync(self, coro: Awaitable, timeout: Optional[float] = None) -> Any:
+        """Run a coroutine on the session loop and block until it finishes. Not for use inside a loop."""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop).result(timeout)
+
+    async def request(self, method: str, url: str, *, params: Optional[Dict] = None,
+                      data: Optional[Dict] = None, json_body: Any = None,
+                      headers: Optional[Dict[str, str]] = None,
+                      files: Optional[Dict[str, str]] = None,
+                      timeout: Optional[float] = None) -> HttpResponse:
+        """
+        Send a request through the shared session.
+
+        - files: form field -> file path, sent as a streamed multipart upload
+          together with data.
+        - timeout: total seconds for this request; defaults to the session timeout.
+        """
+        return await self.run(self._request(method, url, params, data, json_body, headers, files, timeout))
+
+    def request_sync(self, method: str, url: str, *, params: Optional[Dict] = None,
+                     data: Optional[Dict] = None, json_body: Any = None,
+                     headers: Optional[Dict[str, str]] = None,
+                     files: Optional[Dict[str, str]] = None,
+                     timeout: Optional[float] = None) -> HttpResponse:
+        """Blocking request() for synchronous callers."""
+        return self.run_sync(self._request(method, url, params, data, json_body, headers, files, timeout))
+
+    def close(self) -> None:
+        """Close the session and its connections."""
+        if self._loop is not None and self._session is not None:
+            self.run_sync(self._session.close())
+
+_shared_session: Optional[SharedHttpSession] = None
+_shared_session_lock = threading.Lock()
+
+def get_http_session() -> SharedHttpSession:
+    """Return the process-wide SharedHttpSession, configured from HTTP_CLIENT_CONFIG."""
+    global _shared_session
+    with _shared_session_lock:
+        if _shared_session is None:
+            _shared_session = SharedHttpSession(**HTTP_CLIENT_CONFIG)
+        return _shared_session
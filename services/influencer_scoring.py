@@ -0,0 +1,103 @@
+import math
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+@dataclass
+class ScoringWeights:
+    """Relative weight of each normalized feature in an influencer's score."""
+    mentions: float = 1.0
+    subscribers: float = 0.5
+    recency: float = 0.3
+    diversity: float = 0.7
+    engagement: float = 0.3
+    # Days after which a channel's latest matching video counts half as recent
+    recency_half_life_days: float = 30.0
+
+@dataclass
+class CandidatePool:
+    """Per-channel evidence gathered from keyword searches and the channel index."""
+    mentions: Dict[str, int] = field(default_factory=dict)
+    keywords: Dict[str, set] = field(default_factory=dict)
+    latest_video_at: Dict[str, float] = field(default_factory=dict)
+
+    def add(self, keyword: str, channel_id: str, mentions: int, latest_video_at: float = 0.0) -> None:
+        self.mentions[channel_id] = self.mentions.get(channel_id, 0) + mentions
+        self.keywords.setdefault(channel_id, set()).add(keyword)
+        if latest_video_at > self.latest_video_at.get(channel_id, 0.0):
+            self.latest_video_at[channel_id] = latest_video_at
+
+    def most_mentioned(self, n: int) -> List[str]:
+        return sorted(self.mentions, key=self.mentions.get, reverse=True)[:n]
+
+    def __bool__(self) -> bool:
+        return bool(self.mentions)
+
+def _normalized(values):
+    import numpy as np
+    peak = values.max() if values.size else 0.0
+    return values / peak if peak > 0 else np.zeros_like(values)
+
+def score_channels(mentions: Sequence[float], subs: Sequence[float], views: Sequence[float],
+                   videos: Sequence[float], keyword_counts: Sequence[float],
+                   latest_video_at: Sequence[float], weights: ScoringWeights,
+                   now: Optional[float] = None):
+    """
+    Weighted score per channel, computed over whole arrays at once.
+
+    Each feature is scaled to [0, 1] by its maximum across the candidates:
+    mention count, log subscribers, recency of the latest matching video
+    (exponential decay), number of distinct keywords that surfaced the
+    channel, and engagement (log views per subscriber and per video).
+    """
+    import numpy as np
+
+    now = time.time() if now is None else now
+    mentions = np.asarray(mentions, dtype=np.float64)
+    subs = np.asarray(subs, dtype=np.float64)
+    views = np.asarray(views, dtype=np.float64)
+    videos = np.asarray(videos, dtype=np.float64)
+    keyword_counts = np.asarray(keyword_counts, dtype=np.float64)
+    latest_video_at = np.asarray(latest_video_at, dtype=np.float64)
+
+    age_days = np.maximum(now - latest_video_at, 0.0) / 86400.0
+    decay = math.log(2) / max(weights.recency_half_life_days, 1e-9)
+    recency = np.where(latest_video_at > 0, np.exp(-decay * age_days), 0.0)
+    engagement = (_normalized(np.log1p(views / np.maximum(subs, 1.0))) +
+                  _normalized(np.log1p(views / np.maximum(videos, 1.0)))) / 2
+
+    return (weights.mentions * _normalized(mentions) +
+            weights.subscribers * _normalized(np.log1p(subs)) +
+            weights.recency * recency +
+            weights.diversity * _normalized(keyword_counts) +
+            weights.engagement * engagement)
+
+def top_k(scores, k: int) -> List[int]:
+    """Indexes of the k highest scores, best first, using argpartition for large pools."""
+    import numpy as np
+
+    scores = np.asarray(scores)
+    if k <= 0 or scores.size == 0:
+        return []
+    if k < scores.size:
+        candidates = np.argpartition(-scores, k - 1)[:k]
+    else:
+        candidates = np.arange(scores.size)
+    return [int(i) for i in candidates[np.argsort(-scores[candidates], kind="stable")]]
+
+def rank_pool(pool: CandidatePool, stats: Dict[str, Dict], weights: ScoringWeights,
+              k: int) -> List[Tuple[str, float]]:
+    """Score the pooled channels that have stats and return the top k as (channel_id, score)."""
+    channel_ids = [channel_id for channel_id in pool.mentions if channel_id in stats]
+    if not channel_ids:
+        return []
+    scores = score_channels(
+        [pool.mentions[c] for c in channel_ids],
+        [stats[c].get("subs", 0) for c in channel_ids],
+        [stats[c].get("views", 0) for c in channel_ids],
+        [stats[c].get("videos", 0) for c in channel_ids],
+        [len(pool.keywords.get(c, ())) for c in channel_ids],
+        [pool.latest_video_at.get(c, 0.0) for c in channel_ids],
+        weights
+    )
+    return [(channel_ids[i], float(scores[i])) for i in top_k(scores, k)]
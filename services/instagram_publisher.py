@@ -1,8 +1,12 @@
 import os
-from typing import Optional
+from typing import Dict, List, Optional, Tuple
 import requests
 from datetime import datetime
 import json
+from config.settings import INSTAGRAM_PUBLISH_CONFIG
+from services.auth_sessions import get_auth_sessions, graph_token_status
+from services.graph_batch import GraphBatchClient, GraphRequest
+from services.media_status import get_status_poller
 
 class InstagramPublisher:
     def __init__(self):
@@ -10,14 +14,19 @@ class InstagramPublisher:
         self.account_id = os.getenv('INSTAGRAM_BUSINESS_ACCOUNT_ID')
         self.api_version = 'v18.0'  # Latest version as of now
         self.base_url = f'https://graph.facebook.com/{self.api_version}'
+        self.graph = GraphBatchClient(
+            self.access_token, api_version=self.api_version,
+            timeout=INSTAGRAM_PUBLISH_CONFIG['request_timeout']
+        )
+        self.status_poller = get_status_poller(self.access_token, self.api_version)
 
     def verify_credentials(self) -> bool:
-        """Verify if the access token is valid."""
+        """Verify if the access token is valid. The result is cached until the token nears expiry."""
         try:
-            url = f'{self.base_url}/me'
-            params = {'access_token': self.access_token}
-            response = requests.get(url, params=params)
-            return response.status_code == 200
+            return get_auth_sessions().is_valid_sync(
+                ('instagram', self.access_token),
+                lambda: graph_token_status(self.access_token, self.api_version)
+            )
         except Exception as e:
             print(f"Error verifying credentials: {str(e)}")
             return False
@@ -89,3 +98,103 @@ class InstagramPublisher:
         except Exception as e:
             print(f"Error creating post: {str(e)}")
             return False
+
+    def _wait_until_finished(self, creation_ids: List[str]) -> List[str]:
+        """Poll containers together until processed; return the ones that finished."""
+        statuses = self.graph.http.run_sync(self.status_poller.wait_many(creation_ids))
+        for creation_id, status in statuses.items():
+            if status.get('status_code') != 'FINISHED':
+                print(f"Media {creation_id} not ready: {status.get('status_code') or status.get('error')}")
+        return [creation_id for creation_id in creation_ids
+                if statuses[creation_id].get('status_code') == 'FINISHED']
+
+    def _publish_containers(self, creation_ids: List[str]) -> Dict[str, Optional[str]]:
+        """Publish finished containers in one batch; return creation ID -> published media ID."""
+        responses = self.graph.execute_sync(
+            GraphRequest('POST', self.graph.relative(f'{self.account_id}/media_publish'),
+                         params={'creation_id': creation_id})
+            for creation_id in creation_ids
+        )
+        published = {}
+        for creation_id, response in zip(creation_ids, responses):
+            if response is None or not response.ok:
+                print(f"Error publishing post: {response.body if response else 'no response'}")
+            published[creation_id] = response.json().get('id') if response and response.ok else None
+        return published
+
+    def create_posts(self, posts: List[Tuple[str, str]]) -> List[Optional[str]]:
+        """
+        Create and publish many image posts given as (caption, public image URL).
+
+        Containers are created in one batch, polled together and published in
+        a second batch, so up to 50 posts take two round trips plus status
+        checks. Returns the published media IDs, None where a post failed.
+        """
+        if not self.verify_credentials():
+            print("Invalid or expired credentials")
+            return [None] * len(posts)
+
+        responses = self.graph.execute_sync(
+            GraphRequest('POST', self.graph.relative(f'{self.account_id}/media'),
+                         params={'caption': caption, 'image_url': image_url})
+            for caption, image_url in posts
+        )
+        creation_ids = []
+        for response in responses:
+            if response is None or not response.ok:
+                print(f"Error uploading media: {response.body if response else 'no response'}")
+            creation_ids.append(response.json().get('id') if response and response.ok else None)
+
+        published = self._publish_containers(self._wait_until_finished([c for c in creation_ids if c]))
+        return [published.get(creation_id) if creation_id else None for creation_id in creation_ids]
+
+    def create_carousel_post(self, caption: str, media_urls: List[str]) -> Optional[str]:
+        """
+        Create and publish a carousel of up to 10 public image URLs.
+
+        The item containers and the carousel container that lists them go out
+        in one batch, the carousel referencing the items' IDs by name. Returns
+        the published media ID, or None on failure.
+        """
+        if not 2 <= len(media_urls) <= 10:
+            print("A carousel needs between 2 and 10 images")
+            return None
+        if not self.verify_credentials():
+            print("Invalid or expired credentials")
+            return None
+
+        media_url = self.graph.relative(f'{self.account_id}/media')
+        batch = [
+            GraphRequest('POST', media_url, params={'image_url': url, 'is_carousel_item': 'true'},
+                         name=f'item{i}')
+            for i, url in enumerate(media_urls)
+        ]
+        batch.append(GraphRequest('POST', media_url, params={
+            'media_type': 'CAROUSEL',
+            'caption': caption,
+            'children': ','.join(f'{{result=item{i}:$.id}}' for i in range(len(media_urls)))
+        }))
+        carousel = self.graph.execute_sync(batch)[-1]
+        if carousel is None or not carousel.ok:
+            print(f"Error creating carousel: {carousel.body if carousel else 'an item failed to upload'}")
+            return None
+
+        creation_id = carousel.json().get('id')
+        if not self._wait_until_finished([creation_id]):
+            return None
+        return self._publish_containers([creation_id]).get(creation_id)
+
+    def get_media_insights(self, media_ids: List[str],
+                           metrics: str = 'impressions,reach,likes,comments,saved') -> Dict[str, List[Dict]]:
+        """Fetch insights for many posts, GRAPH_BATCH_LIMIT per round trip; returns media ID -> metric list."""
+        responses = self.graph.execute_sync(
+            GraphRequest('GET', self.graph.relative(f'{media_id}/insights'), params={'metric': metrics})
+            for media_id in media_ids
+        )
+        insights = {}
+        for media_id, response in zip(media_ids, responses):
+            if response is None or not response.ok:
+                print(f"Error fetching insights for {media_id}: {response.body if response else 'no response'}")
+                continue
+            insights[media_id] = response.json().get('data', [])
+        return insights
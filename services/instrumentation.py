@@ -0,0 +1,237 @@
+import bisect
+import contextvars
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+
+# Platform the current task is working for; used as the default label for calls
+current_platform: contextvars.ContextVar = contextvars.ContextVar('current_platform', default=None)
+
+# On-demand prices in USD, used for cost estimates only
+PRICING = {
+    'bedrock': {
+        'anthropic.claude-v2': {'input_per_1k_tokens': 0.008, 'output_per_1k_tokens': 0.024}
+    },
+    'translate': {'per_million_characters': 15.0}
+}
+
+# Histogram buckets for call durations, in seconds
+DURATION_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+@dataclass
+class CallRecord:
+    """One call to an external AI service."""
+    service: str
+    operation: str
+    platform: Optional[str] = None
+    language: Optional[str] = None
+    model_id: Optional[str] = None
+    duration_s: float = 0.0
+    success: bool = True
+    error: Optional[str] = None
+    input_tokens: int = 0
+    output_tokens: int = 0
+    characters: int = 0
+    retries: int = 0
+    cost_usd: float = 0.0
+    timestamp: float = field(default_factory=time.time)
+
+    def set_response_metadata(self, response: Dict[str, Any]) -> None:
+        """Read retry count and Bedrock token counts from a boto3 response."""
+        metadata = response.get('ResponseMetadata', {})
+        self.retries = metadata.get('RetryAttempts', self.retries)
+        headers = metadata.get('HTTPHeaders', {})
+        if 'x-amzn-bedrock-input-token-count' in headers:
+            self.input_tokens = int(headers['x-amzn-bedrock-input-token-count'])
+        if 'x-amzn-bedrock-output-token-count' in headers:
+            self.output_tokens = int(headers['x-amzn-bedrock-output-token-count'])
+
+def estimate_cost(record: CallRecord) -> float:
+    """Estimated USD cost of a call, from PRICING."""
+    if record.service == 'bedrock':
+        prices = PRICING['bedrock'].get(record.model_id)
+        if not prices:
+            return 0.0
+        return (record.input_tokens / 1000 * prices['input_per_1k_tokens'] +
+                record.output_tokens / 1000 * prices['output_per_1k_tokens'])
+    if record.service == 'translate':
+        return record.characters / 1_000_000 * PRICING['translate']['per_million_characters']
+    return 0.0
+
+class CallObserver(ABC):
+    """Receives a CallRecord after every instrumented call."""
+
+    @abstractmethod
+    def on_call(self, record: CallRecord) -> None:
+        """Handle a finished call. Called from worker and event loop threads."""
+        pass
+
+class MetricsRegistry(CallObserver):
+    """Aggregates call records into counters and histograms in Prometheus text format."""
+
+    def __init__(self, buckets: Tuple[float, ...] = DURATION_BUCKETS):
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self._counters: Dict[Tuple[str, Tuple], float] = {}
+        self._histograms: Dict[Tuple, Dict[str, Any]] = {}
+
+    def _inc(self, name: str, labels: Dict[str, Any], value: float = 1.0) -> None:
+        key = (name, tuple(sorted((k, str(v)) for k, v in labels.items() if v is not None)))
+        self._counters[key] = self._counters.get(key, 0.0) + value
+
+    def _observe(self, labels: Dict[str, Any], value: float) -> None:
+        key = tuple(sorted((k, str(v)) for k, v in labels.items() if v is not None))
+        histogram = self._histograms.setdefault(key, {
+            'buckets': [0] * len(self.buckets), 'count': 0, 'sum': 0.0
+        })
+        for index in range(bisect.bisect_left(self.buckets, value), len(self.buckets)):
+            histogram['buckets'][index] += 1
+        histogram['count'] += 1
+        histogram['sum'] += value
+
+    def on_call(self, record: CallRecord) -> None:
+        labels = {
+            'service': record.service,
+            'operation': record.operation,
+            'platform': record.platform,
+            'language': record.language,
+            'status': 'success' if record.success else 'error'
+        }
+        with self._lock:
+            self._inc('yukti_calls_total', labels)
+            self._observe(labels, record.duration_s)
+            if record.input_tokens:
+                self._inc('yukti_tokens_total', {**labels, 'direction': 'input'}, record.input_tokens)
+            if record.output_tokens:
+                self._inc('yukti_tokens_total', {**labels, 'direction': 'output'}, record.output_tokens)
+            if record.characters:
+                self._inc('yukti_translate_characters_total', labels, record.characters)
+            if record.retries:
+                self._inc('yukti_retries_total', labels, record.retries)
+            if record.cost_usd:
+                self._inc('yukti_estimated_cost_usd_total', labels, record.cost_usd)
+
+    @staticmethod
+    def _format_labels(labels: Tuple) -> str:
+        if not labels:
+            return ''
+        escaped = ','.join(
+            '{}="{}"'.format(k, v.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+            for k, v in labels
+        )
+        return '{' + escaped + '}'
+
+    def render_prometheus(self) -> str:
+        """Render every metric in the Prometheus text exposition format."""
+        lines = []
+        with self._lock:
+            names = sorted({name for name, _ in self._counters})
+            for name in names:
+                lines.append(f'# TYPE {name} counter')
+                for (metric, labels), value in sorted(self._counters.items()):
+                    if metric == name:
+                        lines.append(f'{name}{self._format_labels(labels)} {value:g}')
+
+            if self._histograms:
+                name = 'yukti_call_duration_seconds'
+                lines.append(f'# TYPE {name} histogram')
+                for labels, histogram in sorted(self._histograms.items()):
+                    for bound, count in zip(self.buckets, histogram['buckets']):
+                        bucket_labels = self._format_labels(labels + (('le', f'{bound:g}'),))
+                        lines.append(f'{name}_bucket{bucket_labels} {count}')
+                    lines.append(f'{name}_bucket{self._format_labels(labels + (("le", "+Inf"),))} {histogram["count"]}')
+                    lines.append(f'{name}_sum{self._format_labels(labels)} {histogram["sum"]:g}')
+                    lines.append(f'{name}_count{self._format_labels(labels)} {histogram["count"]}')
+        return '\n'.join(lines) + '\n'
+
+class Instrumentation:
+    """Fans call records out to registered observers."""
+
+    def __init__(self):
+        self.metrics = MetricsRegistry()
+        self._observers: List[CallObserver] = [self.metrics]
+        self._lock = threading.Lock()
+
+    def add_observer(self, observer: CallObserver) -> None:
+        with self._lock:
+            if observer not in self._observers:
+                self._observers.append(observer)
+
+    def remove_observer(self, observer: CallObserver) -> None:
+        with self._lock:
+            self._observers.remove(observer)
+
+    def record(self, record: CallRecord) -> None:
+        record.cost_usd = record.cost_usd or estimate_cost(record)
+        with self._lock:
+            observers = list(self._observers)
+        for observer in observers:
+            try:
+                observer.on_call(record)
+            except Exception as e:
+                print(f"Instrumentation observer error: {str(e)}")
+
+    @contextmanager
+    def track(self, service: str, operation: str, **labels: Any):
+        """
+        Time the enclosed block and record it as one call.
+
+        Yields the CallRecord so the caller can fill in tokens, characters or
+        response metadata. The platform label defaults to current_platform.
+        Exceptions are recorded as failures and re-raised.
+        """
+        record = CallRecord(service=service, operation=operation, **labels)
+        if record.platform is None:
+            record.platform = current_platform.get()
+        started = time.perf_counter()
+        try:
+            yield record
+        except Exception as e:
+            record.success = False
+            record.error = type(e).__name__
+            response = getattr(e, 'response', None)
+            if isinstance(response, dict):
+                record.set_response_metadata(response)
+            raise
+        finally:
+            record.duration_s = time.perf_counter() - started
+            self.record(record)
+
+# Process-wide instrumentation used by async_generator
+instrumentation = Instrumentation()
+
+_metrics_servers: Dict[int, ThreadingHTTPServer] = {}
+_metrics_servers_lock = threading.Lock()
+
+def start_metrics_server(port: int, host: str = '0.0.0.0',
+                         registry: Optional[MetricsRegistry] = None) -> ThreadingHTTPServer:
+    """Serve GET /metrics in Prometheus text format on a daemon thread. Idempotent per port."""
+    registry = registry or instrumentation.metrics
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def log_message(self, format, *args):
+            pass
+
+        def do_GET(self):
+            if self.path.split('?')[0] != '/metrics':
+                self.send_response(404)
+                self.end_headers()
+                return
+            body = registry.render_prometheus().encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    with _metrics_servers_lock:
+        if port not in _metrics_servers:
+            server = ThreadingHTTPServer((host, port), MetricsHandler)
+            server.daemon_threads = True
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+            _metrics_servers[port] = server
+        return _metrics_servers[port]
@@ -0,0 +1,145 @@
+import re
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, List, Optional
+from services.response_cache import ResponseCache
+
+# en_core_web_sm components keyword extraction never reads. noun_chunks need the
+# tagger/attribute_ruler (POS) and parser, entities need ner.
+UNUSED_PIPES = ("lemmatizer", "textcat", "textcat_multilabel", "senter")
+
+# Leading tokens stripped from candidate phrases ("the new smart watch" -> "new smart watch")
+_STRIP_POS = {"DET", "PRON", "PART", "CCONJ", "ADP", "PUNCT", "NUM"}
+
+# Entity labels that tend to make useless search queries on their own
+_SKIP_ENTITY_LABELS = {"DATE", "TIME", "PERCENT", "MONEY", "QUANTITY", "ORDINAL", "CARDINAL"}
+
+class KeywordExtractor:
+    """
+    Ranked keyword extraction with spaCy, memoized per description.
+
+    The model is loaded once with the components it does not need excluded.
+    Candidate phrases (noun chunks and named entities) are normalized,
+    deduplicated and ranked by frequency, entity-ness, specificity and
+    position, then capped at max_keywords so fewer, better YouTube queries are
+    issued. When spaCy or the model is unavailable, fallback(text, max_keywords)
+    is used instead.
+    """
+
+    def __init__(self,
+                 model: str = "en_core_web_sm",
+                 max_keywords: int = 8,
+                 cache_entries: int = 512,
+                 batch_size: int = 32,
+                 fallback: Optional[Callable[[str, int], List[str]]] = None):
+        self.model = model
+        self.max_keywords = max_keywords
+        self.batch_size = batch_size
+        self.fallback = fallback
+        self.cache = ResponseCache(max_entries=cache_entries)
+        self._nlp = None
+        self._nlp_loaded = False
+
+    def get_nlp(self):
+        """Load the spaCy pipeline on first use; None when spaCy or the model is missing."""
+        if not self._nlp_loaded:
+            self._nlp_loaded = True
+            try:
+                import spacy
+                self._nlp = spacy.load(self.model, exclude=list(UNUSED_PIPES))
+            except Exception:
+                self._nlp = None
+        return self._nlp
+
+    def _cache_key(self, text: str) -> str:
+        return ResponseCache.make_key(text=" ".join(text.split()), model=self.model,
+                                      max_keywords=self.max_keywords)
+
+    @staticmethod
+    def _clean_span(span) -> Optional[str]:
+        tokens = list(span)
+        while tokens and (tokens[0].pos_ in _STRIP_POS or tokens[0].is_stop):
+            tokens = tokens[1:]
+        while tokens and (tokens[-1].pos_ == "PUNCT" or tokens[-1].is_stop):
+            tokens = tokens[:-1]
+        if not tokens:
+            return None
+        phrase = " ".join(token.text for token in tokens)
+        if len(phrase) <= 2 or not re.search(r"[A-Za-z]", phrase):
+            return None
+        return phrase
+
+    def rank_candidates(self, doc) -> List[str]:
+        """Rank and deduplicate the noun chunks and entities of a parsed doc."""
+        candidates: Dict[str, Dict] = OrderedDict()
+
+        def add(span, is_entity: bool) -> None:
+            phrase = self._clean_span(span)
+            if phrase is None:
+                return
+            normalized = phrase.lower()
+            entry = candidates.setdefault(normalized, {
+                "text": phrase, "count": 0, "entity": False,
+                "tokens": len(phrase.split()), "first": span.start_char
+            })
+            entry["count"] += 1
+            entry["entity"] = entry["entity"] or is_entity
+            entry["first"] = min(entry["first"], span.start_char)
+
+        for ent in doc.ents:
+            if ent.label_ not in _SKIP_ENTITY_LABELS:
+                add(ent, True)
+        for chunk in doc.noun_chunks:
+            add(chunk, False)
+
+        length = max(len(doc.text), 1)
+        scored = sorted(
+            candidates.values(),
+            key=lambda c: (c["count"]
+                           + (1.0 if c["entity"] else 0.0)
+                           + 0.5 * min(c["tokens"], 3)
+                           + 0.5 * (1 - c["first"] / length)),
+            reverse=True
+        )
+        return [c["text"] for c in scored[:self.max_keywords]]
+
+    def extract(self, text: str) -> List[str]:
+        """Return ranked keywords for one description."""
+        return self.extract_many([text])[0]
+
+    def extract_many(self, texts: Iterable[str], n_process: int = 1) -> List[List[str]]:
+        """
+        Return ranked keywords for each text, in order.
+
+        Texts already seen are answered from the cache; the rest are parsed in
+        one nlp.pipe call (n_process > 1 parses in worker processes, which only
+        pays off for large batch jobs).
+        """
+        texts = list(texts)
+        results: List[Optional[List[str]]] = [None] * len(texts)
+        pending: Dict[str, Dict] = OrderedDict()
+        for index, text in enumerate(texts):
+            if not text:
+                results[index] = []
+                continue
+            key = self._cache_key(text)
+            cached = self.cache.get(key)
+            if cached is not None:
+                results[index] = cached
+            else:
+                pending.setdefault(key, {"text": text, "indexes": []})["indexes"].append(index)
+
+        if pending:
+            pending_texts = [entry["text"] for entry in pending.values()]
+            nlp = self.get_nlp()
+            if nlp is not None:
+                docs = nlp.pipe(pending_texts, batch_size=self.batch_size, n_process=n_process)
+                extracted = [self.rank_candidates(doc) for doc in docs]
+            elif self.fallback is not None:
+                extracted = [self.fallback(text, self.max_keywords) for text in pending_texts]
+            else:
+                extracted = [[] for _ in pending_texts]
+            for (key, entry), keywords in zip(pending.items(), extracted):
+                self.cache.set(key, keywords)
+                for index in entry["indexes"]:
+                    results[index] = keywords
+        return results
@@ -0,0 +1,155 @@
+import asyncio
+import heapq
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from config.settings import INSTAGRAM_PUBLISH_CONFIG
+from services.graph_batch import GraphBatchClient, is_transient_error
+from services.http_session import get_http_session
+
+# Container status codes after which polling stops
+FINAL_STATUSES = {'FINISHED', 'PUBLISHED', 'ERROR', 'EXPIRED'}
+
+@dataclass
+class _Watch:
+    deadline: float
+    delay: float
+    futures: List[asyncio.Future] = field(default_factory=list)
+    last_status: Dict[str, Any] = field(default_factory=dict)
+
+class MediaStatusPoller:
+    """
+    Waits for Instagram media containers to finish processing.
+
+    All pending creation IDs share one scheduler task on the shared HTTP
+    session loop. Each tick it checks every ID that is due, or will be within
+    batch_window seconds, in a single call to fetch_statuses(ids) ->
+    {id: status dict}, then reschedules the ones still in progress with
+    exponential backoff and jitter. Transient errors (rate limits, temporary
+    failures, missing responses) are retried the same way. A container that
+    is not done by its deadline resolves with its last status and
+    'timed_out': True. Waiting on the same ID twice shares one watch.
+    """
+
+    def __init__(self,
+                 fetch_statuses: Callable[[List[str]], Awaitable[Dict[str, Dict[str, Any]]]],
+                 initial_delay: float = 1.0,
+                 max_delay: float = 10.0,
+                 multiplier: float = 2.0,
+                 jitter: float = 0.25,
+                 timeout: float = 300,
+                 batch_window: float = 0.5):
+        self.fetch_statuses = fetch_statuses
+        self.initial_delay = initial_delay
+        self.max_delay = max_delay
+        self.multiplier = multiplier
+        self.jitter = jitter
+        self.timeout = timeout
+        self.batch_window = batch_window
+        self._watches: Dict[str, _Watch] = {}
+        self._schedule: List[Tuple[float, str]] = []
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def _jittered(self, delay: float) -> float:
+        return delay * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+    async def wait(self, creation_id: str, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """Return the container's final status, or its last one if timeout (default self.timeout) passes."""
+        return await get_http_session().run(self._watch(creation_id, self.timeout if timeout is None else timeout))
+
+    async def wait_many(self, creation_ids: List[str], timeout: Optional[float] = None) -> Dict[str, Dict[str, Any]]:
+        """wait() for several containers at once; they are polled together."""
+        statuses = await asyncio.gather(*(self.wait(creation_id, timeout) for creation_id in creation_ids))
+        return dict(zip(creation_ids, statuses))
+
+    async def _watch(self, creation_id: str, timeout: float) -> Dict[str, Any]:
+        # Runs on the session loop, like the scheduler
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        now = time.monotonic()
+        watch = self._watches.get(creation_id)
+        if watch is None:
+            watch = self._watches[creation_id] = _Watch(deadline=now + timeout, delay=self.initial_delay)
+            # Check right away; media that is already processed needs no wait
+            heapq.heappush(self._schedule, (now, creation_id))
+        else:
+            watch.deadline = max(watch.deadline, now + timeout)
+        watch.futures.append(future)
+
+        if self._wakeup is None:
+            self._wakeup = asyncio.Event()
+        self._wakeup.set()
+        if self._task is None or self._task.done():
+            self._task = loop.create_task(self._run())
+        return await future
+
+    async def _run(self) -> None:
+        while self._watches:
+            now = time.monotonic()
+            if self._schedule and self._schedule[0][0] > now:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), self._schedule[0][0] - now)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            due = []
+            # Pull in checks due shortly too, so jittered IDs share a tick
+            while self._schedule and self._schedule[0][0] <= now + self.batch_window:
+                _, creation_id = heapq.heappop(self._schedule)
+                if creation_id in self._watches:
+                    due.append(creation_id)
+            if not due:
+                continue
+
+            try:
+                statuses = await self.fetch_statuses(due)
+            except Exception as e:
+                print(f"Error checking media status: {str(e)}")
+                statuses = {}
+
+            now = time.monotonic()
+            for creation_id in due:
+                watch = self._watches[creation_id]
+                status = statuses.get(creation_id)
+                if status is not None:
+                    watch.last_status = status
+                if status is not None and (status.get('status_code') in FINAL_STATUSES or
+                                           ('error' in status and not is_transient_error(status))):
+                    self._resolve(creation_id, status)
+                elif now + watch.delay > watch.deadline:
+                    self._resolve(creation_id, {**watch.last_status, 'timed_out': True})
+                else:
+                    heapq.heappush(self._schedule, (now + self._jittered(watch.delay), creation_id))
+                    watch.delay = min(watch.delay * self.multiplier, self.max_delay)
+
+    def _resolve(self, creation_id: str, status: Dict[str, Any]) -> None:
+        for future in self._watches.pop(creation_id).futures:
+            if not future.done():
+                future.set_result(status)
+
+_pollers: Dict[Tuple[str, str], MediaStatusPoller] = {}
+_pollers_lock = threading.Lock()
+
+def get_status_poller(access_token: str, api_version: str = 'v18.0') -> MediaStatusPoller:
+    """
+    Return the process-wide MediaStatusPoller for an access token, configured
+    from INSTAGRAM_PUBLISH_CONFIG, so every publisher using the token shares
+    one scheduler and its status batches.
+    """
+    key = (access_token, api_version)
+    with _pollers_lock:
+        if key not in _pollers:
+            graph = GraphBatchClient(access_token, api_version=api_version,
+                                     timeout=INSTAGRAM_PUBLISH_CONFIG['request_timeout'])
+            _pollers[key] = MediaStatusPoller(
+                lambda ids: graph.get_objects(ids, 'status_code,status'),
+                initial_delay=INSTAGRAM_PUBLISH_CONFIG['status_initial_delay'],
+                max_delay=INSTAGRAM_PUBLISH_CONFIG['status_max_delay'],
+                timeout=INSTAGRAM_PUBLISH_CONFIG['status_timeout']
+            )
+        return _pollers[key]
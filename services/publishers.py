@@ -1,7 +1,8 @@
 from abc import ABC, abstractmethod
 from typing import Optional
-import aiohttp
-from config.settings import SOCIAL_MEDIA_CONFIG
+from config.settings import SOCIAL_MEDIA_CONFIG, HTTP_CLIENT_CONFIG
+from services.auth_sessions import get_auth_sessions
+from services.http_session import get_http_session
 
 class SocialMediaPublisher(ABC):
     """Abstract base class for social media publishing."""
@@ -27,16 +28,21 @@ class LinkedInPublisher(SocialMediaPublisher):
         self.access_token = self.config['access_token']
     
     async def authenticate(self) -> bool:
-        # Implementation for LinkedIn authentication
+        # LinkedIn reports no expiry here, so validity is cached for AUTH_RECHECK_SECONDS
         try:
-            async with aiohttp.ClientSession() as session:
-                headers = {'Authorization': f'Bearer {self.access_token}'}
-                async with session.get('https://api.linkedin.com/v2/me', headers=headers) as response:
-                    return response.status == 200
+            return await get_auth_sessions().is_valid(('linkedin', self.access_token), self._check_token)
         except Exception as e:
             print(f"LinkedIn authentication error: {str(e)}")
             return False
 
+    async def _check_token(self) -> bool:
+        headers = {'Authorization': f'Bearer {self.access_token}'}
+        response = await get_http_session().request(
+            'GET', 'https://api.linkedin.com/v2/me',
+            headers=headers, timeout=HTTP_CLIENT_CONFIG['total_timeout']
+        )
+        return response.status == 200
+
     async def publish_post(self, content: str, media_path: Optional[str] = None) -> dict:
         # Implementation for LinkedIn post publishing
         pass
@@ -1,3 +1,4 @@
+import asyncio
 from typing import Dict, Optional
 from services.publishers import (
     LinkedInPublisher,
@@ -21,11 +22,9 @@ class PublishingManager:
         self.media_handler = MediaHandler(ALLOWED_IMAGE_TYPES, MAX_FILE_SIZE)
     
     async def initialize_publishers(self) -> Dict[str, bool]:
-        """Initialize and authenticate all publishers."""
-        auth_status = {}
-        for platform, publisher in self.publishers.items():
-            auth_status[platform] = await publisher.authenticate()
-        return auth_status
+        """Initialize and authenticate all publishers concurrently."""
+        results = await asyncio.gather(*(publisher.authenticate() for publisher in self.publishers.values()))
+        return dict(zip(self.publishers, results))
     
     async def publish_content(self, 
                             platform: str, 
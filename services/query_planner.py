@@ -0,0 +1,216 @@
+from dataclasses import dataclass
+from itertools import combinations
+from typing import Callable, Dict, FrozenSet, Iterable, List, Optional, Set
+from services.youtube_quota import SEARCH_LIST_COST
+
+# Relative result quality of an OR query per extra alternative. "a|b" splits one
+# page of results between its sides, so each gets about half the videos separate
+# searches would; since videos matching either side usually suit the campaign,
+# the discount is set above 0.5. 0.7 is a hand-tuned estimate, not a measurement;
+# override it with QueryPlanner(or_quality=...)
+OR_QUALITY = 0.7
+
+@dataclass
+class PlannedQuery:
+    """One search to run: the q string, the keywords it stands for, and its quota cost."""
+    query: str
+    keywords: List[str]
+    cost: int = SEARCH_LIST_COST
+
+@dataclass
+class _Cluster:
+    representative: str
+    keywords: List[str]
+    concepts: FrozenSet[str]
+    rank: int
+
+@dataclass
+class _Candidate:
+    query: str
+    keywords: List[str]
+    concepts: FrozenSet[str]
+    quality: float
+    members: FrozenSet[int] = frozenset()
+    cost: int = SEARCH_LIST_COST
+    order: int = 0
+
+def _concept(token: str) -> str:
+    # Treat simple plurals as the same concept ("watches" ~ "watch", "bottles" ~ "bottle")
+    if len(token) <= 3:
+        return token
+    if token.endswith("ies"):
+        return token[:-3] + "y"
+    if token.endswith(("ches", "shes", "xes", "sses")):
+        return token[:-2]
+    if token.endswith("s") and not token.endswith("ss"):
+        return token[:-1]
+    return token
+
+def _quoted(term: str) -> str:
+    # Inside an OR query, multi-word terms must be phrases: "smart watch"|"fitness tracker",
+    # not smart (watch|fitness) tracker
+    return f'"{term}"' if " " in term else term
+
+def concepts_of(keyword: str) -> FrozenSet[str]:
+    return frozenset(_concept(token) for token in keyword.lower().split())
+
+def cluster_keywords(keywords: List[str]) -> List[_Cluster]:
+    """
+    Merge keywords whose concepts are a subset of another keyword's into that
+    keyword's cluster ("watch" joins "smart watch"). Keywords are assumed ranked
+    best first; a subset keyword joins the best-ranked superset.
+    """
+    concept_sets = [concepts_of(keyword) for keyword in keywords]
+    parent: Dict[int, int] = {}
+    for i, concepts in enumerate(concept_sets):
+        supersets = [j for j, other in enumerate(concept_sets)
+                     if j != i and concepts <= other and (concepts != other or j < i)]
+        # Prefer the most specific superset, then the best ranked
+        supersets = [j for j in supersets if not any(
+            k != j and concept_sets[j] < concept_sets[k] for k in supersets)]
+        if supersets:
+            parent[i] = min(supersets)
+
+    def root(i: int) -> int:
+        while i in parent:
+            i = parent[i]
+        return i
+
+    members: Dict[int, List[int]] = {}
+    for i in range(len(keywords)):
+        members.setdefault(root(i), []).append(i)
+    return [
+        _Cluster(
+            representative=keywords[r],
+            keywords=[keywords[i] for i in sorted(indexes)],
+            concepts=frozenset().union(*(concept_sets[i] for i in indexes)),
+            rank=min(indexes)
+        )
+        for r, indexes in sorted(members.items(), key=lambda item: min(item[1]))
+    ]
+
+class QueryPlanner:
+    """
+    Chooses the YouTube searches for a set of ranked keywords within a quota budget.
+
+    Overlapping keywords are clustered first. Candidate queries are each
+    cluster on its own and OR combinations of up to max_or_terms clusters
+    ("smart watch|fitness tracker"), which cover more concepts per 100-unit
+    search at lower quality. A greedy weighted set cover then picks the
+    candidates with the best gain in covered concept weight per quota unit
+    until the budget is spent or nothing is gained. OR queries are only
+    considered while the budget cannot pay for a separate search per
+    uncovered cluster, and never include a cluster already searched on its
+    own; once a cluster gets its own search, chosen OR queries drop it. Queries
+    the caller can answer without the API (e.g. from the channel index) cost
+    nothing.
+    """
+
+    def __init__(self, max_or_terms: int = 3, or_quality: float = OR_QUALITY):
+        self.max_or_terms = max_or_terms
+        self.or_quality = or_quality
+
+    @staticmethod
+    def _concept_weights(keywords: List[str]) -> Dict[str, float]:
+        # Each keyword's weight decays with its rank and is shared by its concepts
+        weights: Dict[str, float] = {}
+        for rank, keyword in enumerate(keywords):
+            concepts = concepts_of(keyword)
+            for concept in concepts:
+                weights[concept] = max(weights.get(concept, 0.0), 1.0 / (1 + rank) ** 0.5 / len(concepts))
+        return weights
+
+    def candidates(self, clusters: List[_Cluster]) -> List[_Candidate]:
+        candidates = []
+        for size in range(1, min(self.max_or_terms, len(clusters)) + 1):
+            for group in combinations(clusters, size):
+                candidates.append(_Candidate(
+                    query=group[0].representative if size == 1 else
+                    "|".join(_quoted(cluster.representative) for cluster in group),
+                    keywords=[keyword for cluster in group for keyword in cluster.keywords],
+                    concepts=frozenset().union(*(cluster.concepts for cluster in group)),
+                    quality=self.or_quality ** (size - 1),
+                    members=frozenset(cluster.rank for cluster in group),
+                    order=len(candidates)
+                ))
+        return candidates
+
+    def plan(self, keywords: Iterable[str], budget_units: int,
+             free_queries: Optional[Callable[[List[str]], Set[str]]] = None) -> List[PlannedQuery]:
+        """
+        Return the queries to run for keywords (ranked best first), spending at
+        most budget_units on searches. free_queries(query strings) returns the
+        ones that cost nothing to answer.
+        """
+        keywords = list(dict.fromkeys(keyword for keyword in keywords if keyword.strip()))
+        if not keywords:
+            return []
+        weights = self._concept_weights(keywords)
+        candidates = self.candidates(cluster_keywords(keywords))
+        free = free_queries([c.query for c in candidates]) if free_queries else set()
+        for candidate in candidates:
+            if candidate.query in free:
+                candidate.cost = 0
+
+        by_members = {candidate.members: candidate for candidate in candidates}
+        coverage: Dict[str, float] = {concept: 0.0 for concept in weights}
+        remaining = budget_units
+        chosen: List[_Candidate] = []
+        searched_alone: Set[int] = set()
+        def gain(candidate: _Candidate) -> float:
+            return sum(weights[c] * max(0.0, candidate.quality - coverage[c]) for c in candidate.concepts)
+
+        def drop_searched_clusters() -> int:
+            # Shrink chosen OR queries to the clusters not searched on their own;
+            # returns the quota units this frees
+            refund, changed = 0, True
+            while changed:
+                changed = False
+                for i, candidate in enumerate(chosen):
+                    if len(candidate.members) == 1 or not candidate.members & searched_alone:
+                        continue
+                    replacement = by_members.get(candidate.members - searched_alone)
+                    if replacement is None or replacement in chosen:
+                        refund += candidate.cost
+                        del chosen[i]
+                    else:
+                        refund += candidate.cost - replacement.cost
+                        chosen[i] = replacement
+                        if len(replacement.members) == 1:
+                            searched_alone.update(replacement.members)
+                    changed = True
+                    break
+            return refund
+
+        while True:
+            uncovered_singles = sum(1 for c in candidates
+                                    if c.quality == 1.0 and c not in chosen and c.cost and gain(c) > 1e-9)
+            allow_or = remaining < uncovered_singles * SEARCH_LIST_COST
+            best, best_ratio = None, 0.0
+            for candidate in candidates:
+                if candidate in chosen or candidate.cost > remaining:
+                    continue
+                if candidate.quality < 1.0 and candidate.cost and not allow_or:
+                    continue
+                if len(candidate.members) > 1 and candidate.members & searched_alone:
+                    continue
+                candidate_gain = gain(candidate)
+                if candidate_gain <= 1e-9:
+                    continue
+                # Free candidates always win; otherwise gain per quota unit
+                ratio = float("inf") if candidate.cost == 0 else candidate_gain / candidate.cost
+                if ratio > best_ratio:
+                    best, best_ratio = candidate, ratio
+            if best is None:
+                break
+            chosen.append(best)
+            remaining -= best.cost
+            if len(best.members) == 1:
+                searched_alone |= best.members
+                remaining += drop_searched_clusters()
+            for candidate in chosen:
+                for concept in candidate.concepts:
+                    coverage[concept] = max(coverage[concept], candidate.quality)
+
+        chosen.sort(key=lambda candidate: candidate.order)
+        return [PlannedQuery(query=c.query, keywords=c.keywords, cost=c.cost) for c in chosen]
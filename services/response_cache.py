@@ -0,0 +1,182 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional, Tuple
+
+def open_sqlite(db_path: str, **connect_options: Any) -> sqlite3.Connection:
+    """
+    Open a SQLite store shared between threads, creating its directory first.
+    File stores use WAL so readers don't block the writer. db_path may be ":memory:".
+    """
+    if db_path != ":memory:":
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+    db = sqlite3.connect(db_path, check_same_thread=False, **connect_options)
+    db.execute("PRAGMA journal_mode=WAL")
+    return db
+
+class ResponseCache:
+    """Two-tier cache: in-memory LRU backed by an optional SQLite store.
+
+    Values must be JSON serializable. Entries expire ``ttl_seconds`` after
+    they were written; a ``ttl_seconds`` of 0 disables expiry. Expired
+    entries are kept for another ``stale_ttl_seconds`` so callers that
+    cannot refresh them (e.g. when out of API quota) can still read them
+    with ``get(key, allow_stale=True)``. When ``max_disk_entries`` is set,
+    the least recently used rows are evicted from the SQLite tier.
+    """
+
+    def __init__(self,
+                 max_entries: int = 512,
+                 ttl_seconds: int = 0,
+                 db_path: Optional[str] = None,
+                 stale_ttl_seconds: int = 0,
+                 max_disk_entries: int = 0):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.stale_ttl_seconds = stale_ttl_seconds
+        self.max_disk_entries = max_disk_entries
+        self.db_path = db_path or None
+        self._memory: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        self._db_opened = False
+
+    @staticmethod
+    def make_key(**parts: Any) -> str:
+        """Build a stable cache key from keyword parts."""
+        payload = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _connection(self) -> Optional[sqlite3.Connection]:
+        """Open the SQLite tier on first use. Must be called with the lock held."""
+        if not self._db_opened:
+            self._db_opened = True
+            if self.db_path:
+                self._db = self._open_db(self.db_path)
+                if self.ttl_seconds:
+                    self._db.execute("DELETE FROM cache WHERE created_at < ?", (self._purge_cutoff(),))
+                    self._db.commit()
+        return self._db
+
+    def _open_db(self, db_path: str) -> sqlite3.Connection:
+        db = open_sqlite(db_path)
+        db.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, created_at REAL NOT NULL, "
+            "accessed_at REAL NOT NULL DEFAULT 0)"
+        )
+        columns = {row[1] for row in db.execute("PRAGMA table_info(cache)")}
+        if 'accessed_at' not in columns:
+            db.execute("ALTER TABLE cache ADD COLUMN accessed_at REAL NOT NULL DEFAULT 0")
+        db.execute("CREATE INDEX IF NOT EXISTS idx_cache_created_at ON cache(created_at)")
+        db.execute("CREATE INDEX IF NOT EXISTS idx_cache_accessed_at ON cache(accessed_at)")
+        db.commit()
+        return db
+
+    def _purge_cutoff(self) -> float:
+        return time.time() - self.ttl_seconds - self.stale_ttl_seconds
+
+    def _is_expired(self, created_at: float, now: float) -> bool:
+        return bool(self.ttl_seconds) and now - created_at > self.ttl_seconds
+
+    def _is_purgeable(self, created_at: float, now: float) -> bool:
+        return bool(self.ttl_seconds) and now - created_at > self.ttl_seconds + self.stale_ttl_seconds
+
+    def _is_usable(self, created_at: float, now: float, allow_stale: bool) -> bool:
+        if allow_stale:
+            return not self._is_purgeable(created_at, now)
+        return not self._is_expired(created_at, now)
+
+    def _remember(self, key: str, created_at: float, value: Any) -> None:
+        self._memory[key] = (created_at, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def get(self, key: str, allow_stale: bool = False) -> Optional[Any]:
+        """Return the cached value for key, or None on a miss or expired entry.
+
+        With allow_stale=True, expired entries still inside the stale window
+        are returned as well.
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                created_at, value = entry
+                if self._is_usable(created_at, now, allow_stale):
+                    self._memory.move_to_end(key)
+                    return value
+                if self._is_purgeable(created_at, now):
+                    del self._memory[key]
+                return None
+
+            db = self._connection()
+            if db is None:
+                return None
+            row = db.execute(
+                "SELECT value, created_at FROM cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            value, created_at = json.loads(row[0]), row[1]
+            if self._is_purgeable(created_at, now):
+                db.execute("DELETE FROM cache WHERE key = ?", (key,))
+                db.commit()
+                return None
+            self._remember(key, created_at, value)
+            if not self._is_usable(created_at, now, allow_stale):
+                return None
+            if self.max_disk_entries:
+                db.execute("UPDATE cache SET accessed_at = ? WHERE key = ?", (now, key))
+                db.commit()
+            return value
+
+    def set(self, key: str, value: Any) -> None:
+        """Store value under key in both tiers."""
+        created_at = time.time()
+        with self._lock:
+            self._remember(key, created_at, value)
+            db = self._connection()
+            if db is not None:
+                db.execute(
+                    "INSERT OR REPLACE INTO cache (key, value, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                    (key, json.dumps(value, ensure_ascii=False), created_at, created_at)
+                )
+                if self.max_disk_entries:
+                    db.execute(
+                        "DELETE FROM cache WHERE key IN ("
+                        "SELECT key FROM cache ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                        (self.max_disk_entries,)
+                    )
+                db.commit()
+
+    def purge_expired(self) -> int:
+        """Drop entries past their stale window from both tiers and return how many were removed from disk."""
+        if not self.ttl_seconds:
+            return 0
+        cutoff = self._purge_cutoff()
+        with self._lock:
+            for key in [k for k, (created_at, _) in self._memory.items() if created_at < cutoff]:
+                del self._memory[key]
+            db = self._connection()
+            if db is None:
+                return 0
+            cursor = db.execute("DELETE FROM cache WHERE created_at < ?", (cutoff,))
+            db.commit()
+            return cursor.rowcount
+
+    def clear(self) -> None:
+        """Remove every entry from both tiers."""
+        with self._lock:
+            self._memory.clear()
+            db = self._connection()
+            if db is not None:
+                db.execute("DELETE FROM cache")
+                db.commit()
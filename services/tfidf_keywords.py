@@ -0,0 +1,179 @@
+"""
+TF-IDF keyword extraction backed by a precomputed, memory-mapped IDF table.
+
+Used when spaCy is unavailable. The table is built offline from historical
+campaign descriptions and stored as three files sharing a prefix:
+
+    <prefix>.terms.npy   sorted unigram/bigram vocabulary (fixed-width unicode)
+    <prefix>.idf.npy     float32 IDF value per term
+    <prefix>.meta.json   document count and the IDF used for unseen terms
+
+Both .npy files are opened with mmap_mode='r', so loading the table costs a
+few page faults rather than parsing the vocabulary. Build a table with:
+
+    python -m services.tfidf_keywords campaigns.jsonl data/keyword_idf
+
+Input may be a .txt file (one description per line), or .jsonl/.csv with a
+'description' or 'topic' field.
+"""
+import argparse
+import csv
+import json
+import math
+import os
+import re
+from collections import Counter
+from typing import Iterable, List, Optional, Tuple
+
+STOPWORDS = frozenset("""
+a about above after again all also am an and any are as at be because been before being
+below between both but by can could did do does doing down during each few for from further
+get gets had has have having he her here hers him his how i if in into is it its itself
+just let love make makes me more most my new no nor not now of off on once only or other
+our ours out over own product products same service services she should so some such than
+that the their theirs them then there these they this those through to too under until up
+use using very via was we were what when where which while who whom why will with would
+you your yours
+""".split())
+
+_TOKEN = re.compile(r"[a-z][a-z0-9]{2,}")
+
+# Bigrams are more specific search queries than either word alone
+BIGRAM_WEIGHT = 1.5
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens of 3+ characters, stopwords removed."""
+    return [token for token in _TOKEN.findall(text.lower()) if token not in STOPWORDS]
+
+def candidate_terms(text: str) -> Tuple[List[str], List[str]]:
+    """Return (unigrams, bigrams) in order of appearance. Bigrams do not span stopwords."""
+    unigrams, bigrams = [], []
+    previous = None
+    for token in _TOKEN.findall(text.lower()):
+        if token in STOPWORDS:
+            previous = None
+            continue
+        unigrams.append(token)
+        if previous is not None:
+            bigrams.append(f"{previous} {token}")
+        previous = token
+    return unigrams, bigrams
+
+def build_idf_table(documents: Iterable[str], output_prefix: str, min_df: int = 2) -> int:
+    """
+    Compute smoothed IDF (log((1 + N) / (1 + df)) + 1) for every unigram and
+    bigram occurring in at least min_df documents and write the table files.
+    Returns the number of terms written.
+    """
+    import numpy as np
+
+    document_frequency = Counter()
+    documents_seen = 0
+    for document in documents:
+        unigrams, bigrams = candidate_terms(document)
+        if not unigrams:
+            continue
+        documents_seen += 1
+        document_frequency.update(set(unigrams) | set(bigrams))
+
+    terms = sorted(term for term, df in document_frequency.items() if df >= min_df)
+    idf = np.array(
+        [math.log((1 + documents_seen) / (1 + document_frequency[term])) + 1 for term in terms],
+        dtype=np.float32
+    )
+    directory = os.path.dirname(output_prefix)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    np.save(f"{output_prefix}.terms.npy", np.array(terms, dtype=str) if terms else np.array([], dtype="<U1"))
+    np.save(f"{output_prefix}.idf.npy", idf)
+    with open(f"{output_prefix}.meta.json", "w", encoding="utf-8") as f:
+        json.dump({
+            "documents": documents_seen,
+            "terms": len(terms),
+            "default_idf": math.log((1 + documents_seen) / 1) + 1
+        }, f)
+    return len(terms)
+
+class TfidfKeywordExtractor:
+    """
+    Scores a description's unigrams and bigrams by TF x IDF in one vectorized
+    pass. Without an IDF table every term gets IDF 1, which reduces to term
+    frequency with stopword filtering.
+    """
+
+    def __init__(self, table_prefix: Optional[str] = None):
+        self.table_prefix = table_prefix or None
+        self._terms = None
+        self._idf = None
+        self._default_idf = 1.0
+        self._loaded = False
+
+    def _load(self) -> None:
+        if self._loaded:
+            return
+        self._loaded = True
+        if not self.table_prefix or not os.path.exists(f"{self.table_prefix}.terms.npy"):
+            return
+        try:
+            import numpy as np
+            terms = np.load(f"{self.table_prefix}.terms.npy", mmap_mode="r")
+            idf = np.load(f"{self.table_prefix}.idf.npy", mmap_mode="r")
+            with open(f"{self.table_prefix}.meta.json", encoding="utf-8") as f:
+                meta = json.load(f)
+        except Exception as e:
+            print(f"Could not load IDF table {self.table_prefix}: {str(e)}")
+            return
+        self._terms, self._idf = terms, idf
+        self._default_idf = float(meta.get("default_idf", 1.0))
+
+    def _lookup_idf(self, terms):
+        import numpy as np
+        if self._terms is None or len(self._terms) == 0:
+            return np.ones(len(terms), dtype=np.float32)
+        positions = np.searchsorted(self._terms, terms)
+        positions = np.minimum(positions, len(self._terms) - 1)
+        found = self._terms[positions] == terms
+        return np.where(found, self._idf[positions], np.float32(self._default_idf)).astype(np.float32)
+
+    def extract(self, text: str, top_n: int = 10) -> List[str]:
+        """Return up to top_n terms ranked by TF-IDF, ties broken by first appearance."""
+        import numpy as np
+
+        unigrams, bigrams = candidate_terms(text or "")
+        if not unigrams:
+            return []
+        self._load()
+        tokens = np.array(unigrams + bigrams, dtype=str)
+        terms, first_seen, counts = np.unique(tokens, return_index=True, return_counts=True)
+        weights = np.where(np.char.find(terms, " ") >= 0, BIGRAM_WEIGHT, 1.0)
+        scores = counts * self._lookup_idf(terms) * weights
+        order = np.lexsort((first_seen, -scores))[:top_n]
+        return [str(term) for term in terms[order]]
+
+def _read_documents(path: str) -> Iterable[str]:
+    with open(path, newline="", encoding="utf-8") as f:
+        if path.endswith(".jsonl"):
+            for line in f:
+                if line.strip():
+                    record = json.loads(line)
+                    yield record.get("description") or record.get("topic") or ""
+        elif path.endswith(".csv"):
+            for record in csv.DictReader(f):
+                yield record.get("description") or record.get("topic") or ""
+        else:
+            for line in f:
+                yield line
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Build the IDF table used by the TF-IDF keyword extractor.")
+    parser.add_argument("input", help="Campaign descriptions (.txt, .jsonl or .csv)")
+    parser.add_argument("output_prefix", help="Output path prefix, e.g. data/keyword_idf")
+    parser.add_argument("--min-df", type=int, default=2,
+                        help="Drop terms seen in fewer documents than this (default: 2)")
+    args = parser.parse_args(argv)
+    count = build_idf_table(_read_documents(args.input), args.output_prefix, min_df=args.min_df)
+    print(f"Wrote {count} terms to {args.output_prefix}.terms.npy / .idf.npy")
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,104 @@
+import re
+from typing import Awaitable, Callable, List, Tuple
+from services.response_cache import ResponseCache
+
+# Candidate boundaries: sentence ends followed by spaces, or any run of line breaks
+_SEGMENT_BOUNDARY = re.compile(r'(?<=[.!?])[ \t]+|[ \t]*\n\s*')
+
+# Words ending in a period that do not end a sentence ("Dr. Smith", "e.g. this")
+ABBREVIATIONS = {
+    'mr.', 'mrs.', 'ms.', 'dr.', 'prof.', 'sr.', 'jr.', 'st.', 'mt.', 'vs.', 'etc.',
+    'e.g.', 'i.e.', 'inc.', 'ltd.', 'co.', 'corp.', 'no.', 'approx.', 'dept.', 'est.',
+    'jan.', 'feb.', 'mar.', 'apr.', 'jun.', 'jul.', 'aug.', 'sep.', 'sept.', 'oct.', 'nov.', 'dec.'
+}
+# Initials and dotted acronyms: "J.", "U.S."
+_DOTTED_ABBREVIATION = re.compile(r'^(?:[A-Za-z]\.)+$')
+_OPENING_PUNCTUATION = '"\'“‘(['
+
+def _is_sentence_boundary(text: str, match: re.Match) -> bool:
+    if '\n' in match.group():
+        return True
+    # The next sentence must start with a capital, possibly after an opening quote
+    following = text[match.end():].lstrip(_OPENING_PUNCTUATION)
+    if not following[:1].isupper():
+        return False
+    words = text[:match.start()].split()
+    last_word = words[-1].lstrip(_OPENING_PUNCTUATION) if words else ''
+    return last_word.lower() not in ABBREVIATIONS and not _DOTTED_ABBREVIATION.match(last_word)
+
+def split_segments(text: str) -> Tuple[List[str], List[str]]:
+    """
+    Split text into translatable segments and the separators between them.
+
+    Returns (segments, separators) where len(separators) == len(segments) + 1:
+    separators[0] is leading whitespace, separators[-1] trailing whitespace and
+    the rest sit between consecutive segments, so join_segments() rebuilds the
+    original layout exactly.
+    """
+    stripped = text.strip()
+    leading = text[:len(text) - len(text.lstrip())]
+    trailing = text[len(text.rstrip()):] if stripped else ''
+    segments, separators = [], [leading]
+    position = 0
+    for match in _SEGMENT_BOUNDARY.finditer(stripped):
+        if not _is_sentence_boundary(stripped, match):
+            continue
+        segments.append(stripped[position:match.start()])
+        separators.append(match.group())
+        position = match.end()
+    if stripped:
+        segments.append(stripped[position:])
+    separators.append(trailing)
+    return segments, separators
+
+def join_segments(segments: List[str], separators: List[str]) -> str:
+    """Inverse of split_segments."""
+    parts = [separators[0]]
+    for segment, separator in zip(segments, separators[1:]):
+        parts.append(segment)
+        parts.append(separator)
+    return ''.join(parts)
+
+class TranslationMemory:
+    """Sentence-level translation memory backed by a ResponseCache."""
+
+    def __init__(self, cache: ResponseCache):
+        self.cache = cache
+
+    def _key(self, segment: str, source_language: str, target_language: str) -> str:
+        return ResponseCache.make_key(
+            segment=segment,
+            source=source_language,
+            target=target_language
+        )
+
+    async def translate(self,
+                        text: str,
+                        source_language: str,
+                        target_language: str,
+                        translate_segments: Callable[[List[str]], Awaitable[List[str]]]) -> str:
+        """
+        Translate text, reusing stored segment translations.
+
+        Only segments missing from the memory are passed to translate_segments,
+        which must return one translation per input segment, in order.
+        """
+        segments, separators = split_segments(text)
+        translated = [None] * len(segments)
+        missing = {}
+        for index, segment in enumerate(segments):
+            cached = self.cache.get(self._key(segment, source_language, target_language))
+            if cached is not None:
+                translated[index] = cached
+            else:
+                missing.setdefault(segment, []).append(index)
+
+        if missing:
+            unique_segments = list(missing.keys())
+            results = await translate_segments(unique_segments)
+            for segment, result in zip(unique_segments, results):
+                self.cache.set(self._key(segment, source_language, target_language), result)
+                for index in missing[segment]:
+                    translated[index] = result
+
+        return join_segments(translated, separators)
@@ -0,0 +1,66 @@
+import json
+import threading
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Dict, List
+
+@lru_cache(maxsize=None)
+def _discovery_document(service_name: str = "youtube", version: str = "v3") -> Dict:
+    """Parse the discovery document bundled with google-api-python-client, once per process."""
+    from googleapiclient.discovery_cache import get_static_doc
+    document = get_static_doc(service_name, version)
+    if document is None:
+        raise RuntimeError(f"No bundled discovery document for {service_name} {version}")
+    return json.loads(document)
+
+class YouTubeClientPool:
+    """
+    Process-wide pool of built YouTube Data API clients, keyed by API key.
+
+    Clients are built from the bundled discovery document, so no discovery
+    request is made, and each one owns an httplib2.Http whose connection is
+    kept alive between calls. httplib2 is not thread-safe, so a client is
+    checked out by one thread at a time via client() and returned afterwards.
+    """
+
+    def __init__(self, max_idle_per_key: int = 8, timeout: float = 30):
+        self.max_idle_per_key = max_idle_per_key
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._idle: Dict[str, List] = {}
+
+    def _build(self, api_key: str):
+        import httplib2
+        from googleapiclient.discovery import build_from_document
+        return build_from_document(
+            _discovery_document(),
+            developerKey=api_key,
+            http=httplib2.Http(timeout=self.timeout)
+        )
+
+    @contextmanager
+    def client(self, api_key: str):
+        """Check out a client for api_key, building one if none is idle."""
+        with self._lock:
+            idle = self._idle.get(api_key)
+            youtube = idle.pop() if idle else None
+        if youtube is None:
+            youtube = self._build(api_key)
+        try:
+            yield youtube
+        finally:
+            with self._lock:
+                idle = self._idle.setdefault(api_key, [])
+                if len(idle) < self.max_idle_per_key:
+                    idle.append(youtube)
+
+    def clear(self) -> None:
+        """Drop every idle client and close its connections."""
+        with self._lock:
+            clients = [youtube for idle in self._idle.values() for youtube in idle]
+            self._idle.clear()
+        for youtube in clients:
+            try:
+                youtube.close()
+            except Exception:
+                pass
@@ -0,0 +1,83 @@
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Optional
+from services.response_cache import open_sqlite
+
+# YouTube Data API unit costs per request
+SEARCH_LIST_COST = 100
+CHANNELS_LIST_COST = 1
+
+def _quota_day() -> str:
+    """YouTube quotas reset at midnight Pacific time."""
+    try:
+        from zoneinfo import ZoneInfo
+        return datetime.now(ZoneInfo('America/Los_Angeles')).strftime('%Y-%m-%d')
+    except Exception:
+        return datetime.utcnow().strftime('%Y-%m-%d')
+
+class QuotaLedger:
+    """
+    Persistent ledger of YouTube Data API units spent per quota day.
+
+    try_spend() checks the budget and records the spend in one SQLite
+    transaction, so several processes sharing the ledger file cannot
+    overspend between them. Without a db_path the ledger lives in memory.
+    """
+
+    def __init__(self, daily_budget: int, db_path: Optional[str] = None):
+        self.daily_budget = daily_budget
+        self.db_path = db_path or None
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        self._memory = {}
+
+    def _connection(self) -> Optional[sqlite3.Connection]:
+        if self._db is None and self.db_path:
+            self._db = open_sqlite(self.db_path, isolation_level=None)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS quota_usage (day TEXT PRIMARY KEY, units INTEGER NOT NULL)"
+            )
+        return self._db
+
+    def spent_today(self) -> int:
+        day = _quota_day()
+        with self._lock:
+            db = self._connection()
+            if db is None:
+                return self._memory.get(day, 0)
+            row = db.execute("SELECT units FROM quota_usage WHERE day = ?", (day,)).fetchone()
+            return row[0] if row else 0
+
+    def remaining(self) -> int:
+        return max(0, self.daily_budget - self.spent_today())
+
+    def try_spend(self, units: int) -> bool:
+        """Record units as spent if they fit in today's budget; return False otherwise."""
+        day = _quota_day()
+        with self._lock:
+            db = self._connection()
+            if db is None:
+                spent = self._memory.get(day, 0)
+                if spent + units > self.daily_budget:
+                    return False
+                self._memory[day] = spent + units
+                return True
+
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                row = db.execute("SELECT units FROM quota_usage WHERE day = ?", (day,)).fetchone()
+                spent = row[0] if row else 0
+                if spent + units > self.daily_budget:
+                    db.execute("ROLLBACK")
+                    return False
+                db.execute(
+                    "INSERT INTO quota_usage (day, units) VALUES (?, ?) "
+                    "ON CONFLICT(day) DO UPDATE SET units = units + excluded.units",
+                    (day, units)
+                )
+                db.execute("COMMIT")
+                return True
+            except Exception:
+                db.execute("ROLLBACK")
+                raise
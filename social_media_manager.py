@@ -1,8 +1,9 @@
 import streamlit as st
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, AsyncIterator, Tuple
 import asyncio
 import os
 from datetime import datetime
+from config.settings import PUBLISH_TIMEOUT_CONFIG
 from instagram_publisher import InstagramPublisher
 
 class SocialMediaManager:
@@ -74,25 +75,43 @@ class SocialMediaManager:
         # YouTube integration removed
         return False
 
-    async def publish_to_all(self, content_dict: dict, media_path: Optional[str] = None) -> dict:
-        """Publish content to all platforms."""
-        results = {}
-        
-        # LinkedIn
+    async def iter_publish_to_all(self, content_dict: dict, media_path: Optional[str] = None,
+                                  timeouts: Optional[Dict[str, float]] = None) -> AsyncIterator[Tuple[str, Any]]:
+        """
+        Publish content to all platforms concurrently, yielding (platform, result)
+        as each one finishes. A platform that exceeds its timeout (default
+        PUBLISH_TIMEOUT_CONFIG) or raises yields {'success': False, 'error': ...},
+        so total time is bounded by the slowest platform's deadline.
+        """
+        timeouts = {**PUBLISH_TIMEOUT_CONFIG, **(timeouts or {})}
+        jobs = {}
         if content_dict.get('linkedin'):
-            results['linkedin'] = await self.publish_to_linkedin(
-                content_dict['linkedin'], media_path)
-
-        # Twitter
+            jobs['linkedin'] = self.publish_to_linkedin(content_dict['linkedin'], media_path)
         if content_dict.get('twitter'):
-            results['twitter'] = await self.publish_to_twitter(
-                content_dict['twitter'], media_path)
-
-        # Instagram (requires media)
+            jobs['twitter'] = self.publish_to_twitter(content_dict['twitter'], media_path)
+        # Instagram requires media
         if content_dict.get('instagram') and media_path:
-            results['instagram'] = await self.publish_to_instagram(
-                content_dict['instagram'], media_path)
-
+            jobs['instagram'] = self.publish_to_instagram(content_dict['instagram'], media_path)
         # YouTube integration removed
 
-        return results
+        async def run(platform: str, job) -> Tuple[str, Any]:
+            timeout = timeouts.get(platform)
+            try:
+                return platform, await asyncio.wait_for(job, timeout)
+            except asyncio.TimeoutError:
+                return platform, {'success': False, 'error': f'Timed out after {timeout:g}s'}
+            except Exception as e:
+                return platform, {'success': False, 'error': str(e)}
+
+        for finished in asyncio.as_completed([run(platform, job) for platform, job in jobs.items()]):
+            yield await finished
+
+    async def publish_to_all(self, content_dict: dict, media_path: Optional[str] = None,
+                             timeouts: Optional[Dict[str, float]] = None) -> dict:
+        """Publish content to all platforms concurrently and return every result."""
+        results = {}
+        async for platform, result in self.iter_publish_to_all(content_dict, media_path, timeouts):
+            results[platform] = result
+        # Report in platform order rather than completion order
+        order = ['linkedin', 'twitter', 'instagram', 'youtube']
+        return {platform: results[platform] for platform in order if platform in results}
@@ -1,16 +1,22 @@
 import streamlit as st
 import asyncio
-from async_generator import generate_all_posts, translate_text, platform_styles, LANGUAGES
+from async_generator import generate_all_posts, generate_all_posts_stream, translate_many, platform_styles, LANGUAGES
 from social_media_manager import SocialMediaManager
 import os
 import random
 from dotenv import load_dotenv
-from youtube_influencers import find_influencers
+from youtube_influencers import iter_influencers
+from config.settings import METRICS_PORT
+from services.instrumentation import start_metrics_server
 
 # Load environment variables
 load_dotenv()
 YOUTUBE_API_KEY = os.getenv("YOUTUBE_API_KEY")
 
+# Expose call latency, token and cost metrics for Prometheus scraping
+if METRICS_PORT:
+    start_metrics_server(METRICS_PORT)
+
 # Set page configuration
 st.set_page_config(
     page_title="Social Media Content Generator",
@@ -318,6 +324,40 @@ with st.sidebar:
 if 'page' not in st.session_state:
     st.session_state['page'] = 'home'
 
+def render_influencer_cards(influencers):
+    """Render one card per influencer channel."""
+    for inf in influencers:
+        name = inf.get("channel", "Unknown")
+        subs = inf.get("subs", 0)
+        mentions = inf.get("mentions", 0)
+        link = inf.get("link", "#")
+        if subs >= 1000000:
+            sub_count = f"{subs/1000000:.1f}M"
+        elif subs >= 1000:
+            sub_count = f"{subs/1000:.1f}K"
+        else:
+            sub_count = str(subs)
+        st.markdown(f"""
+            <div class='influencer-card'>
+                <div style='display: flex; justify-content: space-between; align-items: center;'>
+                    <div>
+                        <a href='{link}' target='_blank' style='text-decoration: none;'>
+                            <h3 style='color: #6B46C1 !important; margin: 0 !important; border: none !important; font-size: 1.2rem !important;'>{name}</h3>
+                        </a>
+                        <div style='margin-top: 8px; color: #4A5568;'>
+                            <span class='influencer-stats'>📊 {sub_count}</span> subscribers • 
+                            <span class='influencer-stats'>🎥 {mentions}</span> related videos
+                        </div>
+                    </div>
+                    <a href='{link}' target='_blank' style='text-decoration: none;'>
+                        <div style='background: #F4F0FF; padding: 8px 16px; border-radius: 20px; color: #6B46C1; font-weight: 600;'>
+                            View Channel
+                        </div>
+                    </a>
+                </div>
+            </div>
+        """, unsafe_allow_html=True)
+
 # Page: Influencers
 if st.session_state['page'] == 'influencers':
     st.markdown("""
@@ -329,53 +369,30 @@ if st.session_state['page'] == 'influencers':
 
     # Use the last generated campaign prompt as the query for influencers
     query = st.session_state.get('last_prompt') or ''
+    status_placeholder = st.empty()
+    results_placeholder = st.empty()
     if not query:
         st.warning("No campaign prompt found. Generate content in the Campaign page first.")
     else:
         # Only run search if we don't have results for this prompt yet
         if 'influencers' not in st.session_state or st.session_state.get('influencers_query') != query:
-            with st.spinner("Searching YouTube for relevant influencers..."):
-                try:
-                    influencers = find_influencers(query, api_key=YOUTUBE_API_KEY)
-                except Exception as e:
-                    st.error(f"Error while searching influencers: {e}")
-                    influencers = []
-                st.session_state['influencers'] = influencers
-                st.session_state['influencers_query'] = query
+            status_placeholder.info("Searching YouTube for relevant influencers...")
+            influencers = []
+            try:
+                # Show each partial ranking as soon as more keyword searches finish
+                for influencers in iter_influencers(query, api_key=YOUTUBE_API_KEY):
+                    with results_placeholder.container():
+                        render_influencer_cards(influencers)
+            except Exception as e:
+                st.error(f"Error while searching influencers: {e}")
+            status_placeholder.empty()
+            st.session_state['influencers'] = influencers
+            st.session_state['influencers_query'] = query
 
     # Render results if present
     if 'influencers' in st.session_state and st.session_state['influencers']:
-        for inf in st.session_state['influencers']:
-            name = inf.get("channel", "Unknown")
-            subs = inf.get("subs", 0)
-            mentions = inf.get("mentions", 0)
-            link = inf.get("link", "#")
-            if subs >= 1000000:
-                sub_count = f"{subs/1000000:.1f}M"
-            elif subs >= 1000:
-                sub_count = f"{subs/1000:.1f}K"
-            else:
-                sub_count = str(subs)
-            st.markdown(f"""
-                <div class='influencer-card'>
-                    <div style='display: flex; justify-content: space-between; align-items: center;'>
-                        <div>
-                            <a href='{link}' target='_blank' style='text-decoration: none;'>
-                                <h3 style='color: #6B46C1 !important; margin: 0 !important; border: none !important; font-size: 1.2rem !important;'>{name}</h3>
-                            </a>
-                            <div style='margin-top: 8px; color: #4A5568;'>
-                                <span class='influencer-stats'>📊 {sub_count}</span> subscribers • 
-                                <span class='influencer-stats'>🎥 {mentions}</span> related videos
-                            </div>
-                        </div>
-                        <a href='{link}' target='_blank' style='text-decoration: none;'>
-                            <div style='background: #F4F0FF; padding: 8px 16px; border-radius: 20px; color: #6B46C1; font-weight: 600;'>
-                                View Channel
-                            </div>
-                        </a>
-                    </div>
-                </div>
-            """, unsafe_allow_html=True)
+        with results_placeholder.container():
+            render_influencer_cards(st.session_state['influencers'])
     else:
         st.info("No influencer results yet. Use the search above or generate content and try again.")
 
@@ -518,6 +535,18 @@ target_language = st.selectbox(
     help="Choose the language for your content"
 )
 
+bypass_cache = st.checkbox(
+    "♻️ Bypass cache",
+    value=False,
+    help="Always request fresh content instead of reusing results for a prompt generated earlier"
+)
+
+single_request_mode = st.checkbox(
+    "📦 Single request mode",
+    value=False,
+    help="Generate all platforms with one model request. Useful when requests per minute are rate-limited"
+)
+
 # Initialize session state
 if 'english_content' not in st.session_state:
     st.session_state.english_content = None
@@ -537,13 +566,24 @@ def get_translated_content():
     if lang_key not in st.session_state.translated_content:
         with st.spinner(f'Translating to {target_language}...'):
             lang_code = LANGUAGES[target_language]
-            translated = {}
-            for platform, content in st.session_state.english_content.items():
-                translated[platform] = asyncio.run(translate_text(content, lang_code))
-            st.session_state.translated_content[lang_key] = translated
+            translated = asyncio.run(translate_many(st.session_state.english_content, [lang_code]))
+            st.session_state.translated_content[lang_key] = translated[lang_code]
 
     return st.session_state.translated_content[lang_key]
 
+# Function to stream generated content into live previews
+async def stream_generated_content(prompt: str, use_cache: bool) -> dict:
+    previews = {platform: st.empty() for platform in platform_styles.keys()}
+    contents = {platform: '' for platform in platform_styles.keys()}
+    async for platform, chunk in generate_all_posts_stream(prompt, use_cache=use_cache):
+        contents[platform] += chunk
+        # Plain elements, not widgets, so each chunk doesn't register new widget state;
+        # the editable text areas are rendered once generation finishes
+        previews[platform].markdown(f"**{platform.title()}** (generating...)\n\n{contents[platform]}")
+    for preview in previews.values():
+        preview.empty()
+    return contents
+
 # Handle content generation and display
 if st.button("Generate Content", type="primary"):
     if not user_prompt:
@@ -552,7 +592,14 @@ if st.button("Generate Content", type="primary"):
 
     # Generate new content in English
     with st.spinner('Generating content...'):
-        st.session_state.english_content = asyncio.run(generate_all_posts(user_prompt, 'en'))
+        if single_request_mode:
+            st.session_state.english_content = asyncio.run(
+                generate_all_posts(user_prompt, 'en', use_cache=not bypass_cache, combined=True)
+            )
+        else:
+            st.session_state.english_content = asyncio.run(
+                stream_generated_content(user_prompt, use_cache=not bypass_cache)
+            )
         st.session_state.last_prompt = user_prompt
     st.session_state.translated_content = {}  # Clear previous translations
     # Clear previous influencer results so the new prompt triggers a fresh search
@@ -783,25 +830,29 @@ if 'all_posts' in locals():
 
     # Add "Post to All Platforms" button
     if st.button("Post to All Platforms", type="primary"):
-        with st.spinner("Publishing to all platforms..."):
-            media_path = st.session_state.social_manager.save_media_file(media_file) if media_file else None
-            content_dict = {
-                'linkedin': linkedin_text,
-                'twitter': twitter_text,
-                'instagram': instagram_text,
-                'youtube': youtube_text
-            }
-            results = asyncio.run(
-                st.session_state.social_manager.publish_to_all(content_dict, media_path)
-            )
+        media_path = st.session_state.social_manager.save_media_file(media_file) if media_file else None
+        content_dict = {
+            'linkedin': linkedin_text,
+            'twitter': twitter_text,
+            'instagram': instagram_text,
+            'youtube': youtube_text
+        }
+        st.write("Publishing Results:")
+        status_placeholder = st.empty()
 
-            # Show results
-            st.write("Publishing Results:")
-            for platform, success in results.items():
+        async def show_publish_results():
+            # Platforms publish concurrently; show each outcome as soon as it lands
+            async for platform, result in st.session_state.social_manager.iter_publish_to_all(content_dict, media_path):
+                success = result.get('success') if isinstance(result, dict) else bool(result)
                 if success:
                     st.success(f"✅ Published to {platform.title()}")
                 else:
-                    st.error(f"❌ Failed to publish to {platform.title()}")
+                    error = result.get('error') if isinstance(result, dict) else None
+                    st.error(f"❌ Failed to publish to {platform.title()}" + (f": {error}" if error else ""))
+
+        status_placeholder.info("Publishing to all platforms...")
+        asyncio.run(show_publish_results())
+        status_placeholder.empty()
 
 # Add space at the bottom for better layout
 st.markdown("<div style='height: 50px;'></div>", unsafe_allow_html=True)
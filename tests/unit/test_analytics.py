@@ -0,0 +1,22 @@
+import threading
+from services.analytics import AnalyticsManager
+from services.instrumentation import CallRecord
+
+def test_usage_totals_are_exact_under_concurrent_calls():
+    manager = AnalyticsManager()
+    record = CallRecord(service='bedrock', operation='invoke_model', platform='linkedin',
+                        input_tokens=3, output_tokens=5, cost_usd=0.5)
+
+    def report():
+        for _ in range(2000):
+            manager.on_call(record)
+
+    threads = [threading.Thread(target=report) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    usage = manager.get_usage_summary()['linkedin']
+    assert usage['calls'] == 16000
+    assert usage['output_tokens'] == 80000
@@ -0,0 +1,42 @@
+import asyncio
+import json
+import async_generator
+from async_generator import generate_all_posts_combined, parse_combined_completion, platform_styles
+
+PLATFORMS = list(platform_styles)
+
+def test_parses_every_platform():
+    completion = json.dumps({platform: f" {platform} post " for platform in PLATFORMS})
+    assert parse_combined_completion(completion, PLATFORMS) == {platform: f"{platform} post" for platform in PLATFORMS}
+
+def test_ignores_text_and_braces_after_the_object():
+    completion = '{"twitter": "Hi {name}!", "email": "Hello"}\nNote: use {placeholders} as needed.\n```{}```'
+    assert parse_combined_completion(completion, PLATFORMS) == {'twitter': 'Hi {name}!', 'email': 'Hello'}
+
+def test_leaves_out_missing_and_malformed_sections():
+    completion = 'Sure! {"linkedin": "Post", "twitter": "", "email": 3}'
+    assert parse_combined_completion(completion, PLATFORMS) == {'linkedin': 'Post'}
+    assert parse_combined_completion('{"linkedin": "unterminated', PLATFORMS) == {}
+    assert parse_combined_completion('no json here', PLATFORMS) == {}
+    assert parse_combined_completion('["linkedin"]', PLATFORMS) == {}
+
+def test_only_missing_platforms_are_regenerated(monkeypatch):
+    regenerated = []
+
+    async def invoke_model(body, platform=None):
+        # The request pre-fills the opening brace
+        return '"linkedin": "L", "instagram": "I", "twitter": "T"} Hope this helps {!}'
+
+    async def generate_single_post(prompt, platform, target_language=None, use_cache=True, raise_errors=False):
+        regenerated.append(platform)
+        return f"single {platform}"
+
+    monkeypatch.setitem(async_generator.GENERATION_CACHE_CONFIG, 'enabled', False)
+    monkeypatch.setattr(async_generator, '_invoke_model', invoke_model)
+    monkeypatch.setattr(async_generator, 'generate_single_post', generate_single_post)
+
+    posts = asyncio.run(generate_all_posts_combined("A new water bottle", use_cache=False))
+    assert sorted(regenerated) == ['email', 'youtube']
+    assert posts == {'linkedin': 'L', 'instagram': 'I', 'twitter': 'T',
+                     'email': 'single email', 'youtube': 'single youtube'}
+    assert list(posts) == PLATFORMS
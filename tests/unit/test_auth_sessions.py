@@ -0,0 +1,99 @@
+import asyncio
+import time
+from services.auth_sessions import AuthSessionManager, TokenStatus
+
+KEY = ('instagram', 'token')
+
+def _check(result=True, delay=0.0):
+    """Token check returning result after delay, counting its calls."""
+    calls = []
+
+    async def check():
+        calls.append(time.time())
+        await asyncio.sleep(delay)
+        return result
+
+    return check, calls
+
+def _manager(**kwargs):
+    return AuthSessionManager(**{'refresh_interval_seconds': 3600, **kwargs})
+
+def test_valid_result_is_cached():
+    manager = _manager()
+    check, calls = _check()
+
+    async def run():
+        return [(await manager._status(KEY, check, False)).valid for _ in range(3)]
+
+    assert asyncio.run(run()) == [True, True, True]
+    assert len(calls) == 1
+
+def test_force_and_invalidate_recheck():
+    manager = _manager()
+    check, calls = _check()
+
+    async def run():
+        await manager._status(KEY, check, False)
+        await manager._status(KEY, check, True)
+        manager.invalidate(KEY)
+        await manager._status(KEY, check, False)
+
+    asyncio.run(run())
+    assert len(calls) == 3
+
+def test_token_is_rechecked_before_it_expires():
+    manager = _manager(refresh_margin_seconds=0.05)
+    calls = []
+
+    async def check():
+        calls.append(time.time())
+        return TokenStatus(valid=True, expires_at=time.time() + 0.1)
+
+    async def run():
+        await manager._status(KEY, check, False)
+        await manager._status(KEY, check, False)
+        await asyncio.sleep(0.06)
+        await manager._status(KEY, check, False)
+
+    asyncio.run(run())
+    assert len(calls) == 2
+
+def test_failed_checks_are_not_cached():
+    manager = _manager(check_timeout_seconds=0.05)
+    slow, slow_calls = _check(delay=1)
+
+    async def run():
+        first = await manager._status(KEY, slow, False)
+        second = await manager._status(KEY, slow, False)
+        return first, second
+
+    first, second = asyncio.run(run())
+    assert not first.valid and not second.valid
+    assert len(slow_calls) == 2
+    assert KEY not in manager._entries
+
+def test_concurrent_callers_share_one_check():
+    manager = _manager()
+    check, calls = _check(delay=0.05)
+
+    async def run():
+        return await asyncio.gather(*(manager._status(KEY, check, False) for _ in range(5)))
+
+    assert all(status.valid for status in asyncio.run(run()))
+    assert len(calls) == 1
+
+def test_cancelled_check_releases_other_callers():
+    manager = _manager()
+    check, calls = _check(delay=1)
+
+    async def run():
+        first = asyncio.create_task(manager._status(KEY, check, False))
+        await asyncio.sleep(0.01)
+        second = asyncio.create_task(manager._status(KEY, check, False))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        return await asyncio.wait_for(second, 0.5)
+
+    assert not asyncio.run(run()).valid
+    assert len(calls) == 1
+    assert not manager._pending
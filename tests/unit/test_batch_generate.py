@@ -0,0 +1,23 @@
+import json
+from batch_generate import read_campaigns
+
+def _write_jsonl(tmp_path, rows):
+    path = tmp_path / 'campaigns.jsonl'
+    path.write_text('\n'.join(json.dumps(row) for row in rows), encoding='utf-8')
+    return str(path)
+
+def test_same_topic_in_other_languages_gets_its_own_id(tmp_path):
+    path = _write_jsonl(tmp_path, [{'topic': 'spring sale'},
+                                   {'topic': 'spring sale', 'languages': ['Hindi', 'es']}])
+    ids = [campaign['id'] for campaign in read_campaigns(path)]
+    assert ids[0] != ids[1]
+
+def test_language_order_and_names_do_not_change_the_id(tmp_path):
+    path = _write_jsonl(tmp_path, [{'topic': 'spring sale', 'languages': ['Hindi', 'es']},
+                                   {'topic': 'spring sale', 'languages': ['es', 'hi']}])
+    ids = [campaign['id'] for campaign in read_campaigns(path)]
+    assert ids[0] == ids[1]
+
+def test_explicit_id_wins(tmp_path):
+    path = _write_jsonl(tmp_path, [{'id': 'launch', 'topic': 'spring sale', 'languages': ['es']}])
+    assert [campaign['id'] for campaign in read_campaigns(path)] == ['launch']
@@ -0,0 +1,50 @@
+from services.channel_index import ChannelIndex
+
+def _age(index, keyword, seconds):
+    """Pretend keyword was searched and its edges last seen seconds earlier."""
+    with index._lock:
+        db = index._connection()
+        db.execute("UPDATE keyword_searches SET searched_at = searched_at - ? WHERE keyword = ?", (seconds, keyword))
+        db.execute("UPDATE keyword_channels SET last_seen = last_seen - ? WHERE keyword = ?", (seconds, keyword))
+        db.commit()
+
+def test_keywords_are_fresh_until_their_ttl_passes():
+    index = ChannelIndex(keyword_ttl_seconds=3600)
+    index.record_search("smart watch", {"c1": 2})
+    index.record_search("running shoes", {"c2": 1})
+    assert index.fresh_keywords(["smart watch", "running shoes", "yoga mat"]) == {"smart watch", "running shoes"}
+
+    _age(index, "smart watch", 7200)
+    assert index.fresh_keywords(["smart watch", "running shoes"]) == {"running shoes"}
+    assert index.fresh_keywords(["smart watch"], max_age_seconds=10800) == {"smart watch"}
+
+    # A fresh search makes the keyword fresh again
+    index.record_search("smart watch", {"c1": 1})
+    assert index.fresh_keywords(["smart watch"]) == {"smart watch"}
+
+def test_searching_again_replaces_a_keywords_edges():
+    index = ChannelIndex(keyword_ttl_seconds=3600)
+    index.record_search("smart watch", {"c1": 2, "c2": 1}, latest_video_at={"c1": 100.0})
+    index.record_search("fitness tracker", {"c1": 1})
+    assert index.channel_counts(["smart watch", "fitness tracker"]) == {"c1": 3, "c2": 1}
+
+    index.record_search("smart watch", {"c3": 4})
+    assert index.channel_counts(["smart watch"]) == {"c3": 4}
+    assert sorted(index.keyword_edges(["fitness tracker"])) == [("fitness tracker", "c1", 1, 0.0)]
+
+def test_prune_drops_expired_edges_and_searches():
+    index = ChannelIndex(keyword_ttl_seconds=3600)
+    index.record_search("smart watch", {"c1": 2, "c2": 1})
+    index.record_search("fitness tracker", {"c1": 1})
+    _age(index, "smart watch", 7200)
+    assert index.prune(3600) == 2
+    assert index.channel_counts(["smart watch", "fitness tracker"]) == {"c1": 1}
+    assert index.fresh_keywords(["smart watch"], max_age_seconds=86400) == set()
+
+def test_index_persists_to_sqlite(tmp_path):
+    db_path = str(tmp_path / "index" / "channels.db")
+    ChannelIndex(3600, db_path=db_path).record_search("smart watch", {"c1": 2})
+    index = ChannelIndex(3600, db_path=db_path)
+    assert index.fresh_keywords(["smart watch"]) == {"smart watch"}
+    index.record_stats({"c1": {"title": "Watch Reviews", "subs": 10, "views": 100, "videos": 3}})
+    assert [row["subs"] for row in index.subscriber_history("c1")] == [10]
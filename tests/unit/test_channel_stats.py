@@ -0,0 +1,89 @@
+import threading
+from contextlib import contextmanager
+from services.channel_stats import ChannelStatsService
+from services.youtube_quota import QuotaLedger
+
+class _FakeYouTube:
+    """Answers channels().list with canned items and records each request."""
+
+    def __init__(self):
+        self.requests = []
+        self._lock = threading.Lock()
+
+    def channels(self):
+        return self
+
+    def list(self, part, id, maxResults):
+        with self._lock:
+            self.requests.append((part, sorted(id.split(","))))
+        items = []
+        for channel_id in id.split(","):
+            item = {"id": channel_id}
+            if "snippet" in part:
+                item["snippet"] = {"title": f"Title {channel_id}"}
+            if "statistics" in part:
+                item["statistics"] = {"subscriberCount": "100", "viewCount": "1000", "videoCount": "10"}
+            items.append(item)
+        return _Request({"items": items})
+
+class _Request:
+    def __init__(self, response):
+        self.response = response
+
+    def execute(self):
+        return self.response
+
+def _acquire(youtube):
+    @contextmanager
+    def acquire():
+        yield youtube
+    return acquire
+
+def _age(service, channel_id, part, seconds):
+    service._channels[channel_id][f"{part}_fetched_at"] -= seconds
+
+def test_fetches_missing_channels_in_batches_of_50():
+    service = ChannelStatsService(title_ttl_seconds=3600, statistics_ttl_seconds=3600)
+    youtube = _FakeYouTube()
+    ids = [f"c{i}" for i in range(120)]
+    stats = service.get_stats(ids + ["c0"], _acquire(youtube))
+    assert sorted(len(ids) for _, ids in youtube.requests) == [20, 50, 50]
+    assert stats["c7"] == {"title": "Title c7", "subs": 100, "views": 1000, "videos": 10,
+                           "link": "https://www.youtube.com/channel/c7"}
+
+def test_fresh_channels_are_served_from_cache():
+    service = ChannelStatsService(title_ttl_seconds=3600, statistics_ttl_seconds=3600)
+    youtube = _FakeYouTube()
+    service.get_stats(["a", "b"], _acquire(youtube))
+    stats = service.get_stats(["a", "b", "c"], _acquire(youtube))
+    assert youtube.requests == [("snippet,statistics", ["a", "b"]), ("snippet,statistics", ["c"])]
+    assert set(stats) == {"a", "b", "c"}
+
+def test_only_stale_parts_of_stale_channels_are_refetched():
+    service = ChannelStatsService(title_ttl_seconds=86400, statistics_ttl_seconds=3600)
+    youtube = _FakeYouTube()
+    service.get_stats(["a", "b", "c"], _acquire(youtube))
+    _age(service, "a", "statistics", 7200)
+    _age(service, "b", "statistics", 7200)
+    _age(service, "b", "title", 172800)
+    youtube.requests.clear()
+    service.get_stats(["a", "b", "c"], _acquire(youtube))
+    assert sorted(youtube.requests) == [("snippet,statistics", ["b"]), ("statistics", ["a"])]
+
+def test_persists_to_sqlite(tmp_path):
+    db_path = str(tmp_path / "stats" / "channels.db")
+    youtube = _FakeYouTube()
+    ChannelStatsService(3600, 3600, db_path=db_path).get_stats(["a"], _acquire(youtube))
+    stats = ChannelStatsService(3600, 3600, db_path=db_path).get_stats(["a"], _acquire(youtube))
+    assert len(youtube.requests) == 1
+    assert stats["a"]["subs"] == 100
+
+def test_quota_exhaustion_serves_cached_stats():
+    ledger = QuotaLedger(daily_budget=1)
+    service = ChannelStatsService(3600, 0, quota_ledger=ledger)
+    youtube = _FakeYouTube()
+    service.get_stats(["a"], _acquire(youtube))
+    _age(service, "a", "statistics", 10)
+    stats = service.get_stats(["a"], _acquire(youtube))
+    assert len(youtube.requests) == 1
+    assert stats["a"]["subs"] == 100
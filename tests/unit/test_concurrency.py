@@ -0,0 +1,93 @@
+import asyncio
+import pytest
+from types import SimpleNamespace
+from services.concurrency import AdaptiveConcurrencyLimiter, ServiceExecutor, is_throttling_error
+
+class _ClientError(Exception):
+    def __init__(self, code):
+        super().__init__(code)
+        self.response = {'Error': {'Code': code}}
+
+class _FakeEvents:
+    def __init__(self):
+        self.handlers = {}
+
+    def register(self, event, handler):
+        self.handlers[event] = handler
+
+def test_throttling_errors_are_recognized():
+    assert is_throttling_error(_ClientError('ThrottlingException'))
+    assert not is_throttling_error(_ClientError('ValidationException'))
+    assert not is_throttling_error(ValueError('boom'))
+
+def test_successes_grow_the_limit_additively():
+    limiter = AdaptiveConcurrencyLimiter('test', max_limit=10, initial_limit=2)
+    for _ in range(2):
+        limiter.on_success()
+    assert limiter.limit == 2
+    for _ in range(2):
+        limiter.on_success()
+    assert limiter.limit == 3
+
+def test_limit_never_exceeds_max():
+    limiter = AdaptiveConcurrencyLimiter('test', max_limit=3, initial_limit=3)
+    for _ in range(50):
+        limiter.on_success()
+    assert limiter.limit == 3
+
+def test_throttle_halves_the_limit_once_per_cooldown():
+    limiter = AdaptiveConcurrencyLimiter('test', max_limit=8, decrease_cooldown=60)
+    limiter.on_throttle()
+    limiter.on_throttle()
+    assert limiter.limit == 4
+    assert limiter.counters['throttles'] == 2
+    assert limiter.counters['limit_decreases'] == 1
+
+def test_limit_never_drops_below_min():
+    limiter = AdaptiveConcurrencyLimiter('test', max_limit=4, min_limit=2, decrease_cooldown=0)
+    for _ in range(5):
+        limiter.on_throttle()
+    assert limiter.limit == 2
+
+def test_call_reports_throttles_and_errors():
+    executor = ServiceExecutor('test', max_workers=2)
+    assert executor.call(lambda: 'ok') == 'ok'
+    for code in ('ThrottlingException', 'ValidationException'):
+        with pytest.raises(_ClientError):
+            executor.call(lambda: (_ for _ in ()).throw(_ClientError(code)))
+    stats = executor.limiter.stats()
+    assert (stats['successes'], stats['throttles'], stats['errors']) == (1, 1, 1)
+    executor.shutdown()
+
+def test_observed_client_reports_every_throttled_attempt():
+    executor = ServiceExecutor('test', max_workers=4)
+    client = SimpleNamespace(meta=SimpleNamespace(events=_FakeEvents()))
+    executor.observe_client(client)
+    on_attempt = client.meta.events.handlers['needs-retry']
+
+    def flaky_call():
+        # botocore retries two throttled attempts before the third succeeds
+        for _ in range(2):
+            assert on_attempt(response=(None, {'Error': {'Code': 'ThrottlingException'}})) is None
+        on_attempt(response=(None, {'ResponseMetadata': {}}))
+        return 'ok'
+
+    assert asyncio.run(executor.run(flaky_call)) == 'ok'
+    assert executor.limiter.counters['throttles'] == 2
+    assert executor.limiter.limit < 4
+    executor.shutdown()
+
+def test_observed_final_throttle_is_not_counted_twice():
+    executor = ServiceExecutor('test', max_workers=4)
+    client = SimpleNamespace(meta=SimpleNamespace(events=_FakeEvents()))
+    executor.observe_client(client)
+    on_attempt = client.meta.events.handlers['needs-retry']
+
+    def exhausted_call():
+        on_attempt(response=(None, {'Error': {'Code': 'ThrottlingException'}}))
+        raise _ClientError('ThrottlingException')
+
+    with pytest.raises(_ClientError):
+        executor.call(exhausted_call)
+    assert executor.limiter.counters['throttles'] == 1
+    executor.shutdown()
@@ -0,0 +1,79 @@
+import asyncio
+import json
+import pytest
+from services.graph_batch import GraphBatchClient, GraphRequest, chunk_requests, is_transient_error
+from services.http_session import HttpResponse
+
+def _get(path, **kwargs):
+    return GraphRequest('GET', path, **kwargs)
+
+def test_independent_requests_fill_batches_in_order():
+    batches = chunk_requests([_get(f'obj{i}') for i in range(120)])
+    assert [len(batch) for batch in batches] == [50, 50, 20]
+    assert [i for batch in batches for i in batch] == list(range(120))
+
+def test_dependent_requests_stay_in_one_batch():
+    requests = [_get(f'obj{i}') for i in range(48)]
+    requests += [GraphRequest('POST', 'media', name='item'),
+                 _get('{result=item:$.id}'),
+                 _get('status', params={'id': '{result=item:$.id}'})]
+    assert [len(batch) for batch in chunk_requests(requests)] == [48, 3]
+
+def test_dependency_chains_merge_groups():
+    requests = [GraphRequest('GET', 'me', name='me'),
+                _get('other'),
+                GraphRequest('GET', '{result=me:$.id}', name='account'),
+                _get('{result=account:$.id}/media')]
+    assert chunk_requests(requests, limit=4) == [[0, 1, 2, 3]]
+    with pytest.raises(ValueError):
+        chunk_requests(requests, limit=3)
+
+def test_get_params_go_in_the_url_and_post_params_in_the_body():
+    assert _get('v18.0/me', params={'fields': 'id,name'}).to_operation() == {
+        'method': 'GET', 'relative_url': 'v18.0/me?fields=id,name'}
+    operation = GraphRequest('POST', 'media', params={'caption': 'a & b'}).to_operation()
+    assert operation['body'] == 'caption=a+%26+b'
+
+class _FakeHttp:
+    """Answers batch requests with the given body."""
+
+    def __init__(self, body, status=200):
+        self.body, self.status, self.batches = body, status, []
+
+    async def request(self, method, url, data=None, **kwargs):
+        self.batches.append(json.loads(data['batch']))
+        return HttpResponse(status=self.status, body=self.body)
+
+def _client(http):
+    client = GraphBatchClient('token')
+    client.http = http
+    return client
+
+def test_responses_are_split_back_out():
+    http = _FakeHttp([{'code': 200, 'body': '{"id": "1"}'}, None, {'code': 400, 'body': '{"error": {}}'}])
+    responses = asyncio.run(_client(http).execute([_get('a'), _get('b'), _get('c')]))
+    assert responses[0].json() == {'id': '1'}
+    assert responses[1] is None
+    assert not responses[2].ok
+
+def test_transient_errors_are_recognized():
+    assert is_transient_error({'error': {'message': 'Application request limit reached', 'code': 4}})
+    assert is_transient_error({'error': {'code': 100, 'is_transient': True}})
+    assert is_transient_error({'error': 'Service unavailable'})
+    assert not is_transient_error({'error': {'message': 'Invalid parameter', 'code': 100}})
+
+def test_throttled_batch_leaves_every_response_empty():
+    http = _FakeHttp({'error': {'message': 'Too many calls', 'code': 4}}, status=400)
+    assert asyncio.run(_client(http).execute([_get('a'), _get('b')])) == [None, None]
+    assert asyncio.run(_client(http).get_objects(['a', 'b'], 'status_code')) == {}
+
+def test_server_error_leaves_every_response_empty():
+    http = _FakeHttp('Service Unavailable', status=503)
+    assert asyncio.run(_client(http).execute([_get('a'), _get('b')])) == [None, None]
+
+def test_rejected_batch_fails_every_request():
+    error = {'error': {'message': 'Error validating access token', 'type': 'OAuthException', 'code': 190}}
+    http = _FakeHttp(error, status=400)
+    responses = asyncio.run(_client(http).execute([_get('a'), _get('b')]))
+    assert [response.status for response in responses] == [400, 400]
+    assert asyncio.run(_client(http).get_objects(['a', 'b'], 'status_code')) == {'a': error, 'b': error}
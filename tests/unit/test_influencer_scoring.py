@@ -0,0 +1,62 @@
+import math
+from services.influencer_scoring import CandidatePool, ScoringWeights, rank_pool, score_channels, top_k
+
+NOW = 1_700_000_000.0
+DAY = 86400.0
+
+def _only(**weights):
+    """Weights with every feature off except the given ones."""
+    return ScoringWeights(**{'mentions': 0, 'subscribers': 0, 'recency': 0, 'diversity': 0,
+                             'engagement': 0, **weights})
+
+def _score(weights, mentions=(1, 1), subs=(1, 1), views=(0, 0), videos=(1, 1),
+           keyword_counts=(1, 1), latest_video_at=(0, 0)):
+    return list(score_channels(mentions, subs, views, videos, keyword_counts, latest_video_at, weights, now=NOW))
+
+def test_each_feature_is_scaled_by_its_maximum():
+    assert _score(_only(mentions=1), mentions=(4, 2)) == [1.0, 0.5]
+    assert _score(_only(diversity=2), keyword_counts=(3, 0)) == [2.0, 0.0]
+    scores = _score(_only(subscribers=1), subs=(999, 9))
+    assert scores[0] == 1.0 and math.isclose(scores[1], math.log(10) / math.log(1000))
+
+def test_recency_halves_every_half_life():
+    scores = _score(_only(recency=1), latest_video_at=(NOW - 30 * DAY, 0))
+    assert math.isclose(scores[0], 0.5) and scores[1] == 0.0
+
+def test_zero_features_do_not_divide_by_zero():
+    assert _score(ScoringWeights(), mentions=(0, 0), subs=(0, 0), keyword_counts=(0, 0)) == [0.0, 0.0]
+
+def test_top_k_returns_best_first():
+    scores = [0.2, 0.9, 0.5, 0.9, 0.1]
+    assert top_k(scores, 3) == [1, 3, 2]
+    assert top_k(scores, 10) == [1, 3, 2, 0, 4]
+    assert top_k(scores, 0) == [] and top_k([], 3) == []
+
+def test_top_k_on_a_large_pool_matches_a_full_sort():
+    scores = [(i * 7919) % 1000 / 1000 for i in range(5000)]
+    best = top_k(scores, 25)
+    assert len(set(best)) == 25
+    assert [scores[i] for i in best] == sorted(scores, reverse=True)[:25]
+
+def test_rank_pool_skips_channels_without_stats():
+    pool = CandidatePool()
+    pool.add("smart watch", "c1", 3)
+    pool.add("fitness tracker", "c1", 1)
+    pool.add("smart watch", "c2", 1)
+    pool.add("smart watch", "c3", 5)
+    stats = {"c1": {"subs": 1000, "views": 10000, "videos": 10},
+             "c2": {"subs": 10, "views": 50, "videos": 5}}
+    ranked = rank_pool(pool, stats, ScoringWeights(), k=5)
+    assert [channel_id for channel_id, _ in ranked] == ["c1", "c2"]
+    assert ranked[0][1] > ranked[1][1]
+
+def test_pool_merges_evidence_per_channel():
+    pool = CandidatePool()
+    assert not pool
+    pool.add("smart watch", "c1", 2, latest_video_at=NOW - DAY)
+    pool.add("fitness tracker", "c1", 1, latest_video_at=NOW - 5 * DAY)
+    pool.add("smart watch", "c2", 4)
+    assert pool.mentions == {"c1": 3, "c2": 4}
+    assert pool.keywords["c1"] == {"smart watch", "fitness tracker"}
+    assert pool.latest_video_at["c1"] == NOW - DAY
+    assert pool.most_mentioned(1) == ["c2"]
@@ -0,0 +1,84 @@
+from services.keyword_extraction import KeywordExtractor
+
+STOPWORDS = {"the", "a", "our", "for", "and", "with"}
+POS = {"the": "DET", "a": "DET", "our": "PRON", "for": "ADP", "and": "CCONJ", "2": "NUM", ",": "PUNCT", ".": "PUNCT"}
+
+class _Token:
+    def __init__(self, text):
+        self.text = text
+        self.pos_ = POS.get(text.lower(), "NOUN")
+        self.is_stop = text.lower() in STOPWORDS
+
+class _Span:
+    """Stand-in for a spaCy span over the words of a phrase found in text."""
+
+    def __init__(self, text, phrase, label=None):
+        self.start_char = text.index(phrase)
+        self.tokens = [_Token(word) for word in phrase.split()]
+        self.label_ = label
+
+    def __iter__(self):
+        return iter(self.tokens)
+
+class _Doc:
+    def __init__(self, text, chunks, ents=()):
+        self.text = text
+        self.noun_chunks = [_Span(text, chunk) for chunk in chunks]
+        self.ents = [_Span(text, phrase, label=label) for phrase, label in ents]
+
+TEXT = "The smart watch for runners. Apple and our smart watch track sleep for 2 weeks."
+
+def _doc(text=TEXT):
+    return _Doc(text,
+                chunks=["The smart watch", "runners", "our smart watch", "sleep"],
+                ents=[("Apple", "ORG"), ("2 weeks", "DATE")])
+
+class _FakeNlp:
+    def __init__(self):
+        self.parsed = []
+
+    def pipe(self, texts, batch_size, n_process):
+        self.parsed.append(list(texts))
+        return [_doc(text) for text in texts]
+
+def _extractor(nlp=None, **kwargs):
+    extractor = KeywordExtractor(**kwargs)
+    extractor._nlp, extractor._nlp_loaded = nlp, True
+    return extractor
+
+def test_candidates_are_cleaned_deduplicated_and_ranked():
+    keywords = _extractor().rank_candidates(_doc())
+    # "The smart watch" and "our smart watch" merge, and repetition ranks it first
+    assert keywords[0] == "smart watch"
+    assert keywords.count("smart watch") == 1
+    assert set(keywords) == {"smart watch", "Apple", "runners", "sleep"}
+    # Entities outrank plain chunks; date entities are skipped
+    assert keywords.index("Apple") < keywords.index("runners")
+
+def test_max_keywords_caps_the_result():
+    assert len(_extractor(max_keywords=2).rank_candidates(_doc())) == 2
+
+def test_repeated_texts_are_served_from_cache():
+    nlp = _FakeNlp()
+    extractor = _extractor(nlp)
+    first = extractor.extract_many([TEXT, "  ".join(TEXT.split(" ")), ""])
+    assert first[0] == first[1] and first[2] == []
+    # Whitespace variants share one parse
+    assert nlp.parsed == [[TEXT]]
+    assert extractor.extract(TEXT) == first[0]
+    assert len(nlp.parsed) == 1
+
+def test_fallback_when_spacy_model_is_missing():
+    calls = []
+
+    def fallback(text, top_n):
+        calls.append((text, top_n))
+        return ["fallback keyword"]
+
+    extractor = KeywordExtractor(model="not_an_installed_model", max_keywords=5, fallback=fallback)
+    assert extractor.extract("A smart watch") == ["fallback keyword"]
+    assert extractor.extract("A smart watch") == ["fallback keyword"]
+    assert calls == [("A smart watch", 5)]
+
+def test_no_model_and_no_fallback_returns_nothing():
+    assert KeywordExtractor(model="not_an_installed_model").extract("A smart watch") == []
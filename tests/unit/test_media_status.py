@@ -0,0 +1,47 @@
+import asyncio
+from services.media_status import MediaStatusPoller, get_status_poller
+
+RATE_LIMITED = {'error': {'message': 'Application request limit reached', 'code': 4}}
+INVALID_MEDIA = {'error': {'message': 'Invalid parameter', 'code': 100}}
+
+def _poller(responses, **kwargs):
+    """Poller whose fetches return the next entry of responses for every ID."""
+    calls = []
+
+    async def fetch(ids):
+        calls.append(list(ids))
+        response = responses[min(len(calls), len(responses)) - 1]
+        return {} if response is None else {creation_id: response for creation_id in ids}
+
+    options = {'initial_delay': 0.01, 'max_delay': 0.02, 'timeout': 2, 'batch_window': 0.05, **kwargs}
+    return MediaStatusPoller(fetch, **options), calls
+
+def test_waits_until_finished():
+    poller, calls = _poller([{'status_code': 'IN_PROGRESS'}, {'status_code': 'FINISHED'}])
+    assert asyncio.run(poller.wait('c1'))['status_code'] == 'FINISHED'
+    assert len(calls) == 2
+
+def test_rate_limit_and_missing_responses_are_retried():
+    poller, calls = _poller([RATE_LIMITED, None, {'status_code': 'FINISHED'}])
+    assert asyncio.run(poller.wait('c1'))['status_code'] == 'FINISHED'
+    assert len(calls) == 3
+
+def test_permanent_error_resolves_immediately():
+    poller, calls = _poller([INVALID_MEDIA])
+    assert asyncio.run(poller.wait('c1')) == INVALID_MEDIA
+    assert len(calls) == 1
+
+def test_deadline_returns_last_status():
+    poller, _ = _poller([{'status_code': 'IN_PROGRESS'}], timeout=0.1)
+    assert asyncio.run(poller.wait('c1')) == {'status_code': 'IN_PROGRESS', 'timed_out': True}
+
+def test_pending_containers_share_fetches():
+    poller, calls = _poller([{'status_code': 'IN_PROGRESS'}] * 3 + [{'status_code': 'FINISHED'}])
+    statuses = asyncio.run(poller.wait_many(['c1', 'c2', 'c3']))
+    assert {status['status_code'] for status in statuses.values()} == {'FINISHED'}
+    # However the first checks land, later polls cover every pending container at once
+    assert sorted(calls[-1]) == ['c1', 'c2', 'c3']
+
+def test_poller_is_shared_per_access_token():
+    assert get_status_poller('token-a') is get_status_poller('token-a')
+    assert get_status_poller('token-a') is not get_status_poller('token-b')
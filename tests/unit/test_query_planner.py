@@ -0,0 +1,47 @@
+import pytest
+from services.query_planner import QueryPlanner, cluster_keywords, concepts_of
+
+KEYWORDS = ['smart watch', 'watch', 'fitness tracker', 'heart rate monitor',
+            'runners', 'battery life', 'apple', 'sleep tracking']
+
+def _or_terms(query):
+    return query.split('|') if '|' in query else []
+
+def test_concepts_treat_plurals_as_one_concept():
+    assert concepts_of('Smart Watches') == concepts_of('smart watch')
+
+def test_subset_keyword_joins_its_superset_cluster():
+    clusters = cluster_keywords(['smart watch', 'watch', 'fitness tracker'])
+    assert [cluster.keywords for cluster in clusters] == [['smart watch', 'watch'], ['fitness tracker']]
+
+def test_or_queries_quote_multi_word_terms():
+    plan = QueryPlanner().plan(KEYWORDS, 200)
+    or_queries = [planned.query for planned in plan if '|' in planned.query]
+    assert or_queries
+    for query in or_queries:
+        for term in _or_terms(query):
+            assert ' ' not in term or (term.startswith('"') and term.endswith('"'))
+
+@pytest.mark.parametrize('budget', [100, 200, 300, 500, 700])
+def test_plan_stays_within_budget(budget):
+    plan = QueryPlanner().plan(KEYWORDS, budget)
+    assert sum(planned.cost for planned in plan) <= budget
+
+@pytest.mark.parametrize('budget', [200, 300, 500, 600])
+def test_no_cluster_is_searched_twice(budget):
+    plan = QueryPlanner().plan(KEYWORDS, budget)
+    searched = [keyword for planned in plan for keyword in planned.keywords]
+    assert len(searched) == len(set(searched))
+
+def test_budget_for_every_cluster_means_no_or_queries():
+    plan = QueryPlanner().plan(KEYWORDS, 700)
+    assert [planned.query for planned in plan] == [
+        'smart watch', 'fitness tracker', 'heart rate monitor', 'runners',
+        'battery life', 'apple', 'sleep tracking']
+
+def test_free_queries_cost_nothing():
+    plan = QueryPlanner().plan(KEYWORDS, 0, free_queries=lambda queries: {'apple'})
+    assert [(planned.query, planned.cost) for planned in plan] == [('apple', 0)]
+
+def test_empty_keywords_plan_nothing():
+    assert QueryPlanner().plan(['', '  '], 500) == []
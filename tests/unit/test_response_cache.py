@@ -0,0 +1,64 @@
+import pytest
+from services import response_cache
+from services.response_cache import ResponseCache
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Controllable time.time() for the cache module."""
+    now = [1000.0]
+    monkeypatch.setattr(response_cache.time, 'time', lambda: now[0])
+    return now
+
+def test_make_key_ignores_argument_order():
+    assert ResponseCache.make_key(a=1, b='x') == ResponseCache.make_key(b='x', a=1)
+    assert ResponseCache.make_key(a=1) != ResponseCache.make_key(a=2)
+
+def test_memory_tier_evicts_least_recently_used():
+    cache = ResponseCache(max_entries=2)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    cache.get('a')
+    cache.set('c', 3)
+    assert (cache.get('a'), cache.get('b'), cache.get('c')) == (1, None, 3)
+
+def test_entries_expire_after_ttl(clock):
+    cache = ResponseCache(ttl_seconds=10)
+    cache.set('a', 'value')
+    clock[0] += 10
+    assert cache.get('a') == 'value'
+    clock[0] += 1
+    assert cache.get('a') is None
+
+def test_stale_entries_readable_only_when_allowed(clock):
+    cache = ResponseCache(ttl_seconds=10, stale_ttl_seconds=20)
+    cache.set('a', 'value')
+    clock[0] += 15
+    assert cache.get('a') is None
+    assert cache.get('a', allow_stale=True) == 'value'
+    clock[0] += 20
+    assert cache.get('a', allow_stale=True) is None
+
+def test_disk_tier_survives_a_new_instance(tmp_path):
+    db_path = str(tmp_path / 'cache.sqlite3')
+    ResponseCache(db_path=db_path).set('a', {'posts': ['x']})
+    assert ResponseCache(db_path=db_path).get('a') == {'posts': ['x']}
+
+def test_disk_tier_evicts_least_recently_used(tmp_path, clock):
+    db_path = str(tmp_path / 'cache.sqlite3')
+    cache = ResponseCache(max_entries=1, db_path=db_path, max_disk_entries=2)
+    for key in ('a', 'b'):
+        cache.set(key, key)
+        clock[0] += 1
+    cache.get('a')
+    clock[0] += 1
+    cache.set('c', 'c')
+    fresh = ResponseCache(db_path=db_path)
+    assert (fresh.get('a'), fresh.get('b'), fresh.get('c')) == ('a', None, 'c')
+
+def test_purge_expired_drops_entries_past_the_stale_window(tmp_path, clock):
+    cache = ResponseCache(ttl_seconds=10, stale_ttl_seconds=5, db_path=str(tmp_path / 'cache.sqlite3'))
+    cache.set('old', 1)
+    clock[0] += 20
+    cache.set('new', 2)
+    assert cache.purge_expired() == 1
+    assert cache.get('new') == 2
@@ -0,0 +1,65 @@
+import asyncio
+import time
+import pytest
+
+pytest.importorskip("streamlit")
+from social_media_manager import SocialMediaManager
+
+class _Manager(SocialMediaManager):
+    """Manager whose platform calls sleep, fail or succeed on cue."""
+
+    def __init__(self, delays=None, errors=None):
+        self.delays = delays or {}
+        self.errors = errors or {}
+
+    async def _publish(self, platform):
+        await asyncio.sleep(self.delays.get(platform, 0))
+        if platform in self.errors:
+            raise self.errors[platform]
+        return {'success': True, 'platform': platform}
+
+    async def publish_to_linkedin(self, content, media_path=None):
+        return await self._publish('linkedin')
+
+    async def publish_to_twitter(self, content, media_path=None):
+        return await self._publish('twitter')
+
+    async def publish_to_instagram(self, content, media_path):
+        return await self._publish('instagram')
+
+CONTENT = {'linkedin': 'L', 'twitter': 'T', 'instagram': 'I'}
+
+def _collect(manager, content=CONTENT, media_path='media/post.jpg', timeouts=None):
+    async def run():
+        return [item async for item in manager.iter_publish_to_all(content, media_path, timeouts)]
+    return asyncio.run(run())
+
+def test_results_are_yielded_as_platforms_finish():
+    manager = _Manager(delays={'linkedin': 0.1, 'twitter': 0.0, 'instagram': 0.05})
+    results = _collect(manager)
+    assert [platform for platform, _ in results] == ['twitter', 'instagram', 'linkedin']
+    assert all(result['success'] for _, result in results)
+
+def test_timeout_fails_only_that_platform():
+    manager = _Manager(delays={'instagram': 5})
+    start = time.monotonic()
+    results = dict(_collect(manager, timeouts={'instagram': 0.05}))
+    assert time.monotonic() - start < 1
+    assert results['instagram'] == {'success': False, 'error': 'Timed out after 0.05s'}
+    assert results['linkedin']['success'] and results['twitter']['success']
+
+def test_exception_fails_only_that_platform():
+    manager = _Manager(errors={'twitter': RuntimeError('rate limited')})
+    results = dict(_collect(manager))
+    assert results['twitter'] == {'success': False, 'error': 'rate limited'}
+    assert results['linkedin']['success'] and results['instagram']['success']
+
+def test_instagram_is_skipped_without_media():
+    results = dict(_collect(_Manager(), media_path=None))
+    assert set(results) == {'linkedin', 'twitter'}
+
+def test_publish_to_all_reports_in_platform_order():
+    manager = _Manager(delays={'linkedin': 0.05}, errors={'instagram': ValueError('bad media')})
+    results = asyncio.run(manager.publish_to_all(CONTENT, 'media/post.jpg'))
+    assert list(results) == ['linkedin', 'twitter', 'instagram']
+    assert results['instagram'] == {'success': False, 'error': 'bad media'}
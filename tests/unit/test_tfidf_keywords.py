@@ -0,0 +1,60 @@
+import json
+import math
+from services.tfidf_keywords import TfidfKeywordExtractor, build_idf_table, candidate_terms, main
+
+DOCUMENTS = [
+    "Smart water bottle that tracks hydration",
+    "Water bottle for hiking trips",
+    "Smart watch that tracks sleep",
+    "Organic coffee for early mornings",
+    "Smart watch bands for runners",
+]
+
+def test_candidate_terms_skip_stopwords_and_do_not_bridge_them():
+    unigrams, bigrams = candidate_terms("The smart watch for runners")
+    assert unigrams == ["smart", "watch", "runners"]
+    assert bigrams == ["smart watch"]
+
+def test_build_then_load_idf_table(tmp_path):
+    prefix = str(tmp_path / "tables" / "idf")
+    assert build_idf_table(DOCUMENTS, prefix, min_df=2) == 7
+    with open(f"{prefix}.meta.json", encoding="utf-8") as f:
+        meta = json.load(f)
+    assert meta["documents"] == 5
+    assert meta["default_idf"] == math.log(6) + 1
+
+    extractor = TfidfKeywordExtractor(prefix)
+    extractor._load()
+    assert list(extractor._terms) == ["bottle", "smart", "smart watch", "tracks", "watch", "water", "water bottle"]
+    idf = dict(zip(extractor._terms, extractor._idf))
+    # smart is in 3 of 5 documents, water in 2
+    assert math.isclose(idf["smart"], math.log(6 / 4) + 1, rel_tol=1e-6)
+    assert math.isclose(idf["water"], math.log(6 / 3) + 1, rel_tol=1e-6)
+    assert "coffee" not in idf
+
+def test_rare_terms_outrank_common_ones(tmp_path):
+    prefix = str(tmp_path / "idf")
+    build_idf_table(DOCUMENTS, prefix, min_df=1)
+    keywords = TfidfKeywordExtractor(prefix).extract("smart hydration", top_n=3)
+    assert keywords == ["smart hydration", "hydration", "smart"]
+
+def test_unseen_terms_get_the_default_idf(tmp_path):
+    prefix = str(tmp_path / "idf")
+    build_idf_table(DOCUMENTS, prefix, min_df=2)
+    extractor = TfidfKeywordExtractor(prefix)
+    extractor._load()
+    idf = extractor._lookup_idf(["smart", "zzz unseen", "aardvark"])
+    assert math.isclose(idf[1], math.log(6) + 1, rel_tol=1e-6)
+    assert math.isclose(idf[2], math.log(6) + 1, rel_tol=1e-6)
+    assert idf[0] < idf[1]
+
+def test_without_a_table_terms_rank_by_frequency():
+    extractor = TfidfKeywordExtractor(None)
+    assert extractor.extract("watch bands and watch", top_n=3) == ["watch", "watch bands", "bands"]
+    assert extractor.extract("the and of") == []
+
+def test_cli_builds_a_table_from_jsonl(tmp_path, capsys):
+    source = tmp_path / "campaigns.jsonl"
+    source.write_text("\n".join(json.dumps({"description": d}) for d in DOCUMENTS), encoding="utf-8")
+    assert main([str(source), str(tmp_path / "idf")]) == 0
+    assert "Wrote 7 terms" in capsys.readouterr().out
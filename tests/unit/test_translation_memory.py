@@ -0,0 +1,40 @@
+import asyncio
+import pytest
+from services.response_cache import ResponseCache
+from services.translation_memory import TranslationMemory, join_segments, split_segments
+
+@pytest.mark.parametrize('text', [
+    'One sentence.',
+    '  Leading and trailing space.  ',
+    'First line\n\nSecond line.  Third sentence!\n',
+    'Dr. Smith arrived. e.g. this',
+    '',
+])
+def test_split_join_round_trip(text):
+    assert join_segments(*split_segments(text)) == text
+
+def test_splits_at_sentence_ends_and_line_breaks():
+    segments, _ = split_segments('Big news! Our store opens today.\nSee you there?')
+    assert segments == ['Big news!', 'Our store opens today.', 'See you there?']
+
+def test_abbreviations_and_lowercase_do_not_split():
+    segments, _ = split_segments('Dr. Smith arrived. e.g. this works. Ask Mr. Jones.')
+    assert segments == ['Dr. Smith arrived. e.g. this works.', 'Ask Mr. Jones.']
+
+def test_initials_and_acronyms_do_not_split():
+    segments, _ = split_segments('J. Doe opened our U.S. store. It is big.')
+    assert segments == ['J. Doe opened our U.S. store.', 'It is big.']
+
+def test_only_missing_segments_are_translated():
+    memory = TranslationMemory(ResponseCache(max_entries=16))
+    requested = []
+
+    async def translate_segments(segments):
+        requested.append(list(segments))
+        return [segment.upper() for segment in segments]
+
+    first = asyncio.run(memory.translate('Hello there. Hello there.', 'en', 'es', translate_segments))
+    second = asyncio.run(memory.translate('Hello there. New sale!', 'en', 'es', translate_segments))
+    assert first == 'HELLO THERE. HELLO THERE.'
+    assert second == 'HELLO THERE. NEW SALE!'
+    assert requested == [['Hello there.'], ['New sale!']]
@@ -1,119 +1,314 @@
 import os
+import threading
 from collections import Counter
-from googleapiclient.discovery import build
-import spacy
-import re
-from typing import List, Dict, Optional
+from concurrent.futures import ThreadPoolExecutor, TimeoutError, as_completed
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+from config.settings import (
+    CHANNEL_INDEX_CONFIG, INFLUENCER_SCORING_CONFIG, KEYWORD_EXTRACTION_CONFIG,
+    YOUTUBE_CHANNEL_CACHE_CONFIG, YOUTUBE_QUOTA_CONFIG, YOUTUBE_SEARCH_CACHE_CONFIG,
+    YOUTUBE_SEARCH_CONFIG
+)
+from services.channel_index import ChannelIndex
+from services.channel_stats import ChannelStatsService
+from services.influencer_scoring import CandidatePool, ScoringWeights, rank_pool
+from services.keyword_extraction import KeywordExtractor
+from services.query_planner import QueryPlanner
+from services.response_cache import ResponseCache
+from services.tfidf_keywords import TfidfKeywordExtractor
+from services.youtube_client import YouTubeClientPool
+from services.youtube_quota import SEARCH_LIST_COST, QuotaLedger
 
-# Load spaCy model once at module import; raise helpful error if missing
-def _load_spacy():
-    try:
-        return spacy.load("en_core_web_sm")
-    except Exception:
-        # spaCy or model not available; return None and rely on fallback extractor
-        return None
-
-_nlp = _load_spacy()
-
-# Simple fallback stopwords (keeps small, not exhaustive)
-_FALLBACK_STOPWORDS = {
-    "the","and","for","with","that","this","from","your","you","are","our","have",
-    "will","can","not","but","about","product","service","use","using","get","gets",
-    "a","an","in","on","of","to","is","it","as","at","by"
-}
+# Used when spaCy is unavailable; the IDF table is memory-mapped on first use
+tfidf_extractor = TfidfKeywordExtractor(KEYWORD_EXTRACTION_CONFIG['idf_table'])
 
 def _extract_keywords_fallback(text: str, top_n: int = 10) -> List[str]:
     """
     Lightweight fallback extractor:
-    - Tokenizes words (letters only), filters short words and stopwords
-    - Returns top words by frequency and a few frequent bigrams
-    """
-    if not text:
-        return []
-    words = re.findall(r"[a-zA-Z]{3,}", text.lower())
-    filtered = [w for w in words if w not in _FALLBACK_STOPWORDS]
-    if not filtered:
-        return []
-    word_counts = Counter(filtered)
-    keywords = [w for w, _ in word_counts.most_common(top_n)]
-
-    # add common bigrams if any
-    bigrams = [" ".join([filtered[i], filtered[i+1]]) for i in range(len(filtered)-1)]
-    bigram_counts = Counter(bigrams)
-    for b, _ in bigram_counts.most_common(5):
-        if b not in keywords:
-            keywords.append(b)
-        if len(keywords) >= top_n:
-            break
-
-    return keywords[:top_n]
+    - Tokenizes words, filters short words and stopwords
+    - Ranks unigrams and bigrams by TF-IDF against the precomputed IDF table
+    """
+    return tfidf_extractor.extract(text, top_n=top_n)
+
+# spaCy is loaded on first use, so importing this module stays fast
+keyword_extractor = KeywordExtractor(
+    model=KEYWORD_EXTRACTION_CONFIG['model'],
+    max_keywords=KEYWORD_EXTRACTION_CONFIG['max_keywords'],
+    cache_entries=KEYWORD_EXTRACTION_CONFIG['cache_entries'],
+    batch_size=KEYWORD_EXTRACTION_CONFIG['batch_size'],
+    fallback=_extract_keywords_fallback
+)
 
 def extract_keywords(text: str) -> List[str]:
     """
-    Extract a set of candidate keywords from text using spaCy noun chunks and entities
+    Extract ranked candidate keywords from text using spaCy noun chunks and entities
     when available. If spaCy/model is not present, a lightweight regex-based fallback
-    is used so the app can still find relevant YouTube channels.
-    """
-    if _nlp and text:
-        doc = _nlp(text)
-        keywords = set()
-        for chunk in doc.noun_chunks:
-            if len(chunk.text.strip()) > 2:
-                keywords.add(chunk.text.strip())
-        for ent in doc.ents:
-            if len(ent.text.strip()) > 2:
-                keywords.add(ent.text.strip())
-        return list(keywords)
-    # fallback
-    return _extract_keywords_fallback(text)
-
-def search_videos(youtube, query: str, max_results: int = 8):
+    is used so the app can still find relevant YouTube channels. Results are memoized
+    per description.
     """
-    Return search results (list of video items) for a query via the youtube client.
+    return keyword_extractor.extract(text) if text else []
+
+def extract_keywords_many(texts: List[str], n_process: int = 1) -> List[List[str]]:
+    """Batch version of extract_keywords for bulk campaign runs."""
+    return keyword_extractor.extract_many(texts, n_process=n_process)
+
+# Built clients are reused across find_influencers calls; one per concurrent search
+client_pool = YouTubeClientPool(max_idle_per_key=YOUTUBE_SEARCH_CONFIG['max_concurrency'])
+
+# Each search().list call costs SEARCH_LIST_COST quota units, so results are cached
+search_cache = ResponseCache(
+    max_entries=YOUTUBE_SEARCH_CACHE_CONFIG['max_entries'],
+    ttl_seconds=YOUTUBE_SEARCH_CACHE_CONFIG['ttl_seconds'],
+    db_path=YOUTUBE_SEARCH_CACHE_CONFIG['db_path'],
+    stale_ttl_seconds=YOUTUBE_SEARCH_CACHE_CONFIG['stale_ttl_seconds'],
+    max_disk_entries=YOUTUBE_SEARCH_CACHE_CONFIG['max_disk_entries']
+)
+
+quota_ledger = QuotaLedger(
+    daily_budget=YOUTUBE_QUOTA_CONFIG['daily_budget'],
+    db_path=YOUTUBE_QUOTA_CONFIG['db_path']
+)
+
+channel_stats_service = ChannelStatsService(
+    title_ttl_seconds=YOUTUBE_CHANNEL_CACHE_CONFIG['title_ttl_seconds'],
+    statistics_ttl_seconds=YOUTUBE_CHANNEL_CACHE_CONFIG['statistics_ttl_seconds'],
+    max_concurrency=YOUTUBE_CHANNEL_CACHE_CONFIG['max_concurrency'],
+    db_path=YOUTUBE_CHANNEL_CACHE_CONFIG['db_path'],
+    quota_ledger=quota_ledger
+)
+
+query_planner = QueryPlanner()
+
+channel_index = ChannelIndex(
+    keyword_ttl_seconds=CHANNEL_INDEX_CONFIG['keyword_ttl_seconds'],
+    db_path=CHANNEL_INDEX_CONFIG['db_path']
+)
+
+def _normalize_query(query: str) -> str:
+    return " ".join(query.lower().split())
+
+class _UnitBudget:
+    """Quota units one influencer lookup may spend on follow-up result pages."""
+
+    def __init__(self, units: int):
+        self.units = units
+        self._lock = threading.Lock()
+
+    def try_spend(self, units: int) -> bool:
+        with self._lock:
+            if units > self.units:
+                return False
+            self.units -= units
+            return True
+
+def search_page(youtube, query: str, max_results: int = 8, page_token: Optional[str] = None,
+                http=None, use_cache: bool = True,
+                spend: Optional[Callable[[int], bool]] = None) -> Tuple[List[Dict], Optional[str]]:
     """
+    Return (video items, nextPageToken) for one page of search results.
+
+    - spend: optional extra gate checked before a live (uncached) request, e.g. a
+      per-lookup budget; when it refuses, only cached results are returned.
+    - Results are cached per (normalized query, max_results, type, page). When the
+      daily quota budget is used up, only cached (possibly stale) results are returned.
+    """
+    key_parts = {"q": _normalize_query(query), "maxResults": max_results, "type": "video"}
+    if page_token:
+        key_parts["pageToken"] = page_token
+    cache_key = ResponseCache.make_key(**key_parts)
+
+    def from_cache(allow_stale: bool):
+        cached = search_cache.get(cache_key, allow_stale=allow_stale)
+        if cached is None:
+            return None
+        # Entries written before pagination support hold just the item list
+        if isinstance(cached, list):
+            return cached, None
+        return cached["items"], cached.get("next_page_token")
+
+    if use_cache:
+        cached = from_cache(False)
+        if cached is not None:
+            return cached
+
+    if spend is not None and not spend(SEARCH_LIST_COST):
+        return from_cache(True) or ([], None)
+    if not quota_ledger.try_spend(SEARCH_LIST_COST):
+        print(f"YouTube quota budget reached; serving cached results only for '{query}'")
+        return from_cache(True) or ([], None)
+
     try:
-        resp = youtube.search().list(
-            q=query,
-            part="snippet",
-            type="video",
-            maxResults=max_results
-        ).execute()
-        return resp.get("items", [])
+        request_args = {"q": query, "part": "snippet", "type": "video", "maxResults": max_results}
+        if page_token:
+            request_args["pageToken"] = page_token
+        resp = youtube.search().list(**request_args).execute(http=http)
     except Exception:
-        return []
+        return from_cache(True) or ([], None)
+    items = resp.get("items", [])
+    next_page_token = resp.get("nextPageToken")
+    search_cache.set(cache_key, {"items": items, "next_page_token": next_page_token})
+    return items, next_page_token
+
+def search_videos(youtube, query: str, max_results: int = 8, http=None, use_cache: bool = True):
+    """
+    Return search results (list of video items) for a query via the youtube client.
+
+    - http: optional httplib2.Http to execute the request with instead of the
+      client's own.
+    - Results are cached per (normalized query, max_results, type). When the daily
+      quota budget is used up, only cached (possibly stale) results are returned.
+    """
+    return search_page(youtube, query, max_results=max_results, http=http, use_cache=use_cache)[0]
 
 def get_channel_stats(youtube, channel_ids: List[str]) -> Dict[str, Dict]:
     """
-    Fetch channel statistics (title, subscriber count, link) for a list of channel ids.
+    Fetch channel statistics (title, subscriber/view/video counts, link) for a list of channel ids.
+    Ids are requested in batches of 50 and only when their cached data is stale.
+
+    - youtube: a built YouTube client, or an API key to use pooled clients so
+      batches are fetched concurrently.
+    """
+    if isinstance(youtube, str):
+        return channel_stats_service.get_stats(channel_ids, lambda: client_pool.client(youtube))
+    # A single client is not thread-safe, so its batches take turns
+    lock = threading.Lock()
+
+    @contextmanager
+    def acquire_client():
+        with lock:
+            yield youtube
+
+    return channel_stats_service.get_stats(channel_ids, acquire_client)
+
+def _search_keyword(api_key: str, keyword: str, max_results: int, max_pages: int,
+                    target_channels: int, page_budget: Optional[_UnitBudget]) -> List[Dict]:
     """
+    Search one keyword, following nextPageToken while fewer than target_channels
+    distinct channels were found (0 = no target), up to max_pages pages and
+    while page_budget allows.
+    """
+    with client_pool.client(api_key) as youtube:
+        items, page_token = search_page(youtube, keyword, max_results=max_results)
+        pages = 1
+        while page_token and pages < max_pages:
+            channels = {vid.get("snippet", {}).get("channelId") for vid in items}
+            if target_channels and len(channels) >= target_channels:
+                break
+            more, page_token = search_page(
+                youtube, keyword, max_results=max_results, page_token=page_token,
+                spend=page_budget.try_spend if page_budget else None
+            )
+            if not more:
+                break
+            items = items + more
+            pages += 1
+    return items
+
+def _published_timestamp(published_at: Optional[str]) -> float:
     try:
-        resp = youtube.channels().list(
-            part="statistics,snippet",
-            id=",".join(channel_ids)
-        ).execute()
-    except Exception:
-        return {}
-    stats = {}
-    for item in resp.get("items", []):
-        stats[item["id"]] = {
-            "title": item["snippet"]["title"],
-            "subs": int(item["statistics"].get("subscriberCount", 0)),
-            "link": f"https://www.youtube.com/channel/{item['id']}"
-        }
-    return stats
+        return datetime.fromisoformat(published_at.replace("Z", "+00:00")).timestamp()
+    except (AttributeError, ValueError):
+        return 0.0
 
-def find_influencers(
+def _iter_keyword_results(api_key: str, keywords: List[str], max_results: int,
+                          max_concurrency: int, deadline_seconds: float,
+                          max_pages: int = 1, target_channels: int = 0,
+                          page_budget: Optional[_UnitBudget] = None
+                          ) -> Iterator[Tuple[str, Counter, Dict[str, float]]]:
+    """
+    Run the keyword searches concurrently and yield (keyword, videos per channel,
+    newest video publish time per channel) as each one finishes, recording it in
+    the channel index. A search that fails yields no channels. Searches still running
+    when the deadline passes are abandoned.
+    """
+    executor = ThreadPoolExecutor(max_workers=max(1, min(max_concurrency, len(keywords))),
+                                  thread_name_prefix="youtube-search")
+    futures = {
+        executor.submit(_search_keyword, api_key, keyword, max_results,
+                        max_pages, target_channels, page_budget): keyword
+        for keyword in keywords
+    }
+    try:
+        for future in as_completed(futures, timeout=deadline_seconds):
+            keyword_counts = Counter()
+            titles = {}
+            latest_video_at = {}
+            try:
+                videos = future.result()
+            except Exception as e:
+                # Keep the searches that finished; their quota is already spent
+                print(f"Error searching YouTube for '{futures[future]}': {str(e)}")
+                videos = []
+            for vid in videos:
+                snippet = vid.get("snippet", {})
+                channel_id = snippet.get("channelId")
+                if channel_id:
+                    keyword_counts[channel_id] += 1
+                    titles[channel_id] = snippet.get("channelTitle")
+                    published = _published_timestamp(snippet.get("publishedAt"))
+                    latest_video_at[channel_id] = max(latest_video_at.get(channel_id, 0.0), published)
+            # An empty result usually means a failed or quota-refused search; retry it next time
+            if keyword_counts and CHANNEL_INDEX_CONFIG['enabled']:
+                channel_index.record_search(futures[future], keyword_counts, titles, latest_video_at)
+            yield futures[future], keyword_counts, latest_video_at
+    except TimeoutError:
+        finished = sum(1 for future in futures if future.done())
+        print(f"Influencer search deadline reached after {finished}/{len(futures)} keyword searches")
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+def _rank_influencers(api_key: str, pool: CandidatePool, top_n: int,
+                      weights: Optional[ScoringWeights] = None) -> List[Dict]:
+    """
+    Fetch stats for up to candidate_pool of the most mentioned channels (one quota
+    unit per 50) and return the top_n by weighted score.
+    """
+    candidates = pool.most_mentioned(INFLUENCER_SCORING_CONFIG['candidate_pool'])
+    stats = get_channel_stats(api_key, candidates)
+    if CHANNEL_INDEX_CONFIG['enabled']:
+        channel_index.record_stats(stats)
+
+    influencers = []
+    for channel_id, score in rank_pool(pool, stats, weights or ScoringWeights(), top_n):
+        data = stats[channel_id]
+        influencers.append({
+            "channel": data["title"],
+            "subs": data["subs"],
+            "link": data["link"],
+            "mentions": pool.mentions.get(channel_id, 0),
+            "score": round(score, 4)
+        })
+    return influencers
+
+def iter_influencers(
     description: str,
     api_key: Optional[str] = None,
     max_results_per_keyword: int = 6,
-    top_n: int = 10
-) -> List[Dict]:
+    top_n: int = 10,
+    max_concurrency: Optional[int] = None,
+    deadline_seconds: Optional[float] = None,
+    max_pages: Optional[int] = None,
+    target_channels: Optional[int] = None,
+    page_quota_units: Optional[int] = None,
+    weights: Optional[ScoringWeights] = None,
+    quota_units: Optional[int] = None,
+    yield_partial: bool = True
+) -> Iterator[List[Dict]]:
     """
-    Main entrypoint: given a product/ campaign description, return a ranked list of influencer
-    channel dicts with keys: channel, subs, link, mentions.
+    Streaming variant of find_influencers: yields the ranked influencer list
+    (same dicts as find_influencers) again each time more results are in, first
+    for keywords answered by the channel index, then as each keyword search
+    finishes. The last list yielded is the final ranking.
 
-    - api_key: YouTube Data API key. If None, will attempt to read env var YOUTUBE_API_KEY.
-    - Returns [] on error or when no influencers found.
+    - max_pages / target_channels / page_quota_units: follow nextPageToken for up to
+      max_pages pages per keyword until target_channels distinct channels are found,
+      spending at most page_quota_units on follow-up pages; default to YOUTUBE_SEARCH_CONFIG.
+    - weights: per-campaign ScoringWeights for ranking; defaults to ScoringWeights().
+    - quota_units: search quota this lookup may spend on first pages; overlapping
+      keywords are merged and combined with OR to fit it (see services/query_planner.py).
+      Defaults to YOUTUBE_SEARCH_CONFIG['query_quota_units'].
+    - yield_partial: when False, only the final list is yielded.
     """
     if not api_key:
         api_key = os.getenv("YOUTUBE_API_KEY")
@@ -121,37 +316,93 @@ def find_influencers(
         # Caller should handle missing API key
         raise RuntimeError("YOUTUBE_API_KEY not provided")
 
-    youtube = build("youtube", "v3", developerKey=api_key)
     keywords = extract_keywords(description) if description else []
     if not keywords:
-        return []
-
-    channel_frequency = Counter()
-    for keyword in keywords:
-        videos = search_videos(youtube, keyword, max_results=max_results_per_keyword)
-        for vid in videos:
-            channel_id = vid.get("snippet", {}).get("channelId")
-            if channel_id:
-                channel_frequency[channel_id] += 1
-
-    if not channel_frequency:
-        return []
-
-    top_channels = [cid for cid, _ in channel_frequency.most_common(top_n)]
-    stats = get_channel_stats(youtube, top_channels)
-
-    ranked = sorted(
-        stats.items(),
-        key=lambda x: (channel_frequency.get(x[0], 0), x[1]["subs"]),
-        reverse=True
+        yield []
+        return
+
+    keywords = list(dict.fromkeys(_normalize_query(keyword) for keyword in keywords))
+    # Queries already in the channel index are free; the rest must fit the quota budget
+    plan = query_planner.plan(
+        keywords,
+        YOUTUBE_SEARCH_CONFIG['query_quota_units'] if quota_units is None else quota_units,
+        free_queries=channel_index.fresh_keywords if CHANNEL_INDEX_CONFIG['enabled'] else None
     )
+    covered = [planned.query for planned in plan if planned.cost == 0]
+    uncovered = [planned.query for planned in plan if planned.cost > 0]
 
+    pool = CandidatePool()
+    for keyword, channel_id, mentions, latest_video_at in channel_index.keyword_edges(covered):
+        pool.add(keyword, channel_id, mentions, latest_video_at)
+    pending = bool(pool)
+    yielded = False
+    if pending and yield_partial and uncovered:
+        yield _rank_influencers(api_key, pool, top_n, weights)
+        pending, yielded = False, True
+
+    if uncovered:
+        page_quota_units = YOUTUBE_SEARCH_CONFIG['page_quota_units'] if page_quota_units is None else page_quota_units
+        results = _iter_keyword_results(
+            api_key,
+            uncovered,
+            max_results_per_keyword,
+            max_concurrency or YOUTUBE_SEARCH_CONFIG['max_concurrency'],
+            deadline_seconds or YOUTUBE_SEARCH_CONFIG['deadline_seconds'],
+            max_pages=max_pages or YOUTUBE_SEARCH_CONFIG['max_pages'],
+            target_channels=YOUTUBE_SEARCH_CONFIG['target_channels'] if target_channels is None else target_channels,
+            page_budget=_UnitBudget(page_quota_units)
+        )
+        remaining = len(uncovered)
+        for keyword, keyword_counts, latest_video_at in results:
+            remaining -= 1
+            if not keyword_counts:
+                continue
+            for channel_id, mentions in keyword_counts.items():
+                pool.add(keyword, channel_id, mentions, latest_video_at.get(channel_id, 0.0))
+            pending = True
+            if yield_partial and remaining:
+                yield _rank_influencers(api_key, pool, top_n, weights)
+                pending, yielded = False, True
+
+    if pending or not yielded:
+        yield _rank_influencers(api_key, pool, top_n, weights) if pool else []
+
+def find_influencers(
+    description: str,
+    api_key: Optional[str] = None,
+    max_results_per_keyword: int = 6,
+    top_n: int = 10,
+    max_concurrency: Optional[int] = None,
+    deadline_seconds: Optional[float] = None,
+    weights: Optional[ScoringWeights] = None,
+    quota_units: Optional[int] = None
+) -> List[Dict]:
+    """
+    Main entrypoint: given a product/ campaign description, return a ranked list of influencer
+    channel dicts with keys: channel, subs, link, mentions, score.
+
+    - api_key: YouTube Data API key. If None, will attempt to read env var YOUTUBE_API_KEY.
+    - max_concurrency / deadline_seconds: parallel keyword searches and the overall time
+      budget for them; default to YOUTUBE_SEARCH_CONFIG.
+    - Keywords searched recently are answered from the local channel index; only the
+      rest are searched via the API.
+    - weights: per-campaign ScoringWeights (mentions, subscribers, recency, keyword
+      diversity, engagement).
+    - quota_units: search quota budget for this lookup; defaults to
+      YOUTUBE_SEARCH_CONFIG['query_quota_units'].
+    - Returns [] on error or when no influencers found.
+    """
     influencers = []
-    for channel_id, data in ranked:
-        influencers.append({
-            "channel": data["title"],
-            "subs": data["subs"],
-            "link": data["link"],
-            "mentions": channel_frequency.get(channel_id, 0)
-        })
+    for influencers in iter_influencers(
+        description,
+        api_key=api_key,
+        max_results_per_keyword=max_results_per_keyword,
+        top_n=top_n,
+        max_concurrency=max_concurrency,
+        deadline_seconds=deadline_seconds,
+        weights=weights,
+        quota_units=quota_units,
+        yield_partial=False
+    ):
+        pass
     return influencers